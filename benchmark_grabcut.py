@@ -0,0 +1,122 @@
+"""
+Coarse-to-fine GrabCut benchmark
+
+Segments images with BodySegmenter at full resolution (grabcut_width 0) and
+coarse-to-fine with both boundary refinements, and reports the time per
+image and the IoU of the coarse-to-fine masks against the full-resolution
+masks.
+
+Usage:
+    python benchmark_grabcut.py data/sessions/<session>
+    python benchmark_grabcut.py image1.jpg image2.jpg --method hybrid --width 640
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.vision.body_segmentation import BodySegmenter
+from src.utils.config_loader import get_config
+
+
+def find_images(paths):
+    """Expand directories to the capture images they contain"""
+    images = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            # Session directories hold segmented/mask/depth images next to the captures
+            captures = sorted(path.rglob("capture_*.jpg"))
+            images.extend(captures or sorted(path.rglob("*.jpg")) + sorted(path.rglob("*.png")))
+        else:
+            images.append(path)
+    return images
+
+
+def iou(mask_a: np.ndarray, mask_b: np.ndarray) -> float:
+    """Intersection over union of two binary masks"""
+    a = mask_a > 0
+    b = mask_b > 0
+    union = np.count_nonzero(a | b)
+    return np.count_nonzero(a & b) / union if union else 1.0
+
+
+def timed_segment(segmenter: BodySegmenter, image: np.ndarray):
+    """Segment one image, returns (binary_mask, milliseconds)"""
+    start = time.perf_counter()
+    _, mask = segmenter.segment(image)
+    return mask, (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Speed and IoU of coarse-to-fine GrabCut against full resolution")
+    parser.add_argument('paths', nargs='+', help='Images or directories of captures')
+    parser.add_argument('--method', default='grabcut', choices=['grabcut', 'hybrid'], help='Segmentation method')
+    parser.add_argument('--width', type=int, default=None, help='Coarse GrabCut width (default: config)')
+    parser.add_argument('--band', type=int, default=None, help='Boundary band half-width in pixels (default: config)')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to configuration file')
+    args = parser.parse_args()
+    
+    get_config(args.config)
+    
+    images = find_images(args.paths)
+    if not images:
+        print("[FAIL] No images found")
+        return 1
+    
+    segmenter = BodySegmenter(method=args.method)
+    coarse_width = args.width if args.width is not None else segmenter.grabcut_width
+    if args.band is not None:
+        segmenter.grabcut_band_px = args.band
+    modes = [('guided', coarse_width, 'guided'), ('grabcut', coarse_width, 'grabcut')]
+    
+    print("=" * 70)
+    print(f"COARSE-TO-FINE GRABCUT ({args.method}, width {coarse_width}, band {segmenter.grabcut_band_px}px)")
+    print("=" * 70)
+    print(f"{'image':<28}{'full ms':>10}" + "".join(f"{name + ' ms':>14}{'IoU':>8}" for name, _, _ in modes))
+    
+    full_times = []
+    results = {name: {'ms': [], 'iou': []} for name, _, _ in modes}
+    for path in images:
+        image = cv2.imread(str(path))
+        if image is None:
+            print(f"[WARN] Could not read {path}")
+            continue
+        
+        segmenter.grabcut_width = 0
+        reference, full_ms = timed_segment(segmenter, image)
+        full_times.append(full_ms)
+        
+        row = f"{path.name[:27]:<28}{full_ms:>10.0f}"
+        for name, width, refine in modes:
+            segmenter.grabcut_width = width
+            segmenter.grabcut_refine = refine
+            mask, ms = timed_segment(segmenter, image)
+            overlap = iou(mask, reference)
+            results[name]['ms'].append(ms)
+            results[name]['iou'].append(overlap)
+            row += f"{ms:>14.0f}{overlap:>8.3f}"
+        print(row)
+    
+    segmenter.release()
+    
+    if not full_times:
+        return 1
+    
+    print()
+    print(f"Median full resolution: {np.median(full_times):.0f} ms")
+    for name, stats in results.items():
+        median_ms = np.median(stats['ms'])
+        print(
+            f"Median {name:<8}: {median_ms:.0f} ms ({np.median(full_times) / median_ms:.1f}x faster), "
+            f"IoU median {np.median(stats['iou']):.3f}, min {np.min(stats['iou']):.3f}"
+        )
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Time-to-capture benchmark for the landmark smoothing filter
+
+Replays one recording through the scanning loop twice, with the One-Euro
+landmark filter off and on, and reports how long each orientation took to
+produce a capture. Capture processing (segmentation, depth, writes) is
+skipped, only the live guidance path is measured.
+
+The recording is replayed unpaced and synchronously, so every frame is
+processed regardless of machine speed. The filter and the seconds to
+capture both use the recorded frame timestamps, which makes the results
+reproducible across runs and machines.
+
+Usage:
+    python benchmark_time_to_capture.py data/sessions/<recorded session>
+    python benchmark_time_to_capture.py recording.mp4
+"""
+import argparse
+import sys
+
+from src.camera.camera_controller import CameraController
+from src.camera.frame_source import create_frame_source
+from src.scanning_orchestrator import ScanningOrchestrator
+from src.utils.config_loader import get_config
+
+
+class GuidanceOnlyOrchestrator(ScanningOrchestrator):
+    """Scanning orchestrator that counts captures without storing them"""
+    
+    def _store_capture(self, orientation, landmarks, capture_idx):
+        """Skip segmentation, depth estimation and writes"""
+        landmarks.segmentation_mask = None
+    
+    def _process_captured_data(self):
+        """Skip reconstruction and measurements"""
+
+
+def run(source: str, session_name: str, smoothing: bool) -> dict:
+    """
+    Replay the recording once
+    
+    Args:
+        source: Video file, image directory or recorded session
+        session_name: Session directory name
+        smoothing: Enable the landmark filter
+    
+    Returns:
+        Throughput statistics of the run
+    """
+    camera = CameraController(threaded=False, source=create_frame_source(source, realtime=False))
+    orchestrator = GuidanceOnlyOrchestrator(session_name=session_name, camera=camera)
+    
+    # Same conditions for both runs: no window, no recording, fixed quality level
+    orchestrator.show_preview = False
+    orchestrator.record_session = False
+    orchestrator.governor.enabled = False
+    orchestrator.landmark_filter.enabled = smoothing
+    
+    orchestrator.start_scanning()
+    
+    stats = orchestrator.get_throughput_stats()
+    stats['orientations_completed'] = orchestrator.current_orientation_idx
+    stats['landmark_filter'] = orchestrator.landmark_filter.get_stats()
+    return stats
+
+
+def format_value(value, fmt: str) -> str:
+    """Format an optional number"""
+    return format(value, fmt) if value is not None else "-"
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Median time-to-capture with and without landmark smoothing")
+    parser.add_argument('source', help='Video file, image directory or recorded session to replay')
+    parser.add_argument('--session-name', default='benchmark_time_to_capture', help='Session directory prefix')
+    parser.add_argument('--config', default='config/config.yaml', help='Path to configuration file')
+    args = parser.parse_args()
+    
+    get_config(args.config)
+    
+    results = {}
+    for label, smoothing in (('raw', False), ('one-euro', True)):
+        print(f"Replaying {args.source} with {label} landmarks...")
+        results[label] = run(args.source, f"{args.session_name}_{label.replace('-', '_')}", smoothing)
+    
+    print()
+    print("=" * 70)
+    print("TIME TO CAPTURE")
+    print("=" * 70)
+    print(f"{'landmarks':<12}{'captures':>10}{'orientations':>14}{'median frames':>16}{'median s':>12}{'proc fps':>10}")
+    for label, stats in results.items():
+        print(
+            f"{label:<12}{stats['captures']:>10}{stats['orientations_completed']:>14}"
+            f"{format_value(stats['median_frames_to_capture'], '.1f'):>16}"
+            f"{format_value(stats['median_seconds_to_capture'], '.2f'):>12}"
+            f"{stats['processing_fps']:>10.1f}"
+        )
+    
+    raw = results['raw']['median_frames_to_capture']
+    smoothed = results['one-euro']['median_frames_to_capture']
+    if raw and smoothed:
+        print(f"\nMedian frames to capture: {raw:.1f} -> {smoothed:.1f} ({(smoothed - raw) / raw * 100:+.0f}%)")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
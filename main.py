@@ -3,7 +3,7 @@ Tailor AI - Advanced 3D Body Scanning System
 Main Application Entry Point
 
 Usage:
-    python main.py [--session-name SESSION_NAME] [--config CONFIG_PATH]
+    python main.py [--session-name SESSION_NAME] [--config CONFIG_PATH] [--source PATH [--fast]]
 """
 import argparse
 import sys
@@ -52,6 +52,25 @@ def progress_callback(progress: float, state: str):
     print(f'\r[{bar}] {progress:.1f}% - {state}', end='', flush=True)
 
 
+def create_replay_source(args):
+    """
+    Create a replay frame source from command line arguments
+    
+    Args:
+        args: Parsed command line arguments
+        
+    Returns:
+        FrameSource or None to use the live camera
+    """
+    if not args.source:
+        return None
+    
+    from src.camera.frame_source import create_frame_source
+    
+    logger.info(f"Replaying frames from {args.source} ({'as fast as possible' if args.fast else 'original timing'})")
+    return create_frame_source(args.source, realtime=not args.fast)
+
+
 def main():
     """Main application entry point"""
     
@@ -81,6 +100,22 @@ def main():
         action='store_true',
         help='Run in demo mode (preview only)'
     )
+    parser.add_argument(
+        '--source',
+        type=str,
+        default=None,
+        help='Replay frames from a video file, image directory or recorded session instead of the camera'
+    )
+    parser.add_argument(
+        '--rig',
+        action='store_true',
+        help='Scan with the multi-camera rig from camera.rig instead of a single camera'
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Replay --source as fast as possible instead of at its original frame timing'
+    )
     
     args = parser.parse_args()
     
@@ -145,9 +180,9 @@ def main():
         from src.vision.pose_detector import PoseDetector
         from src.vision.orientation_detector import OrientationDetector
         
-        camera = CameraController()
+        camera = CameraController(source=create_replay_source(args))
         pose_detector = PoseDetector()
-        orientation_detector = OrientationDetector()
+        orientation_detector = OrientationDetector(pose_detector=pose_detector)
         
         def demo_callback(frame):
             """Demo frame processing"""
@@ -182,12 +217,21 @@ def main():
     print("  - 's': Manual capture")
     print("  - 'n': Skip to next orientation")
     print("  - 'q': Quit scanning")
-    print("\nPress Enter to start...")
-    input()
+    if not args.source:
+        print("\nPress Enter to start...")
+        input()
     
     try:
         # Create scanning orchestrator
-        orchestrator = ScanningOrchestrator(session_name=args.session_name)
+        camera = None
+        rig = None
+        if args.rig:
+            from src.camera.multi_camera import MultiCameraController
+            rig = MultiCameraController()
+        elif args.source:
+            from src.camera.camera_controller import CameraController
+            camera = CameraController(source=create_replay_source(args))
+        orchestrator = ScanningOrchestrator(session_name=args.session_name, camera=camera, rig=rig)
         
         # Start scanning
         orchestrator.start_scanning(callback=progress_callback)
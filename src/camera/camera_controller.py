@@ -3,24 +3,37 @@ Camera controller for capturing body scans
 """
 import cv2
 import numpy as np
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 from pathlib import Path
 import time
 
+from src.camera.capture_backends import CaptureSettings, resolve_backends, resolve_fourccs
+from src.camera.frame_source import FrameSource, LiveCameraSource
+from src.camera.frame_grabber import FrameGrabber, GrabbedFrame
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
-from src.utils.image_processing import check_image_quality, draw_text_with_background
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+from src.utils.image_processing import (
+    FrameScore, check_image_quality, draw_text_with_background, select_best_frames
+)
 
 
 class CameraController:
     """Manages camera capture and real-time preview"""
     
-    def __init__(self, device_id: Optional[int] = None):
+    def __init__(
+        self,
+        device_id: Optional[int] = None,
+        threaded: Optional[bool] = None,
+        source: Optional[FrameSource] = None
+    ):
         """
         Initialize camera controller
         
         Args:
             device_id: Camera device ID (None to use config)
+            threaded: Capture live cameras on a background thread (None to use config)
+            source: Frame source to read from (None for the live camera)
         """
         self.config = get_config()
         self.device_id = device_id if device_id is not None else self.config.get('camera.device_id', 0)
@@ -30,13 +43,44 @@ class CameraController:
         self.height = self.config.get('camera.resolution.height', 1080)
         self.fps = self.config.get('camera.fps', 30)
         
+        # Capture backend and pixel format negotiation
+        self.backends = resolve_backends(self.config.get('camera.backend', 'auto'))
+        self.fourccs = resolve_fourccs(self.config.get('camera.fourcc', ['MJPG', 'YUYV']))
+        self.driver_buffer_size = self.config.get('camera.buffer_size', 1)
+        self.fps_probe_frames = self.config.get('camera.fps_probe_frames', 0)
+        self.capture_settings: Optional[CaptureSettings] = None
+        
+        # Background capture
+        self.threaded = threaded if threaded is not None else self.config.get('camera.threaded_capture', True)
+        self.frame_buffer_size = self.config.get('camera.frame_buffer_size', 3)
+        self.non_blocking = self.config.get('camera.non_blocking_read', False)
+        self.grabber: Optional[FrameGrabber] = None
+        
+        # Reuse preallocated frame buffers instead of allocating per frame
+        self.buffer_pool: Optional[FrameBufferPool] = (
+            get_buffer_pool() if self.config.get('advanced.reuse_frame_buffers', True) else None
+        )
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._output_index = 0
+        
         # Quality control
         self.blur_threshold = self.config.get('quality_control.blur_threshold', 100)
         
-        self.cap: Optional[cv2.VideoCapture] = None
+        # Burst capture
+        self.burst_size = self.config.get('capture.burst_size', 5)
+        self.burst_proxy_width = self.config.get('capture.burst_proxy_width', 320)
+        
+        self.source = source
         self.is_opened = False
         
-        logger.info(f"Camera controller initialized with device {self.device_id}")
+        # Metadata of the most recently returned frame
+        self.last_frame_timestamp: Optional[float] = None
+        self.last_frame_id = -1
+        
+        if source is not None:
+            logger.info(f"Camera controller initialized with {source.describe()}")
+        else:
+            logger.info(f"Camera controller initialized with device {self.device_id}")
     
     def open(self) -> bool:
         """
@@ -46,51 +90,127 @@ class CameraController:
             True if successful, False otherwise
         """
         try:
-            self.cap = cv2.VideoCapture(self.device_id, cv2.CAP_DSHOW)  # DirectShow on Windows
+            if self.source is None:
+                self.source = LiveCameraSource(
+                    self.device_id,
+                    self.width,
+                    self.height,
+                    self.fps,
+                    backends=self.backends,
+                    fourccs=self.fourccs,
+                    buffer_size=self.driver_buffer_size,
+                    fps_probe_frames=self.fps_probe_frames,
+                    autofocus=self.config.get('camera.autofocus', True)
+                )
             
-            if not self.cap.isOpened():
-                logger.error(f"Failed to open camera {self.device_id}")
+            if not self.source.open():
+                logger.error(f"Failed to open {self.source.describe()}")
                 return False
             
-            # Set camera properties
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
-            
-            if self.config.get('camera.autofocus', True):
-                self.cap.set(cv2.CAP_PROP_AUTOFOCUS, 1)
+            self.capture_settings = self.source.settings
             
-            # Verify settings
-            actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            actual_fps = int(self.cap.get(cv2.CAP_PROP_FPS))
+            self.is_opened = True
             
-            logger.info(f"Camera opened: {actual_width}x{actual_height} @ {actual_fps}fps")
+            # Only live cameras drop frames; replays are read synchronously so
+            # that every recorded frame is processed, paced or not
+            if self.threaded and self.source.is_live:
+                source = self.source
+                self.grabber = FrameGrabber(
+                    source.read,
+                    buffer_size=self.frame_buffer_size,
+                    pool=self.buffer_pool,
+                    source_clock=lambda: source.last_source_timestamp
+                )
+                self.grabber.start()
             
-            self.is_opened = True
             return True
             
         except Exception as e:
             logger.error(f"Error opening camera: {e}")
             return False
     
-    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+    def read_frame(self, wait: Optional[bool] = None) -> Tuple[bool, Optional[np.ndarray]]:
         """
         Read a frame from camera
         
+        Args:
+            wait: In threaded mode, block until a new frame arrives. If False,
+                return the newest frame immediately (None to use config)
+        
         Returns:
             Tuple of (success, frame)
         """
-        if not self.is_opened or self.cap is None:
+        grabbed = self.read_latest(wait)
+        
+        if grabbed is None:
             return False, None
         
-        ret, frame = self.cap.read()
+        return True, grabbed.image
+    
+    def read_latest(self, wait: Optional[bool] = None) -> Optional[GrabbedFrame]:
+        """
+        Read the newest frame together with its capture timestamp
+        
+        When frame buffers are reused, the returned image is only valid until
+        the next-but-one read. Copy it if it has to be kept.
         
-        if not ret:
-            logger.warning("Failed to read frame from camera")
-            return False, None
+        Args:
+            wait: In threaded mode, block until a new frame arrives. If False,
+                return the newest frame immediately (None to use config)
+        
+        Returns:
+            GrabbedFrame or None on failure
+        """
+        if not self.is_opened or self.source is None:
+            return None
+        
+        if self.grabber is not None:
+            if wait is None:
+                wait = not self.non_blocking
+            grabbed = self.grabber.read(wait=wait)
+        else:
+            ret, frame = self.source.read(out=self._next_output_buffer())
+            grabbed = None
+            if ret:
+                timestamp = time.monotonic()
+                source_timestamp = self.source.last_source_timestamp
+                grabbed = GrabbedFrame(
+                    frame, timestamp, self.last_frame_id + 1,
+                    source_timestamp if source_timestamp is not None else timestamp
+                )
+        
+        if grabbed is None:
+            if self.source.is_live:
+                logger.warning("Failed to read frame from camera")
+            else:
+                logger.info(f"No more frames from {self.source.describe()}")
+            return None
+        
+        self.last_frame_timestamp = grabbed.timestamp
+        self.last_frame_id = grabbed.frame_id
+        self._frame_shape = grabbed.image.shape
+        
+        return grabbed
+    
+    def _next_output_buffer(self) -> Optional[np.ndarray]:
+        """Get the pooled buffer the next synchronous read goes into"""
+        if self.buffer_pool is None or self._frame_shape is None:
+            return None
         
-        return True, frame
+        buffer = self.buffer_pool.get(('camera_frame', id(self), self._output_index), self._frame_shape)
+        self._output_index = (self._output_index + 1) % 2
+        return buffer
+    
+    def get_capture_stats(self) -> Dict[str, int]:
+        """
+        Get background capture statistics
+        
+        Returns:
+            Dictionary with captured, dropped and failed frame counts
+        """
+        if self.grabber is None:
+            return {'frames_captured': self.last_frame_id + 1, 'frames_dropped': 0, 'read_failures': 0}
+        return self.grabber.get_stats()
     
     def capture_image(self, save_path: Optional[Path] = None) -> Optional[np.ndarray]:
         """
@@ -107,6 +227,9 @@ class CameraController:
         if not ret or frame is None:
             return None
         
+        # The read buffer is recycled, the caller keeps this image
+        frame = frame.copy()
+        
         # Check image quality
         is_good, message = check_image_quality(frame, self.blur_threshold)
         if not is_good:
@@ -120,23 +243,82 @@ class CameraController:
         
         return frame
     
+    def capture_burst(
+        self,
+        num_frames: Optional[int] = None,
+        top_k: int = 1
+    ) -> List[Tuple[np.ndarray, FrameScore]]:
+        """
+        Grab frames back-to-back and keep the sharpest ones
+        
+        Args:
+            num_frames: Number of consecutive frames to grab (None to use config)
+            top_k: Number of best frames to return
+            
+        Returns:
+            List of (frame, score), best first
+        """
+        if num_frames is None:
+            num_frames = self.burst_size
+        num_frames = max(num_frames, top_k)
+        
+        if not self.is_opened:
+            return []
+        
+        if self.grabber is not None:
+            frames = [grabbed.image for grabbed in self.grabber.read_burst(num_frames)]
+        else:
+            frames = []
+            for _ in range(num_frames):
+                ret, frame = self.read_frame()
+                if not ret or frame is None:
+                    break
+                frames.append(frame.copy())
+        
+        if not frames:
+            logger.warning("Burst capture got no frames")
+            return []
+        
+        best = select_best_frames(frames, top_k, self.burst_proxy_width)
+        logger.info(
+            f"Burst of {len(frames)} frames, best sharpness {best[0][1].sharpness:.1f} "
+            f"(worst kept {best[-1][1].sharpness:.1f})"
+        )
+        
+        return [(frames[idx], score) for idx, score in best]
+    
     def capture_sequence(
         self,
         num_frames: int = 3,
         delay_ms: int = 500,
-        save_dir: Optional[Path] = None
+        save_dir: Optional[Path] = None,
+        burst: bool = False
     ) -> List[np.ndarray]:
         """
         Capture a sequence of images
         
         Args:
             num_frames: Number of frames to capture
-            delay_ms: Delay between captures in milliseconds
+            delay_ms: Delay between captures in milliseconds (ignored in burst mode)
             save_dir: Optional directory to save images
+            burst: Grab a back-to-back burst and keep the `num_frames` sharpest
+                frames instead of sleeping between single captures
             
         Returns:
             List of captured images
         """
+        if burst:
+            best = self.capture_burst(max(self.burst_size, num_frames), top_k=num_frames)
+            images = []
+            for i, (image, score) in enumerate(best):
+                if save_dir:
+                    save_path = save_dir / f"frame_{i:03d}.jpg"
+                    save_path.parent.mkdir(parents=True, exist_ok=True)
+                    cv2.imwrite(str(save_path), image)
+                images.append(image)
+                logger.info(f"Captured frame {i+1}/{num_frames} (sharpness {score.sharpness:.1f})")
+            return images
+        
         images = []
         
         for i in range(num_frames):
@@ -185,7 +367,11 @@ class CameraController:
                     break
                 
                 # Apply callback if provided
-                display_frame = frame.copy()
+                if self.buffer_pool is not None:
+                    display_frame = self.buffer_pool.get('preview_display', frame.shape, frame.dtype)
+                    np.copyto(display_frame, frame)
+                else:
+                    display_frame = frame.copy()
                 if callback:
                     processed = callback(frame)
                     if processed is not None:
@@ -195,6 +381,8 @@ class CameraController:
                 if show_info:
                     h, w = frame.shape[:2]
                     info_text = f"Resolution: {w}x{h} | Press 'q' to quit, 's' to capture"
+                    if self.grabber is not None:
+                        info_text += f" | Dropped: {self.grabber.frames_dropped}"
                     display_frame = draw_text_with_background(
                         display_frame,
                         info_text,
@@ -224,11 +412,18 @@ class CameraController:
     
     def release(self):
         """Release camera resources"""
-        if self.cap is not None:
-            self.cap.release()
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
+        
+        if self.source is not None and self.is_opened:
+            self.source.release()
             self.is_opened = False
             logger.info("Camera released")
         
+        if self.buffer_pool is not None:
+            self.buffer_pool.release_named(id(self))
+        
         cv2.destroyAllWindows()
     
     def __enter__(self):
@@ -0,0 +1,252 @@
+"""
+Platform-specific capture backend selection and pixel format negotiation
+"""
+import sys
+import time
+import cv2
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Union
+
+from src.utils.logger import logger
+
+
+# OpenCV VideoCapture API preferences by name
+BACKENDS = {
+    'v4l2': cv2.CAP_V4L2,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+    'any': cv2.CAP_ANY,
+}
+
+
+@dataclass
+class CaptureSettings:
+    """Settings actually achieved by the capture device"""
+    backend: str
+    fourcc: str
+    width: int
+    height: int
+    fps: float
+    measured_fps: Optional[float] = None
+    buffer_size: Optional[int] = None
+    rejected_fourccs: List[str] = field(default_factory=list)
+    
+    def summary(self) -> str:
+        """Human readable summary"""
+        text = f"{self.width}x{self.height} @ {self.fps:.0f}fps ({self.fourcc} via {self.backend})"
+        if self.measured_fps is not None:
+            text += f", measured {self.measured_fps:.1f}fps"
+        return text
+
+
+def default_backends() -> List[str]:
+    """
+    Get preferred backends for the current platform
+    
+    Returns:
+        Backend names in order of preference
+    """
+    if sys.platform.startswith('linux'):
+        return ['v4l2', 'any']
+    if sys.platform.startswith('win'):
+        return ['dshow', 'msmf', 'any']
+    if sys.platform == 'darwin':
+        return ['avfoundation', 'any']
+    return ['any']
+
+
+def resolve_backends(backend: Union[str, List[str], None]) -> List[str]:
+    """
+    Resolve a backend setting from config into an ordered list
+    
+    Args:
+        backend: 'auto', a backend name or a list of backend names
+    
+    Returns:
+        Ordered list of known backend names
+    """
+    if backend is None or backend == 'auto':
+        return default_backends()
+    
+    names = [backend] if isinstance(backend, str) else list(backend)
+    resolved = []
+    for name in names:
+        name = name.lower()
+        if name in BACKENDS:
+            resolved.append(name)
+        else:
+            logger.warning(f"Unknown capture backend '{name}' ignored")
+    
+    return resolved or default_backends()
+
+
+def resolve_fourccs(fourcc: Union[str, List[str], None]) -> List[str]:
+    """
+    Resolve a pixel format setting from config into an ordered list
+    
+    Args:
+        fourcc: A four character code, e.g. 'MJPG', or a list of them
+    
+    Returns:
+        Ordered list of four character codes (empty to keep the driver default)
+    """
+    if not fourcc:
+        return []
+    
+    codes = [fourcc] if isinstance(fourcc, str) else list(fourcc)
+    resolved = []
+    for code in codes:
+        if isinstance(code, str) and len(code) == 4:
+            resolved.append(code)
+        else:
+            logger.warning(f"Pixel format '{code}' ignored, expected a four character code like 'MJPG'")
+    
+    return resolved
+
+
+def fourcc_to_str(code: float) -> str:
+    """Decode a CAP_PROP_FOURCC value into its four character string"""
+    code = int(code)
+    if code <= 0:
+        return "????"
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def _apply_format(
+    cap: cv2.VideoCapture,
+    fourcc: str,
+    width: int,
+    height: int,
+    fps: int
+) -> Tuple[str, int, int, float]:
+    """Request a pixel format and mode, return what the driver accepted"""
+    # The pixel format has to be set before the resolution, otherwise some
+    # V4L2 drivers reject modes that are only available in compressed formats
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+    
+    return (
+        fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        float(cap.get(cv2.CAP_PROP_FPS)),
+    )
+
+
+def measure_fps(cap: cv2.VideoCapture, num_frames: int = 15) -> Optional[float]:
+    """
+    Measure the delivered frame rate by timing consecutive reads
+    
+    Args:
+        cap: Opened capture
+        num_frames: Number of frames to time (the first read is not counted)
+    
+    Returns:
+        Frames per second or None if reading failed
+    """
+    if num_frames < 2:
+        return None
+    
+    if not cap.grab():
+        return None
+    
+    start = time.perf_counter()
+    for _ in range(num_frames):
+        if not cap.grab():
+            return None
+    elapsed = time.perf_counter() - start
+    
+    return num_frames / elapsed if elapsed > 0 else None
+
+
+def open_video_capture(
+    device_id: int,
+    width: int,
+    height: int,
+    fps: int,
+    backends: Optional[List[str]] = None,
+    fourccs: Union[str, List[str], None] = None,
+    buffer_size: Optional[int] = 1,
+    fps_probe_frames: int = 0
+) -> Tuple[Optional[cv2.VideoCapture], Optional[CaptureSettings]]:
+    """
+    Open a camera with the first working backend and negotiate its pixel format
+    
+    Each pixel format is tried in order and the first one that the driver
+    accepts at the requested resolution wins. If none matches exactly, the
+    mode with the highest pixel throughput is kept.
+    
+    Args:
+        device_id: Camera device ID
+        width: Requested frame width
+        height: Requested frame height
+        fps: Requested frame rate
+        backends: Backend names in order of preference (None for platform default)
+        fourccs: Pixel formats in order of preference, e.g. ['MJPG', 'YUYV'] or 'MJPG'
+        buffer_size: Driver-side frame buffer size (None to leave default)
+        fps_probe_frames: Number of frames to time for measuring actual fps (0 to skip)
+    
+    Returns:
+        Tuple of (capture, achieved settings), (None, None) on failure
+    """
+    backends = backends or default_backends()
+    fourccs = resolve_fourccs(fourccs)
+    
+    for backend in backends:
+        cap = cv2.VideoCapture(device_id, BACKENDS[backend])
+        
+        if not cap.isOpened():
+            logger.debug(f"Backend {backend} could not open camera {device_id}")
+            cap.release()
+            continue
+        
+        best_fourcc, best_rate = None, -1.0
+        matched = False
+        rejected = []
+        
+        for fourcc in fourccs:
+            achieved_fourcc, achieved_w, achieved_h, achieved_fps = _apply_format(
+                cap, fourcc, width, height, fps
+            )
+            
+            if achieved_fourcc == fourcc and (achieved_w, achieved_h) == (width, height):
+                best_fourcc = fourcc
+                matched = True
+                break
+            
+            rejected.append(fourcc)
+            rate = achieved_w * achieved_h * achieved_fps
+            if rate > best_rate:
+                best_fourcc, best_rate = fourcc, rate
+        
+        if best_fourcc is None:
+            # No format preference, only request the mode
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            cap.set(cv2.CAP_PROP_FPS, fps)
+        elif not matched and best_fourcc != fourccs[-1]:
+            # A later attempt changed the mode, go back to the best one
+            _apply_format(cap, best_fourcc, width, height, fps)
+        
+        if buffer_size is not None:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+        
+        settings = CaptureSettings(
+            backend=backend,
+            fourcc=fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS)),
+            buffer_size=int(cap.get(cv2.CAP_PROP_BUFFERSIZE)) if buffer_size is not None else None,
+            rejected_fourccs=rejected,
+        )
+        
+        if fps_probe_frames > 0:
+            settings.measured_fps = measure_fps(cap, fps_probe_frames)
+        
+        return cap, settings
+    
+    return None, None
@@ -0,0 +1,264 @@
+"""
+Background frame grabber for low-latency live capture
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.buffer_pool import FrameBufferPool
+from src.utils.logger import logger
+
+
+@dataclass
+class GrabbedFrame:
+    """Frame together with its capture metadata"""
+    image: np.ndarray
+    timestamp: float  # time.monotonic() when the driver returned the frame
+    frame_id: int
+    source_timestamp: Optional[float] = None  # Recorded time for replayed footage, else same as timestamp
+
+
+class FrameGrabber:
+    """
+    Reads frames on a background thread and keeps only the newest ones
+    
+    The driver queue is drained as fast as the camera delivers frames, so the
+    consumer always gets the most recent frame regardless of how long its own
+    processing takes. Frames that are overwritten before anyone reads them are
+    counted as dropped.
+    
+    With a buffer pool, frames are read into recycled buffers and read()
+    copies the newest frame into one of a few output buffers, so the loop
+    runs without per-frame allocations. A returned image then stays valid
+    until `output_slots` further reads.
+    """
+    
+    def __init__(
+        self,
+        read_fn: Callable[..., Tuple[bool, Optional[np.ndarray]]],
+        buffer_size: int = 3,
+        max_consecutive_failures: int = 30,
+        pool: Optional[FrameBufferPool] = None,
+        output_slots: int = 2,
+        source_clock: Optional[Callable[[], Optional[float]]] = None
+    ):
+        """
+        Initialize frame grabber
+        
+        Args:
+            read_fn: Function returning (success, frame), e.g. FrameSource.read.
+                With a pool it is called with the buffer to read into.
+            buffer_size: Number of most recent frames kept in the ring buffer
+            max_consecutive_failures: Stop grabbing after this many failed reads
+            pool: Optional buffer pool for allocation-free operation
+            output_slots: Number of output buffers read() rotates through (pool mode)
+            source_clock: Function returning the source timestamp of the frame
+                just read, e.g. FrameSource.last_source_timestamp (None to use
+                the capture time)
+        """
+        self._read_fn = read_fn
+        self._source_clock = source_clock
+        self._buffer = deque(maxlen=max(1, buffer_size))
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._next_frame_id = 0
+        self._last_consumed_id = -1
+        self.max_consecutive_failures = max_consecutive_failures
+        
+        # Buffer recycling
+        self._pool = pool
+        self._output_slots = max(1, output_slots)
+        self._output_index = 0
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._frame_dtype = np.uint8
+        
+        # Statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self.stream_ended = False
+    
+    def start(self):
+        """Start the background capture thread"""
+        if self._running:
+            return
+        
+        self._running = True
+        self.stream_ended = False
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        logger.info(f"Frame grabber started (buffer size: {self._buffer.maxlen})")
+    
+    def stop(self, timeout: float = 2.0):
+        """Stop the background capture thread"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+            logger.info(
+                f"Frame grabber stopped: {self.frames_captured} captured, "
+                f"{self.frames_dropped} dropped"
+            )
+        
+        if self._pool is not None:
+            self._pool.release_named(id(self))
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the capture thread is active"""
+        return self._running
+    
+    def _capture_loop(self):
+        """Continuously read frames into the ring buffer"""
+        consecutive_failures = 0
+        
+        while self._running:
+            buffer = None
+            if self._pool is not None and self._frame_shape is not None:
+                buffer = self._pool.acquire(self._frame_shape, self._frame_dtype)
+                ret, frame = self._read_fn(buffer)
+            else:
+                ret, frame = self._read_fn()
+            timestamp = time.monotonic()
+            source_timestamp = self._source_clock() if self._source_clock is not None else None
+            
+            if buffer is not None and frame is not buffer:
+                # Source could not fill the buffer (e.g. resolution changed)
+                self._pool.release(buffer)
+            
+            if not ret or frame is None:
+                self.read_failures += 1
+                consecutive_failures += 1
+                
+                if consecutive_failures >= self.max_consecutive_failures:
+                    logger.warning("Frame grabber stopping after repeated read failures")
+                    break
+                
+                time.sleep(0.005)
+                continue
+            
+            consecutive_failures = 0
+            self._publish(frame, timestamp, source_timestamp)
+        
+        with self._condition:
+            self._running = False
+            self.stream_ended = True
+            self._condition.notify_all()
+    
+    def _publish(self, frame: np.ndarray, timestamp: float, source_timestamp: Optional[float] = None):
+        """Push a new frame into the ring buffer and wake waiting readers"""
+        with self._condition:
+            if self._buffer and self._buffer[-1].frame_id > self._last_consumed_id:
+                # Previous newest frame was never read
+                self.frames_dropped += 1
+            
+            evicted = self._buffer[0] if len(self._buffer) == self._buffer.maxlen else None
+            
+            if source_timestamp is None:
+                source_timestamp = timestamp
+            self._buffer.append(GrabbedFrame(frame, timestamp, self._next_frame_id, source_timestamp))
+            self._next_frame_id += 1
+            self.frames_captured += 1
+            self._frame_shape = frame.shape
+            self._frame_dtype = frame.dtype
+            self._condition.notify_all()
+            
+            if evicted is not None and self._pool is not None:
+                # Nobody else holds ring buffers in pool mode, readers get copies
+                self._pool.release(evicted.image)
+    
+    def read(self, wait: bool = True, timeout: float = 1.0) -> Optional[GrabbedFrame]:
+        """
+        Get the newest frame
+        
+        Args:
+            wait: If True, block until a frame newer than the last one read is
+                available. If False, return the newest frame immediately even
+                if it has already been read (never blocks).
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            Newest GrabbedFrame or None if no frame is available
+        """
+        with self._condition:
+            if wait:
+                deadline = time.monotonic() + timeout
+                while not self._has_new_frame():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._running:
+                        break
+                    self._condition.wait(remaining)
+                
+                if not self._has_new_frame():
+                    return None
+            
+            if not self._buffer:
+                return None
+            
+            grabbed = self._buffer[-1]
+            self._last_consumed_id = grabbed.frame_id
+            
+            if self._pool is None:
+                return grabbed
+            
+            # Copy out while holding the lock so the ring slot cannot be recycled mid-copy
+            out = self._pool.get(('frame_grabber_out', id(self), self._output_index), grabbed.image.shape, grabbed.image.dtype)
+            self._output_index = (self._output_index + 1) % self._output_slots
+            np.copyto(out, grabbed.image)
+            return GrabbedFrame(out, grabbed.timestamp, grabbed.frame_id, grabbed.source_timestamp)
+    
+    def read_burst(self, num_frames: int, timeout: float = 2.0) -> List[GrabbedFrame]:
+        """
+        Get up to `num_frames` consecutive frames
+        
+        Frames still in the ring buffer are used first, the rest are taken as
+        they arrive. The returned images are copies owned by the caller.
+        
+        Args:
+            num_frames: Number of consecutive frames to collect
+            timeout: Maximum time to wait for new frames in seconds
+            
+        Returns:
+            List of GrabbedFrame, oldest first
+        """
+        frames: List[GrabbedFrame] = []
+        last_id = -1
+        deadline = time.monotonic() + timeout
+        
+        with self._condition:
+            while True:
+                for grabbed in self._buffer:
+                    if grabbed.frame_id > last_id:
+                        frames.append(GrabbedFrame(
+                            grabbed.image.copy(), grabbed.timestamp, grabbed.frame_id, grabbed.source_timestamp
+                        ))
+                        last_id = grabbed.frame_id
+                
+                remaining = deadline - time.monotonic()
+                if len(frames) >= num_frames or remaining <= 0 or not self._running:
+                    break
+                self._condition.wait(remaining)
+            
+            self._last_consumed_id = max(self._last_consumed_id, last_id)
+        
+        return frames[-num_frames:]
+    
+    def _has_new_frame(self) -> bool:
+        """Check whether an unread frame is available (caller holds the lock)"""
+        return bool(self._buffer) and self._buffer[-1].frame_id > self._last_consumed_id
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get capture statistics"""
+        return {
+            'frames_captured': self.frames_captured,
+            'frames_dropped': self.frames_dropped,
+            'read_failures': self.read_failures,
+        }
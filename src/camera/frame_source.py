@@ -0,0 +1,435 @@
+"""
+Frame sources for the camera controller: live cameras and recorded footage
+"""
+import csv
+import time
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple, List, Union
+
+from src.camera.capture_backends import CaptureSettings, open_video_capture, default_backends
+from src.utils.logger import logger
+from src.utils.session_writer import SessionWriter
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+# Layout of a recorded session: data/sessions/<name>/recording/
+RECORDING_DIRNAME = "recording"
+TIMESTAMPS_FILENAME = "timestamps.csv"
+
+
+class FrameSource:
+    """
+    Base class for anything CameraController can read frames from
+    
+    Live sources deliver frames at the device rate. Replay sources either
+    pace frames according to their original timestamps (realtime=True) or
+    deliver them as fast as they are read.
+    """
+    
+    name = "source"
+    
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self.last_source_timestamp: Optional[float] = None
+        self.settings: Optional[CaptureSettings] = None
+    
+    @property
+    def is_live(self) -> bool:
+        """Whether frames come from a physical device"""
+        return False
+    
+    def open(self) -> bool:
+        """Open the source, returns True on success"""
+        raise NotImplementedError
+    
+    def read(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Read the next frame
+        
+        Args:
+            out: Optional preallocated buffer to read into. The returned frame
+                is `out` whenever its shape and dtype match.
+        
+        Returns:
+            Tuple of (success, frame)
+        """
+        raise NotImplementedError
+    
+    def release(self):
+        """Release resources"""
+    
+    def describe(self) -> str:
+        """Human readable description for logging"""
+        return self.name
+
+
+class LiveCameraSource(FrameSource):
+    """Physical camera opened through the platform capture backend"""
+    
+    name = "camera"
+    
+    def __init__(
+        self,
+        device_id: int,
+        width: int,
+        height: int,
+        fps: int,
+        backends: Optional[List[str]] = None,
+        fourccs: Optional[List[str]] = None,
+        buffer_size: Optional[int] = 1,
+        fps_probe_frames: int = 0,
+        autofocus: bool = True
+    ):
+        super().__init__(realtime=True)
+        self.device_id = device_id
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.backends = backends or default_backends()
+        self.fourccs = fourccs
+        self.buffer_size = buffer_size
+        self.fps_probe_frames = fps_probe_frames
+        self.autofocus = autofocus
+        self.cap: Optional[cv2.VideoCapture] = None
+    
+    @property
+    def is_live(self) -> bool:
+        return True
+    
+    def open(self) -> bool:
+        self.cap, self.settings = open_video_capture(
+            self.device_id,
+            self.width,
+            self.height,
+            self.fps,
+            backends=self.backends,
+            fourccs=self.fourccs,
+            buffer_size=self.buffer_size,
+            fps_probe_frames=self.fps_probe_frames
+        )
+        
+        if self.cap is None:
+            logger.error(f"Failed to open camera {self.device_id} (tried backends: {', '.join(self.backends)})")
+            return False
+        
+        if self.autofocus:
+            self.cap.set(cv2.CAP_PROP_AUTOFOCUS, 1)
+        
+        # Report achieved settings
+        settings = self.settings
+        logger.info(f"Camera opened: {settings.summary()}")
+        
+        achieved_fps = settings.measured_fps if settings.measured_fps is not None else settings.fps
+        if (settings.width, settings.height) != (self.width, self.height):
+            logger.warning(
+                f"Requested {self.width}x{self.height} but camera delivers {settings.width}x{settings.height}"
+            )
+        if achieved_fps < self.fps * 0.9:
+            logger.warning(
+                f"Requested {self.fps}fps but camera delivers {achieved_fps:.1f}fps "
+                f"(pixel formats rejected: {', '.join(settings.rejected_fourccs) or 'none'})"
+            )
+        
+        return True
+    
+    def read(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.cap is None:
+            return False, None
+        ret, frame = self.cap.read(image=out) if out is not None else self.cap.read()
+        self.last_source_timestamp = time.monotonic() if ret else None
+        return ret, frame
+    
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+    
+    def describe(self) -> str:
+        return f"camera {self.device_id}"
+
+
+class _ReplaySource(FrameSource):
+    """Common pacing logic for recorded footage"""
+    
+    def __init__(self, realtime: bool = True, loop: bool = False):
+        super().__init__(realtime=realtime)
+        self.loop = loop
+        self._replay_start: Optional[float] = None
+        self._first_timestamp: Optional[float] = None
+    
+    def _pace(self, timestamp: float):
+        """Sleep until the frame is due according to its original timestamp"""
+        self.last_source_timestamp = timestamp
+        
+        if not self.realtime:
+            return
+        
+        now = time.monotonic()
+        if self._replay_start is None:
+            self._replay_start = now
+            self._first_timestamp = timestamp
+            return
+        
+        due = self._replay_start + (timestamp - self._first_timestamp)
+        if due > now:
+            time.sleep(due - now)
+    
+    @staticmethod
+    def _into(frame: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        """Copy a decoded frame into the caller's buffer when possible"""
+        if out is not None and out.shape == frame.shape and out.dtype == frame.dtype:
+            np.copyto(out, frame)
+            return out
+        return frame
+    
+    def _restart_pacing(self):
+        """Reset the pacing clock, e.g. when looping"""
+        self._replay_start = None
+        self._first_timestamp = None
+
+
+class ImageDirectorySource(_ReplaySource):
+    """Replays a directory of still images in file name order"""
+    
+    name = "images"
+    
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        fps: float = 30.0,
+        timestamps: Optional[List[float]] = None,
+        realtime: bool = True,
+        loop: bool = False
+    ):
+        """
+        Args:
+            directory: Directory containing the images
+            fps: Frame rate used when no timestamps are given
+            timestamps: Optional original timestamps in seconds, one per image
+            realtime: Pace frames by their timestamps (False = as fast as possible)
+            loop: Restart from the first image at the end
+        """
+        super().__init__(realtime=realtime, loop=loop)
+        self.directory = Path(directory)
+        self.fps = fps
+        self.timestamps = timestamps
+        self.image_paths: List[Path] = []
+        self._index = 0
+    
+    def open(self) -> bool:
+        if not self.directory.is_dir():
+            logger.error(f"Image directory not found: {self.directory}")
+            return False
+        
+        self.image_paths = sorted(
+            p for p in self.directory.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        
+        if not self.image_paths:
+            logger.error(f"No images found in {self.directory}")
+            return False
+        
+        if self.timestamps is not None and len(self.timestamps) != len(self.image_paths):
+            logger.warning(
+                f"{len(self.timestamps)} timestamps for {len(self.image_paths)} images, "
+                f"falling back to {self.fps}fps"
+            )
+            self.timestamps = None
+        
+        self._index = 0
+        logger.info(f"Replaying {len(self.image_paths)} images from {self.directory}")
+        return True
+    
+    def read(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._index >= len(self.image_paths):
+            if not self.loop or not self.image_paths:
+                return False, None
+            self._index = 0
+            self._restart_pacing()
+        
+        idx = self._index
+        self._index += 1
+        
+        frame = cv2.imread(str(self.image_paths[idx]))
+        if frame is None:
+            logger.warning(f"Could not read {self.image_paths[idx]}")
+            return False, None
+        
+        timestamp = self.timestamps[idx] if self.timestamps is not None else idx / self.fps
+        self._pace(timestamp)
+        
+        return True, self._into(frame, out)
+    
+    def describe(self) -> str:
+        return f"images {self.directory}"
+
+
+class VideoFileSource(_ReplaySource):
+    """Replays a video file using its embedded frame timestamps"""
+    
+    name = "video"
+    
+    def __init__(self, path: Union[str, Path], realtime: bool = True, loop: bool = False):
+        """
+        Args:
+            path: Video file path
+            realtime: Pace frames by their timestamps (False = as fast as possible)
+            loop: Restart from the beginning at the end of the file
+        """
+        super().__init__(realtime=realtime, loop=loop)
+        self.path = Path(path)
+        self.cap: Optional[cv2.VideoCapture] = None
+    
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(str(self.path))
+        
+        if not self.cap.isOpened():
+            logger.error(f"Failed to open video file: {self.path}")
+            self.cap = None
+            return False
+        
+        self.settings = CaptureSettings(
+            backend="file",
+            fourcc="file",
+            width=int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(self.cap.get(cv2.CAP_PROP_FPS)),
+        )
+        logger.info(f"Replaying video {self.path}: {self.settings.width}x{self.settings.height}")
+        return True
+    
+    def read(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self.cap is None:
+            return False, None
+        
+        ret, frame = self.cap.read(image=out) if out is not None else self.cap.read()
+        
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._restart_pacing()
+            ret, frame = self.cap.read(image=out) if out is not None else self.cap.read()
+        
+        if not ret:
+            return False, None
+        
+        self._pace(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+        return True, frame
+    
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+    
+    def describe(self) -> str:
+        return f"video {self.path}"
+
+
+class RecordedSessionSource(ImageDirectorySource):
+    """
+    Replays frames recorded with SessionRecorder
+    
+    Expects data/sessions/<name>/recording/ with numbered frame images and a
+    timestamps.csv holding the original capture time of every frame.
+    """
+    
+    name = "session"
+    
+    def __init__(self, session_dir: Union[str, Path], realtime: bool = True, loop: bool = False):
+        session_dir = Path(session_dir)
+        if not session_dir.exists() and not session_dir.is_absolute():
+            session_dir = Path("data/sessions") / session_dir
+        
+        self.session_dir = session_dir
+        super().__init__(session_dir / RECORDING_DIRNAME, realtime=realtime, loop=loop)
+    
+    def open(self) -> bool:
+        self.timestamps = load_timestamps(self.directory / TIMESTAMPS_FILENAME)
+        return super().open()
+    
+    def describe(self) -> str:
+        return f"session {self.session_dir.name}"
+
+
+class SessionRecorder:
+    """Records raw frames and their timestamps so a scan can be replayed later"""
+    
+    def __init__(self, session_dir: Path, jpeg_quality: int = 95, writer: Optional[SessionWriter] = None):
+        """
+        Args:
+            session_dir: Session directory, frames go to its recording/ subdirectory
+            jpeg_quality: JPEG quality of the saved frames
+            writer: Optional SessionWriter to encode and save frames in the background
+        """
+        self.directory = Path(session_dir) / RECORDING_DIRNAME
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.jpeg_quality = jpeg_quality
+        self.writer = writer
+        self.frame_count = 0
+        self._timestamps_file = open(self.directory / TIMESTAMPS_FILENAME, 'w', newline='')
+        self._writer = csv.writer(self._timestamps_file)
+        self._writer.writerow(['frame', 'timestamp'])
+        
+        logger.info(f"Recording raw frames to {self.directory}")
+    
+    def write(self, frame: np.ndarray, timestamp: float):
+        """Save a frame with its capture timestamp (seconds)"""
+        filename = f"frame_{self.frame_count:06d}.jpg"
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+        if self.writer is not None:
+            # Live frames live in recycled buffers, hand the writer its own copy
+            self.writer.write_image(self.directory / filename, frame.copy(), params)
+        else:
+            cv2.imwrite(str(self.directory / filename), frame, params)
+        self._writer.writerow([self.frame_count, f"{timestamp:.6f}"])
+        self.frame_count += 1
+    
+    def close(self):
+        """Flush and close the timestamp file"""
+        if self._timestamps_file is not None:
+            self._timestamps_file.close()
+            self._timestamps_file = None
+            logger.info(f"Recorded {self.frame_count} frames")
+
+
+def load_timestamps(path: Path) -> Optional[List[float]]:
+    """
+    Load frame timestamps written by SessionRecorder
+    
+    Args:
+        path: Path to timestamps.csv
+    
+    Returns:
+        List of timestamps in seconds or None if the file is missing
+    """
+    if not path.exists():
+        logger.warning(f"No timestamps found at {path}")
+        return None
+    
+    with open(path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        return [float(row['timestamp']) for row in reader]
+
+
+def create_frame_source(spec: Union[str, int], realtime: bool = True, loop: bool = False) -> FrameSource:
+    """
+    Create a replay frame source from a command line style specification
+    
+    Args:
+        spec: Video file, image directory, session directory or session name
+        realtime: Pace frames by their original timestamps (False = as fast as possible)
+        loop: Restart at the end of the footage
+    
+    Returns:
+        FrameSource instance
+    """
+    path = Path(str(spec))
+    session_path = path if path.exists() else Path("data/sessions") / path
+    
+    if (session_path / RECORDING_DIRNAME).is_dir():
+        return RecordedSessionSource(session_path, realtime=realtime, loop=loop)
+    if path.is_dir():
+        return ImageDirectorySource(path, realtime=realtime, loop=loop)
+    return VideoFileSource(path, realtime=realtime, loop=loop)
@@ -0,0 +1,239 @@
+"""
+Synchronized capture from a rig of several cameras
+"""
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.camera.camera_controller import CameraController
+from src.camera.frame_grabber import GrabbedFrame
+from src.vision.orientation_detector import Orientation
+from src.utils.logger import logger
+from src.utils.config_loader import get_config
+
+
+@dataclass
+class RigCamera:
+    """One camera of the rig and the body orientation it sees"""
+    name: str  # Orientation value, e.g. "front"
+    device_id: int
+    controller: CameraController
+
+
+@dataclass
+class SyncedCapture:
+    """Frames of all rig cameras taken on one trigger"""
+    trigger_time: float  # time.monotonic() of the trigger
+    frames: Dict[str, GrabbedFrame] = field(default_factory=dict)  # Private copies per camera
+    
+    @property
+    def offsets_ms(self) -> Dict[str, float]:
+        """Capture time of each frame relative to the trigger"""
+        return {
+            name: (grabbed.timestamp - self.trigger_time) * 1000.0
+            for name, grabbed in self.frames.items()
+        }
+    
+    @property
+    def skew_ms(self) -> float:
+        """Spread between the earliest and latest frame"""
+        if len(self.frames) < 2:
+            return 0.0
+        timestamps = [grabbed.timestamp for grabbed in self.frames.values()]
+        return (max(timestamps) - min(timestamps)) * 1000.0
+
+
+class MultiCameraController:
+    """
+    Opens N cameras and captures them on a common trigger
+    
+    Each camera runs its own background grabber. On trigger() every camera
+    returns the first frame it delivers after the trigger, read in parallel,
+    so the skew between views is bounded by one frame interval plus USB and
+    driver jitter. Without hardware sync this is the tightest software
+    trigger available; the per-trigger skew is recorded so rigs that drift
+    can be spotted in get_skew_report().
+    """
+    
+    def __init__(self, rig: Optional[List[Dict]] = None):
+        """
+        Initialize multi-camera controller
+        
+        Args:
+            rig: List of {'device_id': int, 'orientation': str} (None to use camera.rig.cameras).
+                Raises ValueError for orientations that are unknown or used twice
+        """
+        self.config = get_config()
+        
+        if rig is None:
+            rig = self.config.get('camera.rig.cameras', []) or []
+        
+        self.max_skew_ms = self.config.get('camera.rig.max_skew_ms', 40.0)
+        self.trigger_timeout = self.config.get('camera.rig.trigger_timeout', 1.0)
+        
+        # Names become capture orientations, catch config typos before any camera opens
+        valid = [o.value for o in Orientation if o != Orientation.UNKNOWN]
+        names = [entry.get('orientation') for entry in rig]
+        invalid = [name for name in names if name not in valid]
+        if invalid:
+            raise ValueError(
+                f"Unknown orientation {', '.join(repr(name) for name in invalid)} in camera.rig.cameras "
+                f"(expected one of {', '.join(valid)})"
+            )
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Orientation {', '.join(duplicates)} used by more than one camera in camera.rig.cameras")
+        
+        self.cameras: List[RigCamera] = [
+            RigCamera(
+                name=entry['orientation'],
+                device_id=entry['device_id'],
+                controller=CameraController(device_id=entry['device_id'], threaded=True)
+            )
+            for entry in rig
+        ]
+        
+        if not self.cameras:
+            raise ValueError("Camera rig needs at least one camera (camera.rig.cameras)")
+        
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.is_opened = False
+        
+        # Skew statistics
+        self.triggers = 0
+        self.failed_triggers = 0
+        self._skews_ms: List[float] = []
+        self._offsets_ms: Dict[str, List[float]] = {camera.name: [] for camera in self.cameras}
+        
+        logger.info(
+            "Multi-camera controller initialized: "
+            + ", ".join(f"{camera.name}=device {camera.device_id}" for camera in self.cameras)
+        )
+    
+    @property
+    def primary(self) -> CameraController:
+        """Camera used for live guidance (first in the rig)"""
+        return self.cameras[0].controller
+    
+    @property
+    def names(self) -> List[str]:
+        """Orientation names of the rig cameras"""
+        return [camera.name for camera in self.cameras]
+    
+    def open(self) -> bool:
+        """
+        Open all cameras
+        
+        Returns:
+            True if every camera opened, False otherwise
+        """
+        for camera in self.cameras:
+            if not camera.controller.open():
+                logger.error(f"Failed to open rig camera '{camera.name}' (device {camera.device_id})")
+                self.release()
+                return False
+        
+        self._executor = ThreadPoolExecutor(max_workers=len(self.cameras), thread_name_prefix="RigTrigger")
+        self.is_opened = True
+        logger.info(f"Camera rig opened with {len(self.cameras)} cameras")
+        return True
+    
+    def _read_after(self, camera: RigCamera, trigger_time: float) -> Optional[GrabbedFrame]:
+        """First frame of a camera captured at or after the trigger, copied"""
+        deadline = trigger_time + self.trigger_timeout
+        
+        while time.monotonic() < deadline:
+            grabbed = camera.controller.read_latest(wait=True)
+            if grabbed is None:
+                return None
+            if grabbed.timestamp >= trigger_time:
+                return GrabbedFrame(grabbed.image.copy(), grabbed.timestamp, grabbed.frame_id, grabbed.source_timestamp)
+        
+        return None
+    
+    def trigger(self) -> Optional[SyncedCapture]:
+        """
+        Capture all cameras on a common trigger
+        
+        Returns:
+            SyncedCapture with one frame per camera, or None if a camera failed
+        """
+        if not self.is_opened:
+            logger.error("Camera rig not opened")
+            return None
+        
+        trigger_time = time.monotonic()
+        futures = {
+            camera.name: self._executor.submit(self._read_after, camera, trigger_time)
+            for camera in self.cameras
+        }
+        
+        capture = SyncedCapture(trigger_time=trigger_time)
+        for name, future in futures.items():
+            grabbed = future.result()
+            if grabbed is None:
+                logger.warning(f"Rig camera '{name}' delivered no frame for the trigger")
+                self.failed_triggers += 1
+                return None
+            capture.frames[name] = grabbed
+        
+        self.triggers += 1
+        self._skews_ms.append(capture.skew_ms)
+        for name, offset in capture.offsets_ms.items():
+            self._offsets_ms[name].append(offset)
+        
+        if capture.skew_ms > self.max_skew_ms:
+            logger.warning(f"Rig trigger skew {capture.skew_ms:.1f} ms exceeds {self.max_skew_ms:.0f} ms")
+        else:
+            logger.info(f"Rig trigger captured {len(capture.frames)} views (skew {capture.skew_ms:.1f} ms)")
+        
+        return capture
+    
+    def get_skew_report(self) -> Dict:
+        """
+        Get timing statistics over all triggers
+        
+        Returns:
+            Dictionary with trigger counts, skew statistics and the mean
+            offset of each camera from the trigger
+        """
+        skews = np.array(self._skews_ms) if self._skews_ms else None
+        
+        return {
+            'triggers': self.triggers,
+            'failed_triggers': self.failed_triggers,
+            'max_skew_ms': float(skews.max()) if skews is not None else None,
+            'median_skew_ms': float(np.median(skews)) if skews is not None else None,
+            'p95_skew_ms': float(np.percentile(skews, 95)) if skews is not None else None,
+            'over_limit': int((skews > self.max_skew_ms).sum()) if skews is not None else 0,
+            'mean_offset_ms': {
+                name: float(np.mean(offsets)) if offsets else None
+                for name, offsets in self._offsets_ms.items()
+            },
+            'dropped_frames': {
+                camera.name: camera.controller.get_capture_stats()['frames_dropped']
+                for camera in self.cameras
+            },
+        }
+    
+    def release(self):
+        """Release all cameras"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        for camera in self.cameras:
+            camera.controller.release()
+        
+        self.is_opened = False
+    
+    def __enter__(self):
+        """Context manager entry"""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.release()
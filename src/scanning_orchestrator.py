@@ -3,21 +3,35 @@ Main scanning orchestrator - coordinates the entire body scanning process
 """
 import cv2
 import numpy as np
-from typing import Optional, Callable, Dict, Tuple
+from typing import Optional, Callable, Dict, Tuple, List
 from pathlib import Path
 from datetime import datetime
 import time
 
 from src.camera.camera_controller import CameraController
+from src.camera.multi_camera import MultiCameraController
+from src.camera.frame_source import SessionRecorder
 from src.vision.pose_detector import PoseDetector, PoseLandmarks
 from src.vision.orientation_detector import OrientationDetector, Orientation
 from src.vision.body_segmentation import BodySegmenter
 from src.vision.depth_estimator import DepthEstimator
+from src.vision.pose_stability import PoseStabilityTracker
+from src.vision.keyframe_tracker import KeyframePoseTracker
+from src.vision.landmark_filter import OneEuroLandmarkFilter
+from src.vision.mask_tracker import TemporalMaskTracker
+from src.vision.quality_gate import QualityGate, QualityReport
+from src.vision.frame_context import FrameContext
 from src.reconstruction.body_reconstructor import BodyReconstructor, MultiViewCapture
 from src.measurements.body_measurements import BodyMeasurementExtractor, BodyMeasurements
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
-from src.utils.image_processing import draw_text_with_background
+from src.utils.image_processing import score_frame
+from src.utils.buffer_pool import get_buffer_pool
+from src.utils.model_registry import get_model_registry
+from src.utils.latency import LatencyTracker
+from src.utils.quality_governor import QualityGovernor
+from src.ui.overlay import OverlayCompositor
+from src.utils.session_writer import SessionWriter
 
 
 class ScanningState:
@@ -37,12 +51,20 @@ class ScanningOrchestrator:
     Coordinates all components to achieve 98%+ measurement accuracy
     """
     
-    def __init__(self, session_name: Optional[str] = None):
+    def __init__(
+        self,
+        session_name: Optional[str] = None,
+        camera: Optional[CameraController] = None,
+        rig: Optional[MultiCameraController] = None
+    ):
         """
         Initialize scanning orchestrator
         
         Args:
             session_name: Optional session name for organizing output
+            camera: Optional camera controller, e.g. one replaying a recorded session
+            rig: Optional multi-camera rig. Guidance runs on its first camera and
+                every capture takes all orientations from one stable pose
         """
         self.config = get_config()
         
@@ -56,13 +78,32 @@ class ScanningOrchestrator:
         # Initialize components
         logger.info("Initializing scanning system...")
         
-        self.camera = CameraController()
-        self.pose_detector = PoseDetector()
-        self.orientation_detector = OrientationDetector()
-        self.body_segmenter = BodySegmenter(method="mediapipe")
-        self.depth_estimator = DepthEstimator(model_type="DPT_Large")
+        self.rig = rig
+        if rig is not None:
+            self.camera = rig.primary
+        else:
+            self.camera = camera if camera is not None else CameraController()
+        # Models are shared and reference-counted through one registry
+        self.model_registry = get_model_registry()
+        
+        # Light streaming tracker for guidance, static high-accuracy detector for captures
+        self.pose_detector = PoseDetector(registry=self.model_registry)
+        self.capture_pose_detector = PoseDetector.for_capture(registry=self.model_registry)
+        self.orientation_detector = OrientationDetector(pose_detector=self.pose_detector)
+        self.body_segmenter = BodySegmenter(method="mediapipe", registry=self.model_registry)
+        self.depth_estimator = DepthEstimator(model_type="DPT_Large", registry=self.model_registry)
         self.body_reconstructor = BodyReconstructor()
         self.measurement_extractor = BodyMeasurementExtractor()
+        self.quality_gate = QualityGate()
+        self.pose_tracker = KeyframePoseTracker(self.pose_detector)
+        self.landmark_filter = OneEuroLandmarkFilter()
+        # Live selfie mask for the quality bar, reusing the segmenter's MediaPipe model
+        self.mask_tracker: Optional[TemporalMaskTracker] = (
+            TemporalMaskTracker(self.body_segmenter)
+            if self.body_segmenter.method in ["mediapipe", "hybrid"] else None
+        )
+        self.last_orientation: Optional[Tuple[Orientation, float]] = None
+        self.last_quality_report: Optional[QualityReport] = None
         
         # Scanning state
         self.state = ScanningState.INITIALIZING
@@ -76,15 +117,73 @@ class ScanningOrchestrator:
         ]
         self.current_orientation_idx = 0
         
+        if rig is not None:
+            # The customer only faces the primary camera, the other views come from the rig
+            self.orientations_to_capture = [Orientation(rig.names[0])]
+            missing = {o.value for o in Orientation if o != Orientation.UNKNOWN} - set(rig.names)
+            if missing:
+                logger.warning(f"Camera rig does not cover {', '.join(sorted(missing))} - scan will be incomplete")
+        
         # Frame stability tracking
         self.stable_frames_count = 0
         self.required_stable_frames = self.config.get('quality_control.pose_stability_frames', 5)
-        self.recent_landmarks = []
+        self.stability_tracker = PoseStabilityTracker()
         
         # Capture settings
         self.images_per_orientation = self.config.get('capture.images_per_orientation', 3)
+        self.burst_size = self.config.get('capture.burst_size', 5)
         self.current_captures_for_orientation = 0
         
+        # Display and recording
+        self.show_preview = self.config.get('ui.show_preview', True)
+        self.record_session = self.config.get('advanced.record_session', False)
+        self.recorder: Optional[SessionRecorder] = None
+        
+        # Throughput and capture latency statistics
+        self.frames_processed = 0
+        self.loop_seconds = 0.0
+        self.capture_wait_start_frame = 0
+        self.capture_wait_start_time: Optional[float] = None  # On the frame timeline
+        self.current_frame_timestamp: Optional[float] = None  # Source time, recorded time for replays
+        self.current_frame_capture_time: Optional[float] = None  # time.monotonic() when it was grabbed
+        self.capture_log: List[Dict] = []
+        
+        # Preallocated buffers for the live loop
+        self.buffer_pool = get_buffer_pool()
+        self.overlay = OverlayCompositor(self.buffer_pool)
+        self.warmup_frames = 30
+        self.allocations_after_warmup: Optional[int] = None
+        
+        # Derived images shared by the vision stages: downscaled levels for live
+        # guidance, full resolution conversions for captures
+        self.frame_context = FrameContext(
+            processing_width=self.config.get('advanced.processing_width', 640),
+            buffer_pool=self.buffer_pool
+        )
+        self.capture_context = FrameContext(processing_width=0, buffer_pool=self.buffer_pool)
+        
+        # Background file output
+        self.save_intermediate_results = self.config.get('advanced.save_intermediate_results', True)
+        self.session_writer = SessionWriter(
+            max_workers=self.config.get('advanced.writer_threads', 2),
+            max_pending=self.config.get('advanced.writer_queue_size', 16)
+        )
+        
+        # Per-stage latency instrumentation
+        self.latency = LatencyTracker(
+            window=self.config.get('advanced.latency_window', 300),
+            frame_interval_ms=1000.0 / max(1, self.camera.fps),
+            display_latency_ms=self.config.get('ui.display_latency_ms', 16.7)
+        )
+        self.latency_report_interval = self.config.get('advanced.latency_report_interval', 300)
+        
+        # Frame-time budget: steps live model, resolution and overlays up or down
+        self.show_skeleton = self.config.get('ui.show_skeleton', True)
+        self.show_mask_quality = self.mask_tracker is not None and self.config.get('ui.show_mask_quality', True)
+        self.governor = QualityGovernor()
+        if self.governor.enabled:
+            self._apply_quality_settings(self.governor.settings)
+        
         logger.info(f"Scanning session initialized: {session_name}")
     
     def start_scanning(self, callback: Optional[Callable] = None):
@@ -99,7 +198,8 @@ class ScanningOrchestrator:
         logger.info("=" * 60)
         
         # Open camera
-        if not self.camera.open():
+        opened = self.rig.open() if self.rig is not None else self.camera.open()
+        if not opened:
             logger.error("Failed to open camera")
             self.state = ScanningState.ERROR
             return
@@ -111,32 +211,82 @@ class ScanningOrchestrator:
             self._run_scanning_loop(callback)
             
         finally:
-            # Cleanup
-            self.camera.release()
+            # Cleanup, also when the loop raised: finish the recording index
+            # and every pending write before releasing the models
+            if self.recorder is not None:
+                self.recorder.close()
+                self.recorder = None
+            self.session_writer.close()
+            if self.rig is not None:
+                self.rig.release()
+            else:
+                self.camera.release()
+            self.pose_tracker.release()
+            if self.mask_tracker is not None:
+                self.mask_tracker.release()
+            self.quality_gate.release()
+            self.overlay.release()
+            self.frame_context.release()
+            self.capture_context.release()
             self.pose_detector.release()
+            self.capture_pose_detector.release()
             self.body_segmenter.release()
             self.depth_estimator.release()
     
     def _run_scanning_loop(self, callback: Optional[Callable] = None):
         """Main scanning loop with real-time feedback"""
         
-        cv2.namedWindow("Body Scanning", cv2.WINDOW_NORMAL)
+        if self.show_preview:
+            cv2.namedWindow("Body Scanning", cv2.WINDOW_NORMAL)
+        
+        if self.record_session:
+            self.recorder = SessionRecorder(self.session_dir, writer=self.session_writer)
+        
+        loop_start = time.monotonic()
+        self.capture_wait_start_time = None
         
         while self.current_orientation_idx < len(self.orientations_to_capture):
-            ret, frame = self.camera.read_frame()
+            grabbed = self.camera.read_latest()
             
-            if not ret or frame is None:
+            if grabbed is None:
                 logger.error("Failed to read frame")
                 break
             
+            frame = grabbed.image
+            self.current_frame_timestamp = grabbed.source_timestamp
+            self.current_frame_capture_time = grabbed.timestamp
+            if self.capture_wait_start_time is None:
+                self.capture_wait_start_time = grabbed.source_timestamp
+            self.latency.begin_frame(grabbed.timestamp)
+            
+            if self.recorder is not None:
+                with self.latency.measure('record'):
+                    self.recorder.write(frame, grabbed.source_timestamp)
+            
             # Process frame
             display_frame = self._process_frame(frame)
+            self.frames_processed += 1
+            
+            if self.frames_processed == self.warmup_frames:
+                self.allocations_after_warmup = self.buffer_pool.allocations
             
             # Show frame
-            cv2.imshow("Body Scanning", display_frame)
+            key = 0xFF
+            if self.show_preview:
+                with self.latency.measure('display'):
+                    cv2.imshow("Body Scanning", display_frame)
+                    
+                    # Handle key presses
+                    key = cv2.waitKey(1) & 0xFF
+            
+            frame_ms = self.latency.end_frame()
+            if frame_ms is not None:
+                new_settings = self.governor.update(frame_ms)
+                if new_settings is not None:
+                    self._apply_quality_settings(new_settings)
+            if self.latency_report_interval and self.latency.frames % self.latency_report_interval == 0:
+                logger.info("Live loop latency:\n" + self.latency.format_summary())
             
-            # Handle key presses
-            key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 logger.info("Scanning cancelled by user")
                 break
@@ -152,7 +302,42 @@ class ScanningOrchestrator:
                 progress = (self.current_orientation_idx / len(self.orientations_to_capture)) * 100
                 callback(progress, self.state)
         
-        cv2.destroyAllWindows()
+        self.loop_seconds = time.monotonic() - loop_start
+        
+        if self.show_preview:
+            cv2.destroyAllWindows()
+        
+        capture_stats = self.camera.get_capture_stats()
+        logger.info(
+            f"Camera frames: {capture_stats['frames_captured']} captured, "
+            f"{capture_stats['frames_dropped']} dropped"
+        )
+        throughput = self.get_throughput_stats()
+        logger.info(
+            f"Processed {throughput['frames_processed']} frames in {throughput['loop_seconds']:.1f}s "
+            f"({throughput['processing_fps']:.1f} fps)"
+        )
+        if self.latency.frames:
+            logger.info("Live loop latency:\n" + self.latency.format_summary())
+        if self.rig is not None and self.rig.triggers:
+            rig_report = self.rig.get_skew_report()
+            logger.info(
+                f"Rig triggers: {rig_report['triggers']} ({rig_report['failed_triggers']} failed), "
+                f"skew median {rig_report['median_skew_ms']:.1f} ms, max {rig_report['max_skew_ms']:.1f} ms"
+            )
+        if throughput['steady_state_allocations'] is not None:
+            logger.info(
+                f"Frame buffer allocations after {self.warmup_frames} warm-up frames: "
+                f"{throughput['steady_state_allocations']}"
+            )
+        
+        # Make sure every capture is on disk before processing
+        self.session_writer.flush()
+        writer_stats = self.session_writer.get_stats()
+        logger.info(
+            f"Session files written: {writer_stats['files_written']} "
+            f"({writer_stats['failures']} failed, {writer_stats['blocked_submits']} waits on a full queue)"
+        )
         
         # Process captured data
         if self.multi_view_capture.has_complete_scan():
@@ -160,6 +345,26 @@ class ScanningOrchestrator:
         else:
             logger.warning("Incomplete scan - not all orientations captured")
     
+    def _apply_quality_settings(self, settings: Dict):
+        """Apply a quality level chosen by the governor to the live components"""
+        if 'model_complexity' in settings:
+            self.pose_detector.set_model_complexity(settings['model_complexity'])
+        if 'processing_width' in settings:
+            self.frame_context.processing_width = settings['processing_width']
+        if 'keyframe_interval' in settings:
+            self.pose_tracker.keyframe_interval = max(1, settings['keyframe_interval'])
+            self.pose_tracker.reset()
+        if 'show_skeleton' in settings:
+            self.show_skeleton = settings['show_skeleton'] and self.config.get('ui.show_skeleton', True)
+        if self.mask_tracker is not None:
+            if 'mask_keyframe_interval' in settings:
+                self.mask_tracker.keyframe_interval = max(1, settings['mask_keyframe_interval'])
+            if 'show_mask_quality' in settings:
+                self.show_mask_quality = settings['show_mask_quality'] and self.config.get('ui.show_mask_quality', True)
+                if not self.show_mask_quality:
+                    # Start from a fresh keyframe when the bar comes back
+                    self.mask_tracker.reset()
+    
     def _process_frame(self, frame: np.ndarray) -> np.ndarray:
         """
         Process frame and update state
@@ -170,41 +375,86 @@ class ScanningOrchestrator:
         Returns:
             Display frame with overlays
         """
-        display_frame = frame.copy()
+        self.overlay.begin(frame)
+        self._analyze_frame(frame)
+        
+        # All components have queued their overlays, compose them in one pass
+        with self.latency.measure('overlay'):
+            return self.overlay.render()
+    
+    def _analyze_frame(self, frame: np.ndarray):
+        """
+        Run live guidance on a frame, queueing overlays on self.overlay
+        
+        Args:
+            frame: Input frame
+        """
+        # Live guidance runs on the processing level, captures use the full frame
+        with self.latency.measure('pyramid'):
+            self.frame_context.update(frame, self.current_frame_timestamp)
+            # Build the processing level here so its cost shows up in this stage
+            self.frame_context.level(self.frame_context.processing_width)
         
         # Detect pose
-        landmarks = self.pose_detector.detect(frame)
+        with self.latency.measure('pose'):
+            raw_landmarks = self.pose_tracker.process(self.frame_context)
+        self.frame_context.landmarks = raw_landmarks
+        
+        # Guidance runs on smoothed landmarks, the frame context keeps the raw ones
+        landmarks = self.landmark_filter.filter(raw_landmarks)
         
         if landmarks is None:
             # No person detected
-            self._draw_instruction(display_frame, "[WARN] No person detected. Please step into view.", (0, 0, 255))
+            self._draw_instruction("[WARN] No person detected. Please step into view.", (0, 0, 255))
             self.stable_frames_count = 0
-            return display_frame
+            self.orientation_detector.reset_tracking()
+            self.last_orientation = None
+            if self.mask_tracker is not None:
+                self.mask_tracker.reset()
+            return
         
         # Draw pose landmarks
-        display_frame = self.pose_detector.draw_landmarks(display_frame, landmarks)
-        
-        # Detect orientation
-        current_orientation, confidence = self.orientation_detector.detect_orientation(landmarks)
+        if self.show_skeleton:
+            self.pose_detector.add_to_overlay(self.overlay, landmarks)
+        
+        # Live segmentation quality, the model only runs on mask keyframes
+        if self.show_mask_quality:
+            with self.latency.measure('segmentation'):
+                self.mask_tracker.process(self.frame_context)
+            self._draw_mask_quality()
+        
+        # Detect orientation. The face and visibility cues only change on detected
+        # landmarks, so tracked frames keep the result of the last keyframe
+        with self.latency.measure('orientation'):
+            if landmarks.is_tracked and self.last_orientation is not None:
+                current_orientation, confidence = self.last_orientation
+            else:
+                current_orientation, confidence = self.orientation_detector.update_orientation(landmarks)
+                self.last_orientation = (current_orientation, confidence)
         
         # Get current target
         target_orientation = self.orientations_to_capture[self.current_orientation_idx]
         
         # Draw orientation overlay
-        display_frame = self.orientation_detector.draw_orientation_overlay(
-            display_frame, current_orientation, confidence, target_orientation
+        self.orientation_detector.add_to_overlay(
+            self.overlay, current_orientation, confidence, target_orientation
         )
         
         # Check if correct orientation
         if current_orientation == target_orientation and confidence > 0.85:
             # Track stability
-            self.recent_landmarks.append(landmarks)
-            if len(self.recent_landmarks) > 10:
-                self.recent_landmarks.pop(0)
-            
-            is_stable = self.pose_detector.is_pose_stable(self.recent_landmarks, threshold=0.02)
+            is_stable = self.stability_tracker.update(landmarks)
             
+            # Only count frames that would make a usable capture
+            quality = None
             if is_stable:
+                with self.latency.measure('quality'):
+                    quality = self.quality_gate.evaluate(self.frame_context)
+            self.last_quality_report = quality
+            
+            if quality is not None and not quality.passed:
+                self._draw_instruction(quality.message, (0, 165, 255))
+            elif is_stable:
                 self.stable_frames_count += 1
                 
                 if self.stable_frames_count >= self.required_stable_frames:
@@ -212,69 +462,145 @@ class ScanningOrchestrator:
                         self.state = ScanningState.POSITION_CONFIRMED
                         
                         # Auto-capture after confirmation
-                        time.sleep(0.5)
-                        self._trigger_capture(frame, landmarks)
+                        self._trigger_capture(frame)
+                        
+                        # Capture blocks the loop, keep it out of the live latency stats
+                        self.latency.discard_frame()
                 
                 # Draw stability progress
                 progress_text = f"Hold still... {self.stable_frames_count}/{self.required_stable_frames}"
-                self._draw_instruction(display_frame, progress_text, (0, 255, 0))
+                self._draw_instruction(progress_text, (0, 255, 0))
             else:
                 self.stable_frames_count = 0
-                self._draw_instruction(display_frame, "Please hold still", (255, 165, 0))
+                self._draw_instruction(
+                    f"Please hold still ({self.stability_tracker.score * 100:.0f}% steady)", (255, 165, 0)
+                )
         else:
             self.stable_frames_count = 0
-            self.recent_landmarks.clear()
+            self.stability_tracker.reset()
             
             # Show guidance
             guidance = self.orientation_detector.get_guidance_message(
                 current_orientation, target_orientation, confidence
             )
-            self._draw_instruction(display_frame, guidance, (255, 255, 0))
+            self._draw_instruction(guidance, (255, 255, 0))
         
         # Draw progress
-        self._draw_progress(display_frame)
-        
-        return display_frame
+        self._draw_progress()
     
-    def _trigger_capture(self, frame: np.ndarray, landmarks: Optional[PoseLandmarks] = None):
-        """Trigger capture for current orientation"""
+    def _trigger_capture(self, frame: np.ndarray):
+        """
+        Trigger capture for current orientation
         
+        The stored landmarks come from the static capture detector on the
+        full resolution frame, not from the smoothed live tracker.
+        """
+        
+        if self.rig is not None:
+            self._trigger_rig_capture()
+            return
+        
+        if self.burst_size > 1:
+            frame = self._select_capture_frame(frame)
+        else:
+            # The camera recycles its frame buffers, keep a private copy of the capture
+            frame = frame.copy()
+        
+        self.capture_context.update(frame)
+        landmarks = self.capture_pose_detector.detect(self.capture_context)
         if landmarks is None:
-            landmarks = self.pose_detector.detect(frame)
-            if landmarks is None:
-                logger.warning("Cannot capture - no pose detected")
-                return
+            logger.warning("Cannot capture - no pose detected")
+            return
         
         logger.info(f"Capturing {self.orientations_to_capture[self.current_orientation_idx].value}...")
         
         self.state = ScanningState.CAPTURING
         
-        # Segment body
-        segmented, mask = self.body_segmenter.segment(frame, background_blur=False)
+        orientation = self.orientations_to_capture[self.current_orientation_idx]
+        self._store_capture(orientation, landmarks, self.current_captures_for_orientation)
+        
+        self._finish_capture(orientation)
+    
+    def _trigger_rig_capture(self):
+        """Capture every rig camera on one trigger, one orientation per camera"""
+        logger.info(f"Triggering camera rig ({', '.join(self.rig.names)})...")
+        
+        self.state = ScanningState.CAPTURING
+        
+        synced = self.rig.trigger()
+        if synced is None:
+            logger.warning("Rig capture failed - retrying on the next stable pose")
+            self.state = ScanningState.WAITING_FOR_POSITION
+            self.stable_frames_count = 0
+            return
+        
+        capture_idx = self.current_captures_for_orientation
+        for name, grabbed in synced.frames.items():
+            self.capture_context.update(grabbed.image, grabbed.timestamp)
+            landmarks = self.capture_pose_detector.detect(self.capture_context)
+            if landmarks is None:
+                logger.warning(f"No pose detected in rig view '{name}', view skipped")
+                continue
+            self._store_capture(Orientation(name), landmarks, capture_idx)
+        
+        self._finish_capture(self.orientations_to_capture[self.current_orientation_idx])
+    
+    def _store_capture(
+        self,
+        orientation: Orientation,
+        landmarks: PoseLandmarks,
+        capture_idx: int
+    ):
+        """
+        Segment, estimate depth and save the view in self.capture_context
+        
+        The context frame has to be a private copy, it is stored as is.
+        
+        Args:
+            orientation: Orientation the view shows
+            landmarks: Pose landmarks of the frame
+            capture_idx: Index of the capture within the orientation
+        """
+        frame = self.capture_context.full
+        
+        # Segment body, reusing the person mask of the capture pose detection
+        segmented, mask = self.body_segmenter.segment(
+            self.capture_context, background_blur=False, soft_mask=landmarks.segmentation_mask
+        )
+        # The binary mask is stored with the capture, don't keep the float mask around as well
+        landmarks.segmentation_mask = None
         
         # Estimate depth
-        depth_map = self.depth_estimator.estimate_depth(frame)
+        depth_map = self.depth_estimator.estimate_depth(self.capture_context)
         
         # Save capture data
-        orientation = self.orientations_to_capture[self.current_orientation_idx]
         self.multi_view_capture.add_capture(
             orientation, frame, landmarks, depth_map, mask
         )
         
-        # Save images for reference
+        # Save images for reference (in the background)
         orientation_dir = self.session_dir / orientation.value
-        orientation_dir.mkdir(exist_ok=True)
-        
-        capture_idx = self.current_captures_for_orientation
-        cv2.imwrite(str(orientation_dir / f"capture_{capture_idx}.jpg"), frame)
-        cv2.imwrite(str(orientation_dir / f"segmented_{capture_idx}.jpg"), segmented)
-        cv2.imwrite(str(orientation_dir / f"mask_{capture_idx}.jpg"), mask)
+        self.session_writer.write_image(orientation_dir / f"capture_{capture_idx}.jpg", frame)
         
-        # Save depth visualization
-        depth_colored = self.depth_estimator.colorize_depth(depth_map)
-        cv2.imwrite(str(orientation_dir / f"depth_{capture_idx}.jpg"), depth_colored)
+        if self.save_intermediate_results:
+            self.session_writer.write_image(orientation_dir / f"segmented_{capture_idx}.jpg", segmented)
+            self.session_writer.write_image(orientation_dir / f"mask_{capture_idx}.jpg", mask)
+            
+            # Depth visualization is colorized on the writer thread
+            self.session_writer.write_converted(
+                orientation_dir / f"depth_{capture_idx}.jpg", depth_map, self.depth_estimator.colorize_depth
+            )
+    
+    def _finish_capture(self, orientation: Orientation):
+        """Advance the capture count and move on when the orientation is done"""
+        # The loop stalled during the capture, start tracking again from a keyframe
+        self.pose_tracker.reset()
+        self.landmark_filter.reset()
+        if self.mask_tracker is not None:
+            self.mask_tracker.reset()
         
         self.current_captures_for_orientation += 1
+        self._log_capture(orientation)
         
         logger.info(f"Captured {self.current_captures_for_orientation}/{self.images_per_orientation} images for {orientation.value}")
         
@@ -285,12 +611,87 @@ class ScanningOrchestrator:
             self.state = ScanningState.WAITING_FOR_POSITION
             self.stable_frames_count = 0
     
+    def _select_capture_frame(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Pick the sharpest of the current frame and a fresh burst
+        
+        Args:
+            frame: Frame that triggered the capture
+            
+        Returns:
+            Sharpest frame, a private copy owned by the caller
+        """
+        # Synchronous burst reads reuse the camera buffer that holds `frame`
+        frame = frame.copy()
+        current_score = score_frame(frame, self.camera.burst_proxy_width)
+        burst = self.camera.capture_burst(self.burst_size, top_k=1)
+        
+        if not burst or burst[0][1].score <= current_score.score:
+            return frame
+        
+        best_frame, best_score = burst[0]
+        logger.info(
+            f"Using burst frame (sharpness {best_score.sharpness:.1f} vs {current_score.sharpness:.1f})"
+        )
+        return best_frame
+    
+    def _log_capture(self, orientation: Orientation):
+        """
+        Record how long it took to reach this capture
+        
+        Seconds to capture are measured on the frame timeline, so replayed
+        recordings give the same result at any replay speed. The capture
+        latency is wall-clock time since the trigger frame was grabbed.
+        """
+        now = time.monotonic()
+        frame_timestamp = self.current_frame_timestamp if self.current_frame_timestamp is not None else now
+        capture_time = self.current_frame_capture_time if self.current_frame_capture_time is not None else now
+        wait_start = self.capture_wait_start_time if self.capture_wait_start_time is not None else frame_timestamp
+        
+        self.capture_log.append({
+            'orientation': orientation.value,
+            'frames_to_capture': self.frames_processed - self.capture_wait_start_frame,
+            'seconds_to_capture': frame_timestamp - wait_start,
+            'capture_latency_ms': (now - capture_time) * 1000.0,
+        })
+        
+        self.capture_wait_start_frame = self.frames_processed
+        self.capture_wait_start_time = frame_timestamp
+    
+    def get_throughput_stats(self) -> Dict:
+        """
+        Get frame throughput and capture latency statistics
+        
+        Returns:
+            Dictionary of throughput statistics
+        """
+        frames_to_capture = [entry['frames_to_capture'] for entry in self.capture_log]
+        seconds_to_capture = [entry['seconds_to_capture'] for entry in self.capture_log]
+        latencies = [entry['capture_latency_ms'] for entry in self.capture_log]
+        
+        return {
+            'frames_processed': self.frames_processed,
+            'loop_seconds': self.loop_seconds,
+            'processing_fps': self.frames_processed / self.loop_seconds if self.loop_seconds > 0 else 0.0,
+            'captures': len(self.capture_log),
+            'median_frames_to_capture': float(np.median(frames_to_capture)) if frames_to_capture else None,
+            'median_seconds_to_capture': float(np.median(seconds_to_capture)) if seconds_to_capture else None,
+            'median_capture_latency_ms': float(np.median(latencies)) if latencies else None,
+            'buffer_allocations': self.buffer_pool.allocations,
+            'steady_state_allocations': (
+                self.buffer_pool.allocations - self.allocations_after_warmup
+                if self.allocations_after_warmup is not None else None
+            ),
+        }
+    
     def _next_orientation(self):
         """Move to next orientation"""
         self.current_orientation_idx += 1
         self.current_captures_for_orientation = 0
+        self.capture_wait_start_frame = self.frames_processed
+        self.capture_wait_start_time = self.current_frame_timestamp
         self.stable_frames_count = 0
-        self.recent_landmarks.clear()
+        self.stability_tracker.reset()
         self.state = ScanningState.WAITING_FOR_POSITION
         
         if self.current_orientation_idx < len(self.orientations_to_capture):
@@ -354,26 +755,40 @@ class ScanningOrchestrator:
         
         return measurements
     
-    def _draw_instruction(self, frame: np.ndarray, text: str, color: Tuple[int, int, int]):
-        """Draw instruction text on frame"""
-        h, w = frame.shape[:2]
-        
-        # Draw at top center
-        text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
-        x = (w - text_size[0]) // 2
-        y = 40
-        
-        draw_text_with_background(
-            frame, text, (x, y),
+    def _draw_instruction(self, text: str, color: Tuple[int, int, int]):
+        """Draw instruction text at the top center"""
+        w, _ = self.overlay.size
+        self.overlay.text(
+            text, (w // 2, 40),
             font_scale=0.8, thickness=2,
-            text_color=color,
+            color=color,
             bg_color=(0, 0, 0),
-            padding=10
+            padding=10,
+            centered=True
         )
     
-    def _draw_progress(self, frame: np.ndarray):
-        """Draw scanning progress on frame"""
-        h, w = frame.shape[:2]
+    def _draw_mask_quality(self):
+        """
+        Draw how decisive the live selfie mask is at the top right
+        
+        This is the selfie model's mask at the tracking resolution, an
+        indication of segmentation conditions (background, lighting). It is
+        not the pose mask quality that gates capture segmentation.
+        """
+        w, _ = self.overlay.size
+        bar_width = 200
+        bar_x = w - bar_width - 20
+        bar_y = 80
+        
+        quality = self.mask_tracker.quality
+        color = (0, 255, 0) if quality >= self.mask_tracker.good_quality else (0, 165, 255)
+        
+        self.overlay.bar((bar_x, bar_y), (bar_width, 20), quality, fill_color=color)
+        self.overlay.text(f"Selfie mask: {quality * 100:.0f}%", (bar_x, bar_y - 5), font_scale=0.6)
+    
+    def _draw_progress(self):
+        """Draw scanning progress"""
+        w, h = self.overlay.size
         
         # Draw progress bar
         bar_width = 400
@@ -385,24 +800,14 @@ class ScanningOrchestrator:
         progress = (self.current_orientation_idx + 
                    (self.current_captures_for_orientation / self.images_per_orientation)) / total_orientations
         
-        # Background
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (50, 50, 50), -1)
-        
-        # Progress fill
-        fill_width = int(bar_width * progress)
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + fill_width, bar_y + bar_height), (0, 255, 0), -1)
-        
-        # Border
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (255, 255, 255), 2)
+        self.overlay.bar(
+            (bar_x, bar_y), (bar_width, bar_height), progress,
+            fill_color=(0, 255, 0), border_color=(255, 255, 255)
+        )
         
         # Text
         progress_text = f"Progress: {progress*100:.0f}% ({self.current_orientation_idx}/{total_orientations} orientations)"
-        text_size = cv2.getTextSize(progress_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-        text_x = bar_x + (bar_width - text_size[0]) // 2
-        text_y = bar_y - 10
-        
-        cv2.putText(frame, progress_text, (text_x, text_y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.overlay.text(progress_text, (bar_x + bar_width // 2, bar_y - 10), font_scale=0.6, centered=True)
     
     def get_session_summary(self) -> Dict:
         """Get summary of scanning session"""
@@ -411,6 +816,25 @@ class ScanningOrchestrator:
             'session_dir': str(self.session_dir),
             'state': self.state,
             'total_captures': self.multi_view_capture.get_total_captures(),
+            'throughput': self.get_throughput_stats(),
+            'pose_tracking': self.pose_tracker.get_stats(),
+            'pose_inference': self.pose_detector.get_inference_stats(),
+            'landmark_filter': self.landmark_filter.get_stats(),
+            'capture_pose_inferences': self.capture_pose_detector.full_inferences,
+            'segmentation': self.body_segmenter.get_stats(),
+            'mask_tracking': self.mask_tracker.get_stats() if self.mask_tracker is not None else None,
+            'overlay': self.overlay.get_stats(),
+            'frame_context': {
+                'live': self.frame_context.get_stats(),
+                'capture': self.capture_context.get_stats(),
+            },
+            'quality_governor': self.governor.get_summary(),
+            'models': self.model_registry.get_report(),
+            'rig': self.rig.get_skew_report() if self.rig is not None else None,
+            'latency': self.latency.summary(),
+            'camera_settings': (
+                self.camera.capture_settings.summary() if self.camera.capture_settings else None
+            ),
             'orientations_captured': [
                 orient.value for orient in self.orientations_to_capture[:self.current_orientation_idx]
             ]
@@ -0,0 +1,315 @@
+"""
+Single-pass overlay compositor for the live scanning view
+"""
+import cv2
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+
+
+Color = Tuple[int, int, int]
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@dataclass
+class Sprite:
+    """Pre-rendered overlay element"""
+    image: np.ndarray  # BGR pixels
+    mask: Optional[np.ndarray]  # Pixels to copy (None = opaque rectangle)
+
+
+class OverlayCompositor:
+    """
+    Collects draw commands from all components and renders them in one pass
+    
+    Usage per frame:
+        overlay.begin(frame)
+        overlay.text(...)         # any number of commands, from any component
+        display = overlay.render()
+    
+    render() copies the frame once into a reusable display buffer and draws
+    every command into it. Text and widgets are rendered into small sprites
+    that are cached by content, so unchanged labels, bars and panels are only
+    blitted, and text metrics are measured once per distinct string.
+    """
+    
+    def __init__(self, buffer_pool: Optional[FrameBufferPool] = None, max_cached_sprites: int = 512):
+        """
+        Initialize overlay compositor
+        
+        Args:
+            buffer_pool: Pool for the display buffer (None for the global pool)
+            max_cached_sprites: Number of rendered sprites kept
+        """
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        self.max_cached_sprites = max_cached_sprites
+        
+        self._frame: Optional[np.ndarray] = None
+        self._commands: List[Callable[[np.ndarray], None]] = []
+        
+        self._sprites: "OrderedDict[Hashable, Sprite]" = OrderedDict()
+        self._text_metrics: Dict[Tuple[str, float, int], Tuple[Tuple[int, int], int]] = {}
+        
+        # Statistics
+        self.sprite_renders = 0
+        self.sprite_hits = 0
+    
+    def begin(self, frame: np.ndarray):
+        """Start a new display frame, dropping the commands of the last one"""
+        self._frame = frame
+        self._commands.clear()
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(width, height) of the current frame"""
+        h, w = self._frame.shape[:2]
+        return (w, h)
+    
+    def render(self) -> np.ndarray:
+        """
+        Compose the frame and all commands
+        
+        Returns:
+            Display buffer (reused, valid until the next render)
+        """
+        display = self.buffer_pool.get(('overlay_display', id(self)), self._frame.shape, self._frame.dtype)
+        np.copyto(display, self._frame)
+        
+        for command in self._commands:
+            command(display)
+        
+        self._commands.clear()
+        return display
+    
+    # ------------------------------------------------------------------
+    # Text
+    # ------------------------------------------------------------------
+    
+    def text_size(self, text: str, font_scale: float, thickness: int) -> Tuple[Tuple[int, int], int]:
+        """Cached cv2.getTextSize()"""
+        key = (text, font_scale, thickness)
+        metrics = self._text_metrics.get(key)
+        if metrics is None:
+            if len(self._text_metrics) >= self.max_cached_sprites:
+                self._text_metrics.clear()
+            metrics = cv2.getTextSize(text, FONT, font_scale, thickness)
+            self._text_metrics[key] = metrics
+        return metrics
+    
+    def text(
+        self,
+        text: str,
+        position: Tuple[int, int],
+        font_scale: float = 0.7,
+        thickness: int = 2,
+        color: Color = (255, 255, 255),
+        bg_color: Optional[Color] = None,
+        padding: int = 5,
+        centered: bool = False
+    ):
+        """
+        Draw text
+        
+        Args:
+            text: Text to draw
+            position: Baseline origin (x, y) as in cv2.putText, or the baseline
+                center if `centered`
+            font_scale: Font scale
+            thickness: Text thickness
+            color: Text color (B, G, R)
+            bg_color: Optional background box color
+            padding: Padding of the background box
+            centered: Center the text horizontally on `position`
+        """
+        if not text:
+            return
+        
+        (text_width, text_height), baseline = self.text_size(text, font_scale, thickness)
+        pad = padding if bg_color is not None else thickness
+        x, y = position
+        if centered:
+            x -= text_width // 2
+        
+        key = ('text', text, font_scale, thickness, color, bg_color, pad)
+        sprite = self.sprite(
+            key,
+            lambda: self._render_text(text, font_scale, thickness, color, bg_color, pad,
+                                      text_width, text_height, baseline)
+        )
+        self.blit(sprite, (x - pad, y - text_height - pad))
+    
+    @staticmethod
+    def _render_text(
+        text: str,
+        font_scale: float,
+        thickness: int,
+        color: Color,
+        bg_color: Optional[Color],
+        pad: int,
+        text_width: int,
+        text_height: int,
+        baseline: int
+    ) -> Sprite:
+        shape = (text_height + baseline + 2 * pad, text_width + 2 * pad)
+        origin = (pad, pad + text_height)
+        
+        image = np.empty(shape + (3,), dtype=np.uint8)
+        image[:] = bg_color if bg_color is not None else (0, 0, 0)
+        cv2.putText(image, text, origin, FONT, font_scale, color, thickness)
+        
+        mask = None
+        if bg_color is None:
+            mask = np.zeros(shape, dtype=np.uint8)
+            cv2.putText(mask, text, origin, FONT, font_scale, 255, thickness)
+            mask = mask.astype(bool)
+        
+        return Sprite(image, mask)
+    
+    # ------------------------------------------------------------------
+    # Widgets and primitives
+    # ------------------------------------------------------------------
+    
+    def bar(
+        self,
+        position: Tuple[int, int],
+        size: Tuple[int, int],
+        fraction: float,
+        fill_color: Color,
+        bg_color: Color = (50, 50, 50),
+        border_color: Optional[Color] = None,
+        border_thickness: int = 2
+    ):
+        """
+        Draw a horizontal progress bar
+        
+        The bar is cached per (size, colors, filled width), so it is only
+        re-rendered when its fill changes by at least one pixel.
+        
+        Args:
+            position: Top-left corner (x, y)
+            size: (width, height)
+            fraction: Filled fraction (0-1)
+            fill_color: Fill color
+            bg_color: Background color
+            border_color: Optional border color
+            border_thickness: Border thickness
+        """
+        width, height = size
+        fill_width = int(width * min(max(fraction, 0.0), 1.0))
+        # Thick borders are drawn centered on the edge, leave room for them
+        margin = border_thickness // 2 + 1 if border_color is not None else 0
+        
+        def render() -> Sprite:
+            image = np.empty((height + 2 * margin + 1, width + 2 * margin + 1, 3), dtype=np.uint8)
+            mask = np.zeros(image.shape[:2], dtype=np.uint8)
+            x0, y0, x1, y1 = margin, margin, margin + width, margin + height
+            layers = ((image, bg_color, fill_color, border_color), (mask, 255, 255, 255))
+            for target, bg, fill, border in layers:
+                cv2.rectangle(target, (x0, y0), (x1, y1), bg, -1)
+                if fill_width > 0:
+                    cv2.rectangle(target, (x0, y0), (x0 + fill_width, y1), fill, -1)
+                if border_color is not None:
+                    cv2.rectangle(target, (x0, y0), (x1, y1), border, border_thickness)
+            return Sprite(image, mask.astype(bool))
+        
+        key = ('bar', size, fill_width, fill_color, bg_color, border_color, border_thickness)
+        self.blit(self.sprite(key, render), (position[0] - margin, position[1] - margin))
+    
+    def add(self, command: Callable[[np.ndarray], None]):
+        """Add a custom draw command, called with the display buffer"""
+        self._commands.append(command)
+    
+    def skeleton(
+        self,
+        points: np.ndarray,
+        connections: Iterable[Tuple[int, int]],
+        visible: np.ndarray,
+        line_color: Color = (0, 255, 0),
+        point_color: Color = (0, 0, 255),
+        outline_color: Color = (255, 255, 255)
+    ):
+        """
+        Draw a landmark skeleton
+        
+        Args:
+            points: (N, 2) int pixel coordinates on the display frame
+            connections: Pairs of landmark indices to connect
+            visible: (N,) mask of landmarks to draw as points
+            line_color: Skeleton line color
+            point_color: Landmark fill color
+            outline_color: Landmark outline color
+        """
+        coords = [tuple(point) for point in points.tolist()]
+        visible_ids = np.flatnonzero(visible).tolist()
+        connections = list(connections)
+        
+        def draw(display: np.ndarray):
+            for start_idx, end_idx in connections:
+                cv2.line(display, coords[start_idx], coords[end_idx], line_color, 2)
+            for i in visible_ids:
+                cv2.circle(display, coords[i], 5, point_color, -1)
+                cv2.circle(display, coords[i], 7, outline_color, 2)
+        
+        self._commands.append(draw)
+    
+    # ------------------------------------------------------------------
+    # Sprites
+    # ------------------------------------------------------------------
+    
+    def sprite(self, key: Hashable, render: Callable[[], Sprite]) -> Sprite:
+        """Get a cached sprite, rendering it on a miss"""
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.sprite_hits += 1
+            return sprite
+        
+        sprite = render()
+        self.sprite_renders += 1
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_cached_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+    
+    def blit(self, sprite: Sprite, top_left: Tuple[int, int]):
+        """Queue a sprite copy at `top_left`, clipped to the frame"""
+        self._commands.append(lambda display: self._blit(display, sprite, top_left))
+    
+    @staticmethod
+    def _blit(display: np.ndarray, sprite: Sprite, top_left: Tuple[int, int]):
+        h, w = display.shape[:2]
+        sh, sw = sprite.image.shape[:2]
+        x, y = top_left
+        
+        # Clip to the display
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sw, w), min(y + sh, h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        src = sprite.image[y0 - y:y1 - y, x0 - x:x1 - x]
+        dst = display[y0:y1, x0:x1]
+        if sprite.mask is None:
+            dst[:] = src
+        else:
+            np.copyto(dst, src, where=sprite.mask[y0 - y:y1 - y, x0 - x:x1 - x, None])
+    
+    def release(self):
+        """Drop queued commands, cached sprites and the display buffer"""
+        self._frame = None
+        self._commands = []
+        self._sprites.clear()
+        self.buffer_pool.release_named(id(self))
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get sprite cache statistics"""
+        return {
+            'sprite_renders': self.sprite_renders,
+            'sprite_hits': self.sprite_hits,
+            'cached_sprites': len(self._sprites),
+            'cached_text_metrics': len(self._text_metrics),
+        }
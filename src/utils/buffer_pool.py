@@ -0,0 +1,136 @@
+"""
+Preallocated image buffers for the live processing loop
+"""
+import threading
+import numpy as np
+from collections import defaultdict
+from typing import Dict, Tuple, Hashable
+
+
+class FrameBufferPool:
+    """
+    Reusable image buffers keyed by shape and dtype
+    
+    Two kinds of buffers are handed out:
+    - acquire()/release(): short-lived buffers that cycle between owners,
+      e.g. the frame grabber ring buffer
+    - get(name, ...): named scratch buffers that live for the whole session,
+      e.g. the display frame. They are only reallocated if the shape changes.
+      Names are tuples (name, id(owner), ...), and owners drop theirs with
+      release_named() when they are released.
+    
+    Every allocation is counted so steady-state zero-allocation operation
+    can be verified from get_stats().
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._free: Dict[Tuple, list] = defaultdict(list)
+        self._named: Dict[Hashable, np.ndarray] = {}
+        
+        # Statistics
+        self.allocations = 0
+        self.bytes_allocated = 0
+        self.reuses = 0
+    
+    @staticmethod
+    def _key(shape: Tuple[int, ...], dtype) -> Tuple:
+        return (tuple(shape), np.dtype(dtype).str)
+    
+    def _allocate(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        buffer = np.empty(shape, dtype=dtype)
+        self.allocations += 1
+        self.bytes_allocated += buffer.nbytes
+        return buffer
+    
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Get a buffer of the given shape, reusing a released one if possible
+        
+        Args:
+            shape: Buffer shape
+            dtype: Buffer dtype
+        
+        Returns:
+            Uninitialized buffer
+        """
+        with self._lock:
+            free = self._free[self._key(shape, dtype)]
+            if free:
+                self.reuses += 1
+                return free.pop()
+            return self._allocate(shape, dtype)
+    
+    def release(self, buffer: np.ndarray):
+        """Return a buffer obtained from acquire() to the pool"""
+        with self._lock:
+            self._free[self._key(buffer.shape, buffer.dtype)].append(buffer)
+    
+    def get(self, name: Hashable, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Get a named scratch buffer
+        
+        Args:
+            name: Buffer name, unique per user
+            shape: Buffer shape
+            dtype: Buffer dtype
+        
+        Returns:
+            Buffer with the requested shape (contents are whatever was left in it)
+        """
+        with self._lock:
+            buffer = self._named.get(name)
+            if buffer is not None and buffer.shape == tuple(shape) and buffer.dtype == np.dtype(dtype):
+                self.reuses += 1
+                return buffer
+            
+            buffer = self._allocate(shape, dtype)
+            self._named[name] = buffer
+            return buffer
+    
+    def release_named(self, owner_id: int) -> int:
+        """
+        Drop the named buffers of one owner
+        
+        Args:
+            owner_id: id() of the owner, the second element of its buffer names
+        
+        Returns:
+            Number of buffers dropped
+        """
+        with self._lock:
+            keys = [
+                key for key in self._named
+                if isinstance(key, tuple) and len(key) > 1 and key[1] == owner_id
+            ]
+            for key in keys:
+                del self._named[key]
+            return len(keys)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get allocation statistics"""
+        with self._lock:
+            return {
+                'allocations': self.allocations,
+                'bytes_allocated': self.bytes_allocated,
+                'reuses': self.reuses,
+                'free_buffers': sum(len(free) for free in self._free.values()),
+                'named_buffers': len(self._named),
+            }
+    
+    def clear(self):
+        """Drop all pooled buffers"""
+        with self._lock:
+            self._free.clear()
+            self._named.clear()
+
+
+# Global buffer pool instance
+_buffer_pool = None
+
+def get_buffer_pool() -> FrameBufferPool:
+    """Get or create global frame buffer pool"""
+    global _buffer_pool
+    if _buffer_pool is None:
+        _buffer_pool = FrameBufferPool()
+    return _buffer_pool
@@ -0,0 +1,97 @@
+"""
+Per-frame image pyramid for processing at reduced resolution
+"""
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+
+
+class FramePyramid:
+    """
+    Downscaled copies of the current frame, built lazily and shared by all stages
+    
+    Live guidance (pose, orientation, quality) runs on the processing level,
+    while captures keep using the full resolution original. Every level keeps
+    the aspect ratio of the frame, so normalized coordinates are valid on all
+    levels. Levels are written into pooled buffers and are only valid until
+    the next update().
+    """
+    
+    def __init__(self, processing_width: int = 640, buffer_pool: Optional[FrameBufferPool] = None):
+        """
+        Initialize pyramid
+        
+        Args:
+            processing_width: Width of the processing level (0 = full resolution)
+            buffer_pool: Pool for the level buffers (None for the global pool)
+        """
+        self.processing_width = processing_width
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        
+        self.full: Optional[np.ndarray] = None
+        self._levels: Dict[int, np.ndarray] = {}
+    
+    def update(self, frame: np.ndarray):
+        """Set the full resolution frame and invalidate all levels"""
+        self.full = frame
+        self._levels.clear()
+    
+    @property
+    def full_size(self) -> Tuple[int, int]:
+        """(width, height) of the full resolution frame"""
+        h, w = self.full.shape[:2]
+        return (w, h)
+    
+    @property
+    def processing(self) -> np.ndarray:
+        """Frame at processing resolution"""
+        return self.level(self.processing_width)
+    
+    @property
+    def scale(self) -> float:
+        """Processing level width divided by the full width"""
+        return self.processing.shape[1] / self.full.shape[1]
+    
+    def level(self, width: int) -> np.ndarray:
+        """
+        Get the frame downscaled to `width`
+        
+        Smaller levels are resized from the smallest cached level that is
+        still larger, so a chain of requests touches the full frame only once.
+        
+        Args:
+            width: Target width (0 or >= full width returns the full frame)
+        
+        Returns:
+            Frame at the requested width
+        """
+        h, w = self.full.shape[:2]
+        if width <= 0 or width >= w:
+            return self.full
+        
+        cached = self._levels.get(width)
+        if cached is not None:
+            return cached
+        
+        larger = [level_width for level_width in self._levels if level_width > width]
+        source = self._levels[min(larger)] if larger else self.full
+        
+        level_h = max(1, int(round(h * width / w)))
+        shape = (level_h, width) + self.full.shape[2:]
+        level = self._buffer(('pyramid', id(self), width), shape, self.full.dtype)
+        cv2.resize(source, (width, level_h), dst=level, interpolation=cv2.INTER_AREA)
+        
+        self._levels[width] = level
+        return level
+    
+    def _buffer(self, key: Tuple, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Buffer for a derived image"""
+        return self.buffer_pool.get(key, shape, dtype)
+    
+    def release(self):
+        """Drop the current frame and return the level buffers to the pool"""
+        self.full = None
+        self._levels.clear()
+        self.buffer_pool.release_named(id(self))
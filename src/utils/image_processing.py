@@ -3,7 +3,8 @@ Image processing utilities
 """
 import cv2
 import numpy as np
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import Tuple, Optional, List
 
 
 def calculate_blur_score(image: np.ndarray) -> float:
@@ -18,8 +19,68 @@ def calculate_blur_score(image: np.ndarray) -> float:
         Blur score (variance of Laplacian)
     """
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-    return laplacian.var()
+    laplacian = cv2.Laplacian(gray, cv2.CV_32F)
+    _, std = cv2.meanStdDev(laplacian)
+    return float(std[0, 0]) ** 2
+
+
+@dataclass
+class FrameScore:
+    """Cheap quality score of a frame used to pick the best one of a burst"""
+    sharpness: float  # Laplacian variance on the downscaled proxy
+    brightness: float  # Mean gray level (0-255)
+    score: float  # Sharpness penalized for bad exposure
+
+
+def score_frame(image: np.ndarray, proxy_width: int = 320) -> FrameScore:
+    """
+    Score a frame for sharpness and exposure on a downscaled proxy
+    
+    Args:
+        image: Input image
+        proxy_width: Width of the proxy image the score is computed on
+        
+    Returns:
+        FrameScore (higher score = better frame)
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+    
+    h, w = gray.shape[:2]
+    if w > proxy_width:
+        proxy_height = max(1, int(h * proxy_width / w))
+        gray = cv2.resize(gray, (proxy_width, proxy_height), interpolation=cv2.INTER_AREA)
+    
+    laplacian = cv2.Laplacian(gray, cv2.CV_32F)
+    _, lap_std = cv2.meanStdDev(laplacian)
+    sharpness = float(lap_std[0, 0]) ** 2
+    brightness = float(cv2.mean(gray)[0])
+    
+    # Penalize under- and over-exposed frames linearly outside 50-200
+    exposure_penalty = max(0.0, 50 - brightness, brightness - 200) / 50.0
+    score = sharpness * max(0.0, 1.0 - exposure_penalty)
+    
+    return FrameScore(sharpness=sharpness, brightness=brightness, score=score)
+
+
+def select_best_frames(
+    frames: List[np.ndarray],
+    top_k: int = 1,
+    proxy_width: int = 320
+) -> List[Tuple[int, FrameScore]]:
+    """
+    Rank frames by score and return the best ones
+    
+    Args:
+        frames: Candidate frames
+        top_k: Number of frames to return
+        proxy_width: Width of the proxy image used for scoring
+        
+    Returns:
+        List of (frame index, score), best first
+    """
+    scored = [(i, score_frame(frame, proxy_width)) for i, frame in enumerate(frames)]
+    scored.sort(key=lambda item: item[1].score, reverse=True)
+    return scored[:top_k]
 
 
 def check_image_quality(image: np.ndarray, blur_threshold: float = 100.0) -> Tuple[bool, str]:
@@ -33,22 +94,26 @@ def check_image_quality(image: np.ndarray, blur_threshold: float = 100.0) -> Tup
     Returns:
         Tuple of (is_good_quality, message)
     """
+    # Convert once, all checks share the grayscale image
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+    
     # Check blur
-    blur_score = calculate_blur_score(image)
+    blur_score = calculate_blur_score(gray)
     if blur_score < blur_threshold:
         return False, f"Image too blurry (score: {blur_score:.2f}, threshold: {blur_threshold})"
     
-    # Check brightness
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-    mean_brightness = np.mean(gray)
+    # Brightness and contrast in a single pass
+    mean, std = cv2.meanStdDev(gray)
+    mean_brightness = float(mean[0, 0])
+    std_dev = float(std[0, 0])
     
+    # Check brightness
     if mean_brightness < 50:
         return False, f"Image too dark (brightness: {mean_brightness:.2f})"
     elif mean_brightness > 200:
         return False, f"Image too bright (brightness: {mean_brightness:.2f})"
     
     # Check contrast
-    std_dev = np.std(gray)
     if std_dev < 30:
         return False, f"Image has low contrast (std: {std_dev:.2f})"
     
@@ -147,6 +212,40 @@ def apply_morphological_operations(mask: np.ndarray, kernel_size: int = 5) -> np
     return mask
 
 
+def guided_filter(guide: np.ndarray, src: np.ndarray, radius: int, eps: float) -> np.ndarray:
+    """
+    Edge-preserving smoothing of `src` that follows the edges of `guide`
+    
+    Uses cv2.ximgproc from opencv-contrib when available, otherwise the
+    box-filter formulation of the grayscale guided filter.
+    
+    Args:
+        guide: Guide image (grayscale, uint8 or float in 0-1)
+        src: Image to filter (float32)
+        radius: Filter window radius in pixels
+        eps: Regularization, larger values smooth across weaker edges
+        
+    Returns:
+        Filtered image (float32)
+    """
+    guide = guide.astype(np.float32) / 255.0 if guide.dtype == np.uint8 else guide.astype(np.float32)
+    src = src.astype(np.float32)
+    
+    if hasattr(cv2, 'ximgproc'):
+        return cv2.ximgproc.guidedFilter(guide, src, radius, eps)
+    
+    ksize = (2 * radius + 1, 2 * radius + 1)
+    mean_i = cv2.boxFilter(guide, -1, ksize)
+    mean_p = cv2.boxFilter(src, -1, ksize)
+    cov_ip = cv2.boxFilter(guide * src, -1, ksize) - mean_i * mean_p
+    var_i = cv2.boxFilter(guide * guide, -1, ksize) - mean_i * mean_i
+    
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    
+    return cv2.boxFilter(a, -1, ksize) * guide + cv2.boxFilter(b, -1, ksize)
+
+
 def draw_text_with_background(
     image: np.ndarray,
     text: str,
@@ -0,0 +1,157 @@
+"""
+Per-stage latency instrumentation for the live loop
+"""
+import time
+import numpy as np
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict, Optional, List
+
+
+class LatencyTracker:
+    """
+    Rolling latency statistics per processing stage
+    
+    Usage per frame:
+        tracker.begin_frame(capture_timestamp)
+        with tracker.measure('pose'):
+            ...
+        tracker.end_frame()
+    
+    A stage measured several times within one frame is summed. A frame
+    dropped with discard_frame() stays dropped until end_frame(): later
+    stages are not timed and end_frame() pushes nothing. end_frame()
+    also records the capture-to-display latency of the frame and a
+    glass-to-glass estimate that adds half the exposure interval and the
+    display latency.
+    """
+    
+    END_TO_END = 'end_to_end'
+    GLASS_TO_GLASS = 'glass_to_glass'
+    QUEUE = 'queue'
+    
+    def __init__(self, window: int = 300, frame_interval_ms: float = 33.3, display_latency_ms: float = 16.7):
+        """
+        Initialize latency tracker
+        
+        Args:
+            window: Number of frames kept per stage
+            frame_interval_ms: Camera frame interval, half of it is added as exposure delay
+            display_latency_ms: Estimated time from imshow to photons on the screen
+        """
+        self.window = window
+        self.frame_interval_ms = frame_interval_ms
+        self.display_latency_ms = display_latency_ms
+        
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._stage_order: List[str] = []
+        self._current: Dict[str, float] = {}
+        self._capture_timestamp: Optional[float] = None
+        self._discarded = False
+        self.frames = 0
+    
+    def begin_frame(self, capture_timestamp: Optional[float] = None):
+        """
+        Start timing a frame
+        
+        Args:
+            capture_timestamp: time.monotonic() when the frame was captured
+        """
+        self._current = {}
+        self._capture_timestamp = capture_timestamp
+        self._discarded = False
+        
+        if capture_timestamp is not None:
+            self._current[self.QUEUE] = (time.monotonic() - capture_timestamp) * 1000.0
+    
+    @contextmanager
+    def measure(self, stage: str):
+        """Time a block of code as part of `stage`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - start) * 1000.0)
+    
+    def add(self, stage: str, elapsed_ms: float):
+        """Add time to a stage of the current frame"""
+        if self._discarded:
+            return
+        self._current[stage] = self._current.get(stage, 0.0) + elapsed_ms
+    
+    def end_frame(self) -> Optional[float]:
+        """
+        Finish the current frame and push its stage times
+        
+        Returns:
+            Total time of the measured stages in milliseconds (queue delay
+            excluded), None if the frame was discarded
+        """
+        if self._discarded or (not self._current and self._capture_timestamp is None):
+            self._discarded = False
+            self.frames += 1
+            return None
+        
+        processing_ms = sum(
+            elapsed_ms for stage, elapsed_ms in self._current.items() if stage != self.QUEUE
+        )
+        
+        if self._capture_timestamp is not None:
+            end_to_end = (time.monotonic() - self._capture_timestamp) * 1000.0
+            self._current[self.END_TO_END] = end_to_end
+            self._current[self.GLASS_TO_GLASS] = (
+                self.frame_interval_ms / 2.0 + end_to_end + self.display_latency_ms
+            )
+        
+        for stage, elapsed_ms in self._current.items():
+            if stage not in self._samples:
+                self._stage_order.append(stage)
+            self._samples[stage].append(elapsed_ms)
+        
+        self._current = {}
+        self._capture_timestamp = None
+        self.frames += 1
+        return processing_ms
+    
+    def discard_frame(self):
+        """Drop the current frame, e.g. when it included a blocking capture"""
+        self._current = {}
+        self._capture_timestamp = None
+        self._discarded = True
+    
+    def percentiles(self, stage: str) -> Optional[Dict[str, float]]:
+        """
+        Get rolling percentiles of a stage
+        
+        Args:
+            stage: Stage name
+        
+        Returns:
+            Dictionary with p50, p95, p99 and mean in milliseconds, None if no samples
+        """
+        samples = self._samples.get(stage)
+        if not samples:
+            return None
+        
+        values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'mean': float(values.mean())}
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Get percentiles of all stages in first-seen order"""
+        return {stage: self.percentiles(stage) for stage in self._stage_order if self._samples[stage]}
+    
+    def format_summary(self) -> str:
+        """Format percentiles as a compact multi-line table"""
+        lines = [f"{'stage':<16}{'p50':>8}{'p95':>8}{'p99':>8}  (ms, last {self.window} frames)"]
+        for stage, stats in self.summary().items():
+            lines.append(f"{stage:<16}{stats['p50']:>8.1f}{stats['p95']:>8.1f}{stats['p99']:>8.1f}")
+        return "\n".join(lines)
+    
+    def reset(self):
+        """Drop all samples"""
+        self._samples.clear()
+        self._stage_order.clear()
+        self._current = {}
+        self._capture_timestamp = None
+        self.frames = 0
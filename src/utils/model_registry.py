@@ -0,0 +1,156 @@
+"""
+Process-wide registry of loaded ML models
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.utils.logger import logger
+
+
+def _resident_bytes() -> Optional[int]:
+    """Resident set size of the process (None where it cannot be read)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+@dataclass
+class ModelEntry:
+    """A loaded model and its bookkeeping"""
+    model: Any
+    close: Optional[Callable[[Any], None]]
+    refs: int
+    load_seconds: float
+    memory_bytes: Optional[int]  # Resident memory growth while loading (approximate)
+
+
+class ModelRegistry:
+    """
+    Shares loaded models between components and reference-counts them
+    
+    Components acquire a model by key and pass a factory that builds it on
+    the first request; later requests with the same key get the same
+    instance. Each acquire() has to be paired with a release(). The model is
+    closed when the last holder releases it.
+    
+    Load time and the resident memory growth during loading are recorded per
+    model for get_report().
+    
+    MediaPipe streaming graphs keep per-stream state, so their keys should
+    only be shared by components that feed the same video stream.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, ModelEntry] = {}
+        
+        # Statistics
+        self.loads = 0
+        self.shared_acquires = 0
+    
+    def acquire(
+        self,
+        key: Hashable,
+        factory: Callable[[], Any],
+        close: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Get the model for `key`, loading it on first use
+        
+        Args:
+            key: Model identity, e.g. ('pose', 'static', 2)
+            factory: Builds the model, only called if it is not loaded
+            close: Frees the model once the last reference is released
+        
+        Returns:
+            Shared model instance
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self.shared_acquires += 1
+                return entry.model
+            
+            memory_before = _resident_bytes()
+            start = time.perf_counter()
+            model = factory()
+            load_seconds = time.perf_counter() - start
+            memory_after = _resident_bytes()
+            
+            memory_bytes = None
+            if memory_before is not None and memory_after is not None:
+                memory_bytes = max(0, memory_after - memory_before)
+            
+            self._entries[key] = ModelEntry(model, close, 1, load_seconds, memory_bytes)
+            self.loads += 1
+            
+            memory = f", +{memory_bytes / 2**20:.0f} MB" if memory_bytes is not None else ""
+            logger.info(f"Loaded model {key} in {load_seconds:.2f} s{memory}")
+            return model
+    
+    def release(self, key: Hashable):
+        """Drop one reference to `key`, closing the model when none are left"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            
+            del self._entries[key]
+            if entry.close is not None:
+                try:
+                    entry.close(entry.model)
+                except Exception as e:
+                    logger.warning(f"Error closing model {key}: {e}")
+            logger.info(f"Released model {key}")
+    
+    def get_report(self) -> Dict:
+        """
+        Get loaded models with their reference counts, load time and memory
+        
+        Returns:
+            Dictionary with one entry per loaded model and totals
+        """
+        with self._lock:
+            models = {
+                str(key): {
+                    'refs': entry.refs,
+                    'load_seconds': entry.load_seconds,
+                    'memory_mb': entry.memory_bytes / 2**20 if entry.memory_bytes is not None else None,
+                }
+                for key, entry in self._entries.items()
+            }
+            return {
+                'models': models,
+                'loads': self.loads,
+                'shared_acquires': self.shared_acquires,
+                'total_load_seconds': sum(entry.load_seconds for entry in self._entries.values()),
+                'total_memory_mb': sum(
+                    entry.memory_bytes for entry in self._entries.values() if entry.memory_bytes is not None
+                ) / 2**20,
+            }
+
+
+# Global registry instance
+_model_registry = None
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create global model registry"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
@@ -0,0 +1,159 @@
+"""
+Adaptive quality governor for the live loop
+"""
+import time
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional
+
+from src.utils.logger import logger
+from src.utils.config_loader import get_config
+
+
+# Quality ladder, best first. Each level sets the live pose model complexity,
+# the processing resolution, the pose keyframe interval, whether the skeleton
+# overlay is drawn and whether (and how often) the live segmentation model
+# runs for the mask quality bar.
+DEFAULT_LEVELS = [
+    {'model_complexity': 1, 'processing_width': 640, 'keyframe_interval': 2, 'show_skeleton': True,
+     'show_mask_quality': True, 'mask_keyframe_interval': 15},
+    {'model_complexity': 1, 'processing_width': 640, 'keyframe_interval': 3, 'show_skeleton': True,
+     'show_mask_quality': True, 'mask_keyframe_interval': 15},
+    {'model_complexity': 1, 'processing_width': 480, 'keyframe_interval': 4, 'show_skeleton': True,
+     'show_mask_quality': True, 'mask_keyframe_interval': 30},
+    {'model_complexity': 0, 'processing_width': 480, 'keyframe_interval': 5, 'show_skeleton': False,
+     'show_mask_quality': False},
+    {'model_complexity': 0, 'processing_width': 320, 'keyframe_interval': 6, 'show_skeleton': False,
+     'show_mask_quality': False},
+]
+
+
+class QualityGovernor:
+    """
+    Steps live processing quality up or down to hold a frame-time budget
+    
+    Frame times are collected in windows of `window` frames. At the end of
+    each window the median is compared with the target:
+    - above target * downgrade_ratio: drop one level right away
+    - below target * upgrade_ratio for `upgrade_patience` windows in a row:
+      raise one level
+    The gap between the two ratios, the patience before upgrading and a
+    one-window cooldown after every change (model reloads are slow) keep the
+    governor from oscillating between two levels.
+    
+    Every decision is logged and kept in `decisions` for the session summary.
+    """
+    
+    def __init__(
+        self,
+        target_frame_ms: Optional[float] = None,
+        levels: Optional[List[Dict]] = None,
+        start_level: Optional[int] = None
+    ):
+        """
+        Initialize quality governor
+        
+        Args:
+            target_frame_ms: Frame time budget (None to use config)
+            levels: Quality ladder, best first (None to use config or the default ladder)
+            start_level: Index of the starting level (None to use config)
+        """
+        config = get_config()
+        self.enabled = config.get('advanced.governor.enabled', True)
+        self.target_frame_ms = (
+            target_frame_ms if target_frame_ms is not None
+            else config.get('advanced.governor.target_frame_ms', 33.0)
+        )
+        self.levels = levels or config.get('advanced.governor.levels') or DEFAULT_LEVELS
+        self.window = config.get('advanced.governor.window', 30)
+        self.downgrade_ratio = config.get('advanced.governor.downgrade_ratio', 1.1)
+        self.upgrade_ratio = config.get('advanced.governor.upgrade_ratio', 0.6)
+        self.upgrade_patience = config.get('advanced.governor.upgrade_patience', 3)
+        
+        start = start_level if start_level is not None else config.get('advanced.governor.start_level', 0)
+        self.level = min(max(start, 0), len(self.levels) - 1)
+        
+        self._frame_ms = deque(maxlen=self.window)
+        self._fast_windows = 0
+        self._cooldown = 0
+        self._start_time = time.monotonic()
+        
+        self.decisions: List[Dict] = []
+        self._record('start', None)
+    
+    @property
+    def settings(self) -> Dict:
+        """Settings of the current level"""
+        return self.levels[self.level]
+    
+    def update(self, frame_ms: float) -> Optional[Dict]:
+        """
+        Add the processing time of a frame
+        
+        Args:
+            frame_ms: Time spent on the frame in milliseconds
+        
+        Returns:
+            Settings of the new level if the level changed, otherwise None
+        """
+        if not self.enabled:
+            return None
+        
+        self._frame_ms.append(frame_ms)
+        if len(self._frame_ms) < self.window:
+            return None
+        
+        median_ms = float(np.median(self._frame_ms))
+        self._frame_ms.clear()
+        
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+        
+        if median_ms > self.target_frame_ms * self.downgrade_ratio:
+            self._fast_windows = 0
+            if self.level < len(self.levels) - 1:
+                return self._change(self.level + 1, 'downgrade', median_ms)
+            return None
+        
+        if median_ms < self.target_frame_ms * self.upgrade_ratio:
+            self._fast_windows += 1
+            if self._fast_windows >= self.upgrade_patience and self.level > 0:
+                return self._change(self.level - 1, 'upgrade', median_ms)
+        else:
+            self._fast_windows = 0
+        
+        return None
+    
+    def _change(self, level: int, reason: str, median_ms: float) -> Dict:
+        self.level = level
+        self._fast_windows = 0
+        self._cooldown = 1
+        self._record(reason, median_ms)
+        return self.settings
+    
+    def _record(self, reason: str, median_ms: Optional[float]):
+        decision = {
+            'time_s': time.monotonic() - self._start_time,
+            'reason': reason,
+            'level': self.level,
+            'median_frame_ms': median_ms,
+            'target_frame_ms': self.target_frame_ms,
+            'settings': dict(self.settings),
+        }
+        self.decisions.append(decision)
+        
+        measured = f", median frame {median_ms:.1f} ms" if median_ms is not None else ""
+        logger.info(
+            f"Quality governor: {reason} to level {self.level} "
+            f"(target {self.target_frame_ms:.0f} ms{measured}): {self.settings}"
+        )
+    
+    def get_summary(self) -> Dict:
+        """Get the current level and the decision log"""
+        return {
+            'enabled': self.enabled,
+            'level': self.level,
+            'settings': dict(self.settings),
+            'decisions': list(self.decisions),
+        }
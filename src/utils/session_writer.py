@@ -0,0 +1,172 @@
+"""
+Background writer for session files
+"""
+import threading
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from src.utils.logger import logger
+
+
+class SessionWriter:
+    """
+    Writes session images on a small thread pool
+    
+    The live loop only hands over the arrays; encoding and disk I/O (and any
+    preprocessing such as depth colorization) happen on the worker threads.
+    The number of outstanding writes is bounded so a slow disk applies
+    backpressure instead of growing memory without limit.
+    
+    Arrays passed to the writer must not be modified by the caller afterwards.
+    """
+    
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        """
+        Initialize session writer
+        
+        Args:
+            max_workers: Number of writer threads
+            max_pending: Maximum number of queued or running writes
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="SessionWriter")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        
+        # Statistics
+        self.files_written = 0
+        self.failures = 0
+        self.blocked_submits = 0
+    
+    def submit(self, fn: Callable, *args) -> Future:
+        """
+        Run a write task in the background
+        
+        Blocks while `max_pending` tasks are outstanding.
+        
+        Args:
+            fn: Task to run
+            *args: Arguments for the task
+        
+        Returns:
+            Future of the task
+        """
+        if not self._slots.acquire(blocking=False):
+            self.blocked_submits += 1
+            self._slots.acquire()
+        
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        
+        # Track before the callback, which runs right away if the task already finished
+        with self._lock:
+            self._pending.append(future)
+        future.add_done_callback(self._on_done)
+        return future
+    
+    def write_image(self, path: Path, image: np.ndarray, params: Optional[Sequence[int]] = None) -> Future:
+        """
+        Save an image in the background
+        
+        Args:
+            path: Output path, the extension selects the format
+            image: Image to save
+            params: Optional cv2.imwrite parameters
+        
+        Returns:
+            Future of the write
+        """
+        return self.submit(self._write_image, Path(path), image, list(params) if params else [])
+    
+    def write_converted(
+        self,
+        path: Path,
+        data: np.ndarray,
+        convert: Callable[[np.ndarray], np.ndarray],
+        params: Optional[Sequence[int]] = None
+    ) -> Future:
+        """
+        Convert data to an image and save it, both in the background
+        
+        Args:
+            path: Output path
+            data: Source data, e.g. a depth map
+            convert: Function producing the image to save, e.g. colorize_depth
+            params: Optional cv2.imwrite parameters
+        
+        Returns:
+            Future of the write
+        """
+        return self.submit(
+            lambda: self._write_image(Path(path), convert(data), list(params) if params else [])
+        )
+    
+    @staticmethod
+    def _write_image(path: Path, image: np.ndarray, params: List[int]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not cv2.imwrite(str(path), image, params):
+            raise IOError(f"Could not write {path}")
+    
+    def _on_done(self, future: Future):
+        self._slots.release()
+        with self._lock:
+            # At most max_pending futures stay tracked; flush() may already have taken this one
+            if future in self._pending:
+                self._pending.remove(future)
+            if future.exception() is not None:
+                self.failures += 1
+                logger.error(f"Session write failed: {future.exception()}")
+            else:
+                self.files_written += 1
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all submitted writes have finished
+        
+        Args:
+            timeout: Maximum time to wait per write in seconds (None waits forever)
+        
+        Returns:
+            True if all writes finished
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        
+        for future in pending:
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeout:
+                logger.warning("Timed out waiting for session writes")
+                with self._lock:
+                    self._pending = [f for f in pending if not f.done()] + self._pending
+                return False
+            except Exception:
+                # Already counted and logged by _on_done
+                pass
+        
+        return True
+    
+    def get_stats(self) -> dict:
+        """Get writer statistics"""
+        with self._lock:
+            pending = sum(1 for future in self._pending if not future.done())
+            return {
+                'files_written': self.files_written,
+                'failures': self.failures,
+                'pending': pending,
+                'blocked_submits': self.blocked_submits,
+            }
+    
+    def close(self):
+        """Finish all writes and stop the worker threads"""
+        self.flush()
+        self._executor.shutdown(wait=True)
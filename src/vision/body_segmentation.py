@@ -3,73 +3,164 @@ Advanced body segmentation using multiple methods
 """
 import cv2
 import numpy as np
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 import mediapipe as mp
 
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
-from src.utils.image_processing import apply_morphological_operations
+from src.utils.image_processing import apply_morphological_operations, guided_filter
+from src.utils.model_registry import ModelRegistry, get_model_registry
+from src.vision.frame_context import FrameContext
 
 
 class BodySegmenter:
     """High-precision body segmentation"""
     
-    def __init__(self, method: str = "mediapipe"):
+    SELFIE_MODEL_KEY = ('selfie_segmentation', 1)
+    
+    def __init__(self, method: str = "mediapipe", registry: Optional[ModelRegistry] = None):
         """
         Initialize body segmenter
         
         Args:
             method: Segmentation method ('mediapipe', 'grabcut', 'hybrid')
+            registry: Model registry (None for the global registry)
         """
         self.config = get_config()
         self.method = method
+        self.registry = registry if registry is not None else get_model_registry()
+        
+        # Soft masks from the pose graph replace the selfie model when they are good enough
+        self.min_pose_mask_quality = self.config.get('models.body_segmentation.min_pose_mask_quality', 0.9)
+        self.min_pose_mask_coverage = self.config.get('models.body_segmentation.min_pose_mask_coverage', 0.02)
+        
+        # GrabCut runs on a downscaled frame, then only the mask boundary is refined at full resolution
+        self.grabcut_width = self.config.get('models.body_segmentation.grabcut_width', 480)
+        self.grabcut_refine = self.config.get('models.body_segmentation.grabcut_refine', 'guided')
+        self.grabcut_band_px = self.config.get('models.body_segmentation.grabcut_band_px', 16)
+        self.guided_eps = 1e-3
         
         if method in ["mediapipe", "hybrid"]:
             self.mp_selfie = mp.solutions.selfie_segmentation
-            self.selfie_segmentation = self.mp_selfie.SelfieSegmentation(model_selection=1)
-            logger.info("MediaPipe segmentation initialized")
+        self._selfie_segmentation = None
+        
+        # Statistics
+        self.pose_masks_used = 0
+        self.pose_masks_rejected = 0
+        self.model_runs = 0
         
         logger.info(f"Body segmenter initialized with method: {method}")
     
+    @property
+    def selfie_segmentation(self):
+        """MediaPipe selfie segmentation model, acquired on first use"""
+        if self._selfie_segmentation is None:
+            self._selfie_segmentation = self.registry.acquire(
+                self.SELFIE_MODEL_KEY,
+                lambda: self.mp_selfie.SelfieSegmentation(model_selection=1),
+                close=lambda model: model.close()
+            )
+            logger.info("MediaPipe segmentation initialized")
+        return self._selfie_segmentation
+    
     def segment(
         self,
-        image: np.ndarray,
-        background_blur: bool = False
+        image: Union[np.ndarray, FrameContext],
+        background_blur: bool = False,
+        soft_mask: Optional[np.ndarray] = None
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Segment body from background
         
+        For the MediaPipe based methods a precomputed soft person mask, e.g.
+        PoseLandmarks.segmentation_mask, is used instead of running the
+        selfie model, unless it fails mask_quality().
+        
         Args:
-            image: Input image (BGR)
+            image: Frame context or input image (BGR), segmented at full resolution
             background_blur: Whether to blur background instead of removing
+            soft_mask: Optional soft person mask (float, 0-1) of the image
             
         Returns:
             Tuple of (segmented_image, binary_mask)
         """
+        frame = FrameContext.wrap(image)
+        image = frame.full
+        
+        if soft_mask is not None and self.method in ["mediapipe", "hybrid"]:
+            quality = self.mask_quality(soft_mask)
+            if quality >= self.min_pose_mask_quality:
+                self.pose_masks_used += 1
+                if self.method == "hybrid":
+                    return self._segment_hybrid(frame, background_blur, soft_mask)
+                return self.segment_with_mask(image, soft_mask, background_blur)
+            
+            self.pose_masks_rejected += 1
+            logger.debug(f"Pose mask rejected (quality {quality:.2f}), running segmentation model")
+        
         if self.method == "mediapipe":
-            return self._segment_mediapipe(image, background_blur)
+            return self._segment_mediapipe(frame, background_blur)
         elif self.method == "grabcut":
-            return self._segment_grabcut(image)
+            return self._segment_grabcut(frame)
         elif self.method == "hybrid":
-            return self._segment_hybrid(image, background_blur)
+            return self._segment_hybrid(frame, background_blur)
         else:
             logger.error(f"Unknown segmentation method: {self.method}")
             return image, np.ones(image.shape[:2], dtype=np.uint8) * 255
     
     def _segment_mediapipe(
         self,
-        image: np.ndarray,
+        frame: FrameContext,
         background_blur: bool = False
     ) -> Tuple[np.ndarray, np.ndarray]:
         """Segment using MediaPipe"""
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return self.segment_with_mask(frame.full, self.soft_mask(frame), background_blur)
+    
+    def soft_mask(self, image: Union[np.ndarray, FrameContext], width: int = 0) -> np.ndarray:
+        """
+        Run the MediaPipe segmentation model ('mediapipe' and 'hybrid' methods only)
+        
+        Args:
+            image: Frame context or input image (BGR)
+            width: Level width to segment (0 = full resolution)
+            
+        Returns:
+            Soft person mask (float32, 0-1) at the resolution of the level
+        """
+        frame = FrameContext.wrap(image)
+        
+        # RGB copy shared with the other stages
+        image_rgb = frame.rgb(width)
         
         # Process
         results = self.selfie_segmentation.process(image_rgb)
+        self.model_runs += 1
+        
+        return results.segmentation_mask
+    
+    def segment_with_mask(
+        self,
+        image: np.ndarray,
+        soft_mask: np.ndarray,
+        background_blur: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Segment body using a precomputed soft mask
+        
+        Args:
+            image: Input image (BGR)
+            soft_mask: Soft person mask (float, 0-1), resized if it does not match the image
+            background_blur: Whether to blur background instead of removing
+            
+        Returns:
+            Tuple of (segmented_image, binary_mask)
+        """
+        h, w = image.shape[:2]
+        if soft_mask.shape[:2] != (h, w):
+            soft_mask = cv2.resize(soft_mask, (w, h), interpolation=cv2.INTER_LINEAR)
         
         # Get segmentation mask
-        condition = results.segmentation_mask > 0.5
+        condition = soft_mask > 0.5
         
         # Create binary mask
         binary_mask = (condition * 255).astype(np.uint8)
@@ -87,30 +178,21 @@ class BodySegmenter:
         
         return output.astype(np.uint8), binary_mask
     
-    def _segment_grabcut(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def _segment_grabcut(self, frame: FrameContext) -> Tuple[np.ndarray, np.ndarray]:
         """
         Segment using GrabCut algorithm
         Assumes person is in center of image
         """
+        image = frame.full
         h, w = image.shape[:2]
         
-        # Initialize mask
-        mask = np.zeros(image.shape[:2], np.uint8)
-        
-        # Background and foreground models
-        bgd_model = np.zeros((1, 65), np.float64)
-        fgd_model = np.zeros((1, 65), np.float64)
-        
         # Define rectangle around center (assumed person location)
         margin_w = int(w * 0.15)
         margin_h = int(h * 0.1)
         rect = (margin_w, margin_h, w - 2*margin_w, h - 2*margin_h)
         
         # Apply GrabCut
-        cv2.grabCut(image, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
-        
-        # Create binary mask
-        binary_mask = np.where((mask == 2) | (mask == 0), 0, 255).astype(np.uint8)
+        binary_mask = self._grabcut(frame, 5, rect=rect)
         
         # Clean up mask
         binary_mask = apply_morphological_operations(binary_mask, kernel_size=7)
@@ -122,15 +204,21 @@ class BodySegmenter:
     
     def _segment_hybrid(
         self,
-        image: np.ndarray,
-        background_blur: bool = False
+        frame: FrameContext,
+        background_blur: bool = False,
+        soft_mask: Optional[np.ndarray] = None
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Hybrid segmentation combining MediaPipe and GrabCut
-        Uses MediaPipe for initial mask, refines with GrabCut
+        Uses MediaPipe (or the given soft mask) for initial mask, refines with GrabCut
         """
+        image = frame.full
+        
         # Get MediaPipe segmentation
-        _, mp_mask = self._segment_mediapipe(image, False)
+        if soft_mask is not None:
+            _, mp_mask = self.segment_with_mask(image, soft_mask, False)
+        else:
+            _, mp_mask = self._segment_mediapipe(frame, False)
         
         # Use MediaPipe mask to guide GrabCut
         h, w = image.shape[:2]
@@ -141,19 +229,14 @@ class BodySegmenter:
         mask[mp_mask < 50] = cv2.GC_BGD      # Background
         mask[(mp_mask >= 50) & (mp_mask <= 200)] = cv2.GC_PR_BGD  # Probable background
         
-        # Background and foreground models
-        bgd_model = np.zeros((1, 65), np.float64)
-        fgd_model = np.zeros((1, 65), np.float64)
-        
         # Refine with GrabCut
         try:
-            cv2.grabCut(image, mask, None, bgd_model, fgd_model, 3, cv2.GC_INIT_WITH_MASK)
+            binary_mask = self._grabcut(frame, 3, init_mask=mask)
         except:
             # Fall back to MediaPipe only
-            return self._segment_mediapipe(image, background_blur)
-        
-        # Create refined binary mask
-        binary_mask = np.where((mask == 2) | (mask == 0), 0, 255).astype(np.uint8)
+            if soft_mask is not None:
+                return self.segment_with_mask(image, soft_mask, background_blur)
+            return self._segment_mediapipe(frame, background_blur)
         
         # Clean up mask
         binary_mask = apply_morphological_operations(binary_mask, kernel_size=5)
@@ -166,6 +249,129 @@ class BodySegmenter:
         
         return output.astype(np.uint8), binary_mask
     
+    def _grabcut(
+        self,
+        frame: FrameContext,
+        iterations: int,
+        rect: Optional[Tuple[int, int, int, int]] = None,
+        init_mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Run GrabCut coarse-to-fine
+        
+        GrabCut runs on the frame downscaled to `grabcut_width`. The upsampled
+        mask is only wrong near the person's outline, so at full resolution
+        just a band of `grabcut_band_px` around the boundary is refined, with
+        a guided filter on the image ('guided') or a short GrabCut pass with
+        everything outside the band fixed ('grabcut'). A `grabcut_width` of 0
+        runs GrabCut on the full frame.
+        
+        Args:
+            frame: Frame context of the image
+            iterations: GrabCut iterations
+            rect: Initial person rectangle at full resolution (GC_INIT_WITH_RECT)
+            init_mask: Initial GrabCut label mask at full resolution (GC_INIT_WITH_MASK)
+            
+        Returns:
+            Binary mask (0/255) at full resolution
+        """
+        image = frame.full
+        h, w = image.shape[:2]
+        if not self.grabcut_width or self.grabcut_width >= w:
+            return self._run_grabcut(image, iterations, rect, init_mask)
+        
+        # Coarse pass
+        small = frame.level(self.grabcut_width)
+        small_h, small_w = small.shape[:2]
+        scale = small_w / w
+        small_rect = tuple(int(round(v * scale)) for v in rect) if rect is not None else None
+        small_mask = (
+            cv2.resize(init_mask, (small_w, small_h), interpolation=cv2.INTER_NEAREST)
+            if init_mask is not None else None
+        )
+        coarse = self._run_grabcut(small, iterations, small_rect, small_mask)
+        
+        # Upsample and find the band around the boundary
+        soft = cv2.resize(coarse.astype(np.float32) / 255.0, (w, h), interpolation=cv2.INTER_LINEAR)
+        binary = (soft > 0.5).astype(np.uint8) * 255
+        kernel = cv2.getStructuringElement(
+            cv2.MORPH_ELLIPSE, (2 * self.grabcut_band_px + 1, 2 * self.grabcut_band_px + 1)
+        )
+        band = cv2.dilate(binary, kernel) != cv2.erode(binary, kernel)
+        if not band.any():
+            return binary
+        
+        # Refine only inside the bounding box of the band
+        x, y, bw, bh = cv2.boundingRect(band.astype(np.uint8))
+        crop = (slice(y, y + bh), slice(x, x + bw))
+        band = band[crop]
+        inside = binary[crop] > 0
+        
+        if self.grabcut_refine == 'grabcut':
+            labels = np.where(inside, cv2.GC_FGD, cv2.GC_BGD).astype(np.uint8)
+            labels[band & inside] = cv2.GC_PR_FGD
+            labels[band & ~inside] = cv2.GC_PR_BGD
+            try:
+                refined = self._run_grabcut(np.ascontiguousarray(image[crop]), 2, init_mask=labels) > 0
+            except cv2.error:
+                refined = inside
+        else:
+            radius = max(1, self.grabcut_band_px // 2)
+            refined = guided_filter(frame.gray()[crop], soft[crop], radius, self.guided_eps) > 0.5
+        
+        binary[crop][band] = np.where(refined[band], 255, 0)
+        return binary
+    
+    @staticmethod
+    def _run_grabcut(
+        image: np.ndarray,
+        iterations: int,
+        rect: Optional[Tuple[int, int, int, int]] = None,
+        init_mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Run GrabCut from a rectangle or a label mask, returns a binary mask (0/255)"""
+        # Background and foreground models
+        bgd_model = np.zeros((1, 65), np.float64)
+        fgd_model = np.zeros((1, 65), np.float64)
+        
+        if init_mask is not None:
+            mask = init_mask.copy()
+            cv2.grabCut(image, mask, None, bgd_model, fgd_model, iterations, cv2.GC_INIT_WITH_MASK)
+        else:
+            mask = np.zeros(image.shape[:2], np.uint8)
+            cv2.grabCut(image, mask, rect, bgd_model, fgd_model, iterations, cv2.GC_INIT_WITH_RECT)
+        
+        return np.where((mask == 2) | (mask == 0), 0, 255).astype(np.uint8)
+    
+    def mask_quality(self, soft_mask: np.ndarray) -> float:
+        """
+        Score how decisive a soft person mask is
+        
+        Args:
+            soft_mask: Soft person mask (float, 0-1)
+            
+        Returns:
+            Fraction of pixels the mask is confident about (below 0.1 or
+            above 0.9), 0 if the person covers less than min_pose_mask_coverage
+        """
+        if soft_mask.size == 0:
+            return 0.0
+        
+        foreground = np.count_nonzero(soft_mask > 0.5) / soft_mask.size
+        if foreground < self.min_pose_mask_coverage:
+            return 0.0
+        
+        confident = np.count_nonzero((soft_mask < 0.1) | (soft_mask > 0.9))
+        return confident / soft_mask.size
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get how often pose masks replaced the segmentation model"""
+        return {
+            'pose_masks_used': self.pose_masks_used,
+            'pose_masks_rejected': self.pose_masks_rejected,
+            'model_runs': self.model_runs,
+        }
+    
     def refine_mask(self, mask: np.ndarray) -> np.ndarray:
         """
         Refine segmentation mask
@@ -273,7 +479,8 @@ class BodySegmenter:
     
     def release(self):
         """Release resources"""
-        if hasattr(self, 'selfie_segmentation'):
-            self.selfie_segmentation.close()
+        if self._selfie_segmentation is not None:
+            self.registry.release(self.SELFIE_MODEL_KEY)
+            self._selfie_segmentation = None
             logger.info("Body segmenter released")
 
@@ -4,11 +4,13 @@ Depth estimation for 3D reconstruction
 import cv2
 import numpy as np
 import torch
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from pathlib import Path
 
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
+from src.utils.model_registry import ModelRegistry, get_model_registry
+from src.vision.frame_context import FrameContext
 
 
 class DepthEstimator:
@@ -16,33 +18,24 @@ class DepthEstimator:
     Monocular depth estimation using MiDaS/DPT
     """
     
-    def __init__(self, model_type: str = "DPT_Large"):
+    def __init__(self, model_type: str = "DPT_Large", registry: Optional[ModelRegistry] = None):
         """
         Initialize depth estimator
         
         Args:
             model_type: Model type ('DPT_Large', 'DPT_Hybrid', 'MiDaS_small')
+            registry: Model registry (None for the global registry)
         """
         self.config = get_config()
         self.model_type = model_type
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.registry = registry if registry is not None else get_model_registry()
+        self.model_key = ('depth', model_type, str(self.device))
         
         logger.info(f"Loading depth estimation model: {model_type}")
         
         try:
-            # Load MiDaS model from torch hub
-            self.model = torch.hub.load("intel-isl/MiDaS", model_type)
-            self.model.to(self.device)
-            self.model.eval()
-            
-            # Load transforms
-            midas_transforms = torch.hub.load("intel-isl/MiDaS", "transforms")
-            
-            if model_type == "DPT_Large" or model_type == "DPT_Hybrid":
-                self.transform = midas_transforms.dpt_transform
-            else:
-                self.transform = midas_transforms.small_transform
-            
+            self.model, self.transform = self.registry.acquire(self.model_key, self._load_model)
             logger.info(f"Depth estimator initialized on {self.device}")
             
         except Exception as e:
@@ -51,22 +44,41 @@ class DepthEstimator:
             self.model = None
             self.transform = None
     
-    def estimate_depth(self, image: np.ndarray) -> Optional[np.ndarray]:
+    def _load_model(self):
+        """Load the MiDaS model and its input transform from torch hub"""
+        model = torch.hub.load("intel-isl/MiDaS", self.model_type)
+        model.to(self.device)
+        model.eval()
+        
+        # Load transforms
+        midas_transforms = torch.hub.load("intel-isl/MiDaS", "transforms")
+        
+        if self.model_type == "DPT_Large" or self.model_type == "DPT_Hybrid":
+            transform = midas_transforms.dpt_transform
+        else:
+            transform = midas_transforms.small_transform
+        
+        return model, transform
+    
+    def estimate_depth(self, image: Union[np.ndarray, FrameContext]) -> Optional[np.ndarray]:
         """
         Estimate depth map from image
         
         Args:
-            image: Input image (BGR)
+            image: Frame context or input image (BGR), estimated at full resolution
             
         Returns:
             Depth map (float32, inverse depth)
         """
+        frame = FrameContext.wrap(image)
+        image = frame.full
+        
         if self.model is None or self.transform is None:
-            return self._simple_depth_estimation(image)
+            return self._simple_depth_estimation(frame)
         
         try:
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            # RGB copy shared with the other stages
+            image_rgb = frame.rgb()
             
             # Apply transforms
             input_batch = self.transform(image_rgb).to(self.device)
@@ -88,14 +100,14 @@ class DepthEstimator:
             
         except Exception as e:
             logger.error(f"Error in depth estimation: {e}")
-            return self._simple_depth_estimation(image)
+            return self._simple_depth_estimation(frame)
     
-    def _simple_depth_estimation(self, image: np.ndarray) -> np.ndarray:
+    def _simple_depth_estimation(self, frame: FrameContext) -> np.ndarray:
         """
         Simple depth estimation based on brightness/contrast
         Fallback when neural model is not available
         """
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = frame.gray()
         
         # Use gradient magnitude as depth cue
         gx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
@@ -277,8 +289,10 @@ class DepthEstimator:
     
     def release(self):
         """Release resources"""
-        if hasattr(self, 'model') and self.model is not None:
-            del self.model
+        if getattr(self, 'model', None) is not None:
+            self.model = None
+            self.transform = None
+            self.registry.release(self.model_key)
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
             logger.info("Depth estimator released")
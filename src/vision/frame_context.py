@@ -0,0 +1,203 @@
+"""
+Per-frame derived images shared by all vision stages
+"""
+import cv2
+import numpy as np
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from src.utils.buffer_pool import FrameBufferPool
+from src.utils.frame_pyramid import FramePyramid
+
+if TYPE_CHECKING:
+    from src.vision.pose_detector import PoseLandmarks
+
+
+Box = Tuple[int, int, int, int]
+
+
+def landmark_box(landmarks: 'PoseLandmarks', shape: Tuple[int, int], threshold: float = 0.5) -> Box:
+    """
+    Bounding box of visible landmarks in pixel coordinates of an image
+    
+    Args:
+        landmarks: Pose landmarks
+        shape: (height, width) of the image
+        threshold: Visibility threshold
+    
+    Returns:
+        (x, y, width, height), all zero if no landmark is visible
+    """
+    h, w = shape
+    box = landmarks.bounding_box(threshold)
+    if box is None:
+        return (0, 0, 0, 0)
+    
+    x_min = int(max(0.0, box[0]) * w)
+    y_min = int(max(0.0, box[1]) * h)
+    x_max = int(min(1.0, box[2]) * w)
+    y_max = int(min(1.0, box[3]) * h)
+    
+    return (x_min, y_min, x_max - x_min, y_max - y_min)
+
+
+class FrameContext(FramePyramid):
+    """
+    A frame plus lazily computed, memoized derived data
+    
+    Vision stages take a FrameContext instead of a raw image and ask it for
+    what they need: RGB and grayscale conversions and downscaled levels at any
+    width, and the body box of the frame's landmarks. Each is computed on
+    first request and shared by every later stage, so a frame is converted
+    at most once per width. Hits and misses are counted per kind of data.
+    
+    A context is reused across frames through update(). Derived images live
+    in pooled buffers and are only valid until the next update(); stages
+    that keep data across frames have to copy it.
+    """
+    
+    def __init__(
+        self,
+        processing_width: int = 640,
+        buffer_pool: Optional[FrameBufferPool] = None,
+        pooled: bool = True
+    ):
+        """
+        Initialize frame context
+        
+        Args:
+            processing_width: Width of the processing level (0 = full resolution)
+            buffer_pool: Pool for the derived images (None for the global pool)
+            pooled: Write derived images into pooled buffers. One-off contexts
+                allocate instead, so they leave nothing behind in the pool
+        """
+        super().__init__(processing_width, buffer_pool)
+        self.pooled = pooled
+        
+        self.timestamp: Optional[float] = None
+        self.landmarks: Optional['PoseLandmarks'] = None
+        self._cache: Dict[Hashable, Any] = {}
+        
+        # Statistics
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+    
+    @classmethod
+    def wrap(cls, image: Union[np.ndarray, 'FrameContext'], timestamp: Optional[float] = None) -> 'FrameContext':
+        """
+        Get a context for `image`
+        
+        Args:
+            image: A context (returned as is) or a raw BGR image
+            timestamp: Capture time of a raw image
+        
+        Returns:
+            FrameContext whose processing level is the full image
+        """
+        if isinstance(image, FrameContext):
+            return image
+        
+        context = cls(processing_width=0, pooled=False)
+        context.update(image, timestamp)
+        return context
+    
+    def update(self, frame: np.ndarray, timestamp: Optional[float] = None):
+        """Set a new frame and drop everything derived from the last one"""
+        super().update(frame)
+        self.timestamp = timestamp
+        self.landmarks = None
+        self._cache.clear()
+    
+    def level(self, width: int) -> np.ndarray:
+        """Get the frame downscaled to `width` (0 or >= full width returns the full frame)"""
+        if width <= 0 or width >= self.full.shape[1]:
+            return self.full
+        return self._memo(('level', width), lambda: FramePyramid.level(self, width))
+    
+    def rgb(self, width: int = 0) -> np.ndarray:
+        """
+        Get the frame in RGB order
+        
+        Args:
+            width: Level width (0 = full resolution)
+        
+        Returns:
+            RGB image at the requested width
+        """
+        image = self.level(width)
+        level_width = image.shape[1]
+        
+        def convert() -> np.ndarray:
+            rgb = self._buffer(('context_rgb', id(self), level_width), image.shape, image.dtype)
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+            return rgb
+        
+        return self._memo(('rgb', level_width), convert)
+    
+    def gray(self, width: int = 0) -> np.ndarray:
+        """
+        Get the frame in grayscale
+        
+        Args:
+            width: Level width (0 = full resolution)
+        
+        Returns:
+            Grayscale image at the requested width
+        """
+        image = self.level(width)
+        if len(image.shape) == 2:
+            return image
+        level_width = image.shape[1]
+        
+        def convert() -> np.ndarray:
+            gray = self._buffer(('context_gray', id(self), level_width), image.shape[:2], np.uint8)
+            cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=gray)
+            return gray
+        
+        return self._memo(('gray', level_width), convert)
+    
+    def body_roi(self, width: int = 0, threshold: float = 0.5) -> Optional[Box]:
+        """
+        Get the bounding box of the visible landmarks of this frame
+        
+        Args:
+            width: Level width the box is measured on (0 = full resolution)
+            threshold: Visibility threshold
+        
+        Returns:
+            (x, y, width, height) in pixels of that level, None without landmarks
+        """
+        if self.landmarks is None:
+            return None
+        shape = self.level(width).shape[:2]
+        return self._memo(('body_roi', shape, threshold), lambda: landmark_box(self.landmarks, shape, threshold))
+    
+    def _memo(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing it on a miss"""
+        if key in self._cache:
+            self.hits[key[0]] += 1
+            return self._cache[key]
+        
+        self.misses[key[0]] += 1
+        value = compute()
+        self._cache[key] = value
+        return value
+    
+    def _buffer(self, key: Tuple, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        if self.pooled:
+            return self.buffer_pool.get(key, shape, dtype)
+        return np.empty(shape, dtype=dtype)
+    
+    def release(self):
+        """Drop the current frame and its derived data"""
+        super().release()
+        self.timestamp = None
+        self.landmarks = None
+        self._cache.clear()
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get cache hits and misses per kind of derived data"""
+        return {
+            'hits': dict(self.hits),
+            'misses': dict(self.misses),
+        }
@@ -0,0 +1,216 @@
+"""
+Keyframe pose inference with optical flow tracking in between
+"""
+import cv2
+import numpy as np
+from collections import Counter
+from typing import Dict, Optional, Tuple, Union
+
+from src.vision.pose_detector import PoseDetector, PoseLandmarks
+from src.vision.frame_context import FrameContext
+from src.utils.logger import logger
+from src.utils.config_loader import get_config
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+
+
+class KeyframePoseTracker:
+    """
+    Runs full pose inference on keyframes and tracks landmarks in between
+    
+    Between keyframes the landmarks of the last result are propagated with
+    sparse pyramidal Lucas-Kanade optical flow on a small grayscale copy of
+    the frame. A landmark whose forward-backward flow error exceeds the
+    bound is marked lost. Each tracked frame multiplies the per-landmark
+    confidence by `confidence_decay` (lost landmarks drop to 0) and raises
+    `tracked_frames`, so downstream logic can tell tracked from detected
+    landmarks.
+    
+    A new keyframe is detected when:
+    - `keyframe_interval` frames have passed since the last one
+    - more than `max_lost_fraction` of the tracked landmarks were lost
+    - the mean confidence of the tracked landmarks fell below `min_confidence`
+    """
+    
+    # LK parameters, tuned for a ~320 px wide frame
+    LK_PARAMS = dict(
+        winSize=(15, 15),
+        maxLevel=2,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+    )
+    
+    def __init__(
+        self,
+        pose_detector: PoseDetector,
+        keyframe_interval: Optional[int] = None,
+        buffer_pool: Optional[FrameBufferPool] = None
+    ):
+        """
+        Initialize keyframe tracker
+        
+        Args:
+            pose_detector: Detector used on keyframes
+            keyframe_interval: Frames between forced keyframes, 1 detects every frame (None to use config)
+            buffer_pool: Pool for the grayscale buffers (None for the global pool)
+        """
+        self.config = get_config()
+        self.pose_detector = pose_detector
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        
+        self.keyframe_interval = max(1, keyframe_interval if keyframe_interval is not None
+                                     else self.config.get('models.pose_detection.keyframe_interval', 3))
+        self.flow_width = self.config.get('models.pose_detection.flow_width', 320)
+        self.max_flow_error_px = self.config.get('models.pose_detection.max_flow_error_px', 2.0)
+        self.confidence_decay = self.config.get('models.pose_detection.confidence_decay', 0.9)
+        self.min_confidence = self.config.get('models.pose_detection.min_landmark_confidence', 0.5)
+        self.max_lost_fraction = self.config.get('models.pose_detection.max_lost_fraction', 0.3)
+        
+        self._last: Optional[PoseLandmarks] = None
+        self._prev_gray: Optional[np.ndarray] = None
+        self._gray_index = 0
+        
+        # Statistics
+        self.keyframes = 0
+        self.tracked_frames = 0
+        self.keyframe_reasons: Counter = Counter()
+        
+        logger.info(f"Keyframe pose tracker initialized (keyframe every {self.keyframe_interval} frames)")
+    
+    def process(
+        self,
+        image: Union[np.ndarray, FrameContext],
+        timestamp: Optional[float] = None,
+        image_size: Optional[Tuple[int, int]] = None
+    ) -> Optional[PoseLandmarks]:
+        """
+        Get pose landmarks for a frame, detected or tracked
+        
+        Args:
+            image: Frame context or input image (BGR). Pose and flow run on
+                the processing level of a context
+            timestamp: Optional capture time of the frame (defaults to the context's timestamp)
+            image_size: Optional (width, height) of the full resolution frame
+        
+        Returns:
+            PoseLandmarks or None if no pose was detected
+        """
+        frame = FrameContext.wrap(image, timestamp)
+        if timestamp is None:
+            timestamp = frame.timestamp
+        gray = self._to_gray(frame)
+        
+        reason = self._keyframe_reason()
+        if reason is None:
+            tracked = self._track(gray, timestamp)
+            reason = self._tracking_failure(tracked)
+            if reason is None:
+                self._prev_gray = gray
+                self._last = tracked
+                self.tracked_frames += 1
+                return tracked
+        
+        landmarks = self.pose_detector.detect(frame, timestamp=timestamp, image_size=image_size)
+        self.keyframes += 1
+        self.keyframe_reasons[reason] += 1
+        
+        self._prev_gray = gray if landmarks is not None else None
+        self._last = landmarks
+        return landmarks
+    
+    def _keyframe_reason(self) -> Optional[str]:
+        """Why the next frame has to be a keyframe, None if it can be tracked"""
+        if self._last is None or self._prev_gray is None:
+            return 'no_pose'
+        if self._last.tracked_frames + 1 >= self.keyframe_interval:
+            return 'interval'
+        return None
+    
+    def _tracking_failure(self, tracked: Optional[PoseLandmarks]) -> Optional[str]:
+        """Why tracked landmarks are not good enough, None if they are"""
+        if tracked is None:
+            return 'flow_failed'
+        
+        # Only landmarks that were worth tracking count
+        active = self._last.confidence > 0
+        if not np.any(active):
+            return 'flow_failed'
+        
+        lost = np.count_nonzero(tracked.confidence[active] == 0)
+        if lost > self.max_lost_fraction * np.count_nonzero(active):
+            return 'landmarks_lost'
+        if float(tracked.confidence[active].mean()) < self.min_confidence:
+            return 'low_confidence'
+        return None
+    
+    def _to_gray(self, frame: FrameContext) -> np.ndarray:
+        """
+        Downscaled grayscale copy in one of two alternating buffers
+        
+        The grayscale level comes from the frame context and is shared with
+        the other stages; the copy keeps it valid as the previous frame.
+        """
+        w = frame.processing.shape[1]
+        width = min(self.flow_width, w) if self.flow_width > 0 else w
+        shared = frame.gray(width)
+        
+        self._gray_index = (self._gray_index + 1) % 2
+        gray = self.buffer_pool.get(('flow_gray', id(self), self._gray_index), shared.shape, np.uint8)
+        np.copyto(gray, shared)
+        return gray
+    
+    def _track(self, gray: np.ndarray, timestamp: Optional[float]) -> Optional[PoseLandmarks]:
+        """Propagate the last landmarks onto `gray` with forward-backward LK"""
+        last = self._last
+        h, w = gray.shape[:2]
+        scale = np.array([w, h], dtype=np.float32)
+        
+        points = last.xy * scale
+        inside = np.all((points >= 0) & (points < scale), axis=1) & (last.confidence > 0)
+        if not np.any(inside):
+            return None
+        
+        prev_pts = points[inside].reshape(-1, 1, 2)
+        next_pts, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, prev_pts, None, **self.LK_PARAMS)
+        if next_pts is None:
+            return None
+        back_pts, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, next_pts, None, **self.LK_PARAMS)
+        
+        fb_error = np.linalg.norm(back_pts - prev_pts, axis=2).ravel()
+        ok = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error <= self.max_flow_error_px)
+        
+        data = last.data.copy()
+        confidence = last.confidence * self.confidence_decay
+        
+        # Move the tracked landmarks; lost ones keep their position with zero confidence
+        tracked_ids = np.flatnonzero(inside)
+        data[tracked_ids[ok], :2] = next_pts.reshape(-1, 2)[ok] / scale
+        confidence[tracked_ids[~ok]] = 0.0
+        
+        return PoseLandmarks(
+            landmarks=data,
+            world_landmarks=last.world,
+            image_width=last.image_width,
+            image_height=last.image_height,
+            timestamp=timestamp,
+            confidence=confidence,
+            tracked_frames=last.tracked_frames + 1
+        )
+    
+    def reset(self):
+        """Force a keyframe on the next frame"""
+        self._last = None
+        self._prev_gray = None
+    
+    def release(self):
+        """Reset and return the grayscale buffers to the pool"""
+        self.reset()
+        self.buffer_pool.release_named(id(self))
+    
+    def get_stats(self) -> Dict:
+        """Get keyframe and tracking counts"""
+        total = self.keyframes + self.tracked_frames
+        return {
+            'keyframes': self.keyframes,
+            'tracked_frames': self.tracked_frames,
+            'keyframe_ratio': self.keyframes / total if total else 0.0,
+            'keyframe_reasons': dict(self.keyframe_reasons),
+        }
@@ -0,0 +1,138 @@
+"""
+Temporal smoothing of pose landmarks
+"""
+import numpy as np
+from typing import Dict, Optional
+
+from src.vision.pose_detector import PoseLandmarks
+from src.utils.config_loader import get_config
+
+
+class OneEuroLandmarkFilter:
+    """
+    One-Euro filter over all landmark coordinates at once
+    
+    Each coordinate is low-pass filtered with a cutoff that rises with its
+    own filtered speed: cutoff = min_cutoff + beta * |speed|. A landmark that
+    holds still is smoothed hard, which removes the detector jitter that
+    breaks the stability check, while a moving landmark follows with little
+    lag. All 33 landmarks are filtered in one vectorized step.
+    
+    The filter returns new PoseLandmarks with smoothed (x, y) and leaves the
+    input untouched, so raw landmarks stay available. Visibility, world
+    landmarks and tracking metadata are passed through. The state restarts
+    when the landmark count changes or after a gap of more than `max_gap_s`.
+    """
+    
+    def __init__(
+        self,
+        min_cutoff: Optional[float] = None,
+        beta: Optional[float] = None,
+        d_cutoff: Optional[float] = None,
+        max_gap_s: float = 0.5,
+        frame_interval_s: float = 1.0 / 30.0
+    ):
+        """
+        Initialize landmark filter
+        
+        Args:
+            min_cutoff: Cutoff frequency (Hz) of a still landmark (None to use config)
+            beta: Cutoff increase per unit of speed, normalized image units per second (None to use config)
+            d_cutoff: Cutoff frequency (Hz) of the speed estimate (None to use config)
+            max_gap_s: Restart after this long without landmarks
+            frame_interval_s: Time step assumed for landmarks without timestamps
+        """
+        config = get_config()
+        self.enabled = config.get('models.pose_detection.landmark_filter.enabled', True)
+        self.min_cutoff = (
+            min_cutoff if min_cutoff is not None
+            else config.get('models.pose_detection.landmark_filter.min_cutoff', 1.0)
+        )
+        self.beta = beta if beta is not None else config.get('models.pose_detection.landmark_filter.beta', 5.0)
+        self.d_cutoff = (
+            d_cutoff if d_cutoff is not None
+            else config.get('models.pose_detection.landmark_filter.d_cutoff', 1.0)
+        )
+        self.max_gap_s = max_gap_s
+        self.frame_interval_s = frame_interval_s
+        
+        self._xy: Optional[np.ndarray] = None  # Filtered (N, 2) positions
+        self._speed: Optional[np.ndarray] = None  # Filtered (N, 2) speeds
+        self._last_time: Optional[float] = None
+        
+        # Statistics
+        self.frames = 0
+        self.restarts = 0
+    
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        """Smoothing factor of an exponential low-pass at `cutoff` Hz"""
+        tau = 1.0 / (2.0 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def filter(self, landmarks: Optional[PoseLandmarks]) -> Optional[PoseLandmarks]:
+        """
+        Smooth the landmarks of the next frame
+        
+        Args:
+            landmarks: Raw landmarks, None if no pose was found (restarts the filter)
+        
+        Returns:
+            Smoothed landmarks (the input itself if the filter is disabled)
+        """
+        if landmarks is None:
+            self.reset()
+            return None
+        if not self.enabled:
+            return landmarks
+        
+        xy = landmarks.xy.astype(np.float64)
+        timestamp = landmarks.timestamp
+        if timestamp is not None and self._last_time is not None:
+            dt = timestamp - self._last_time
+        else:
+            dt = self.frame_interval_s
+        
+        self.frames += 1
+        if self._xy is None or self._xy.shape != xy.shape or dt > self.max_gap_s or dt <= 0:
+            if self._xy is not None:
+                self.restarts += 1
+            self._xy = xy
+            self._speed = np.zeros_like(xy)
+            self._last_time = timestamp
+            return landmarks
+        
+        # Speed estimate, then a position low-pass whose cutoff follows the speed
+        speed = (xy - self._xy) / dt
+        self._speed += self._alpha(self.d_cutoff, dt) * (speed - self._speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._speed)
+        self._xy += self._alpha(cutoff, dt) * (xy - self._xy)
+        self._last_time = timestamp
+        
+        data = landmarks.data.copy()
+        data[:, :2] = self._xy
+        return PoseLandmarks(
+            landmarks=data,
+            world_landmarks=landmarks.world,
+            image_width=landmarks.image_width,
+            image_height=landmarks.image_height,
+            timestamp=timestamp,
+            confidence=landmarks.confidence,
+            tracked_frames=landmarks.tracked_frames
+        )
+    
+    def reset(self):
+        """Forget the filter state"""
+        self._xy = None
+        self._speed = None
+        self._last_time = None
+    
+    def get_stats(self) -> Dict:
+        """Get filter settings and counters"""
+        return {
+            'enabled': self.enabled,
+            'min_cutoff': self.min_cutoff,
+            'beta': self.beta,
+            'frames': self.frames,
+            'restarts': self.restarts,
+        }
@@ -0,0 +1,226 @@
+"""
+Keyframe person segmentation with motion-compensated mask propagation
+"""
+import cv2
+import numpy as np
+from collections import Counter
+from typing import Dict, Optional, Tuple, Union
+
+from src.vision.body_segmentation import BodySegmenter
+from src.vision.frame_context import FrameContext
+from src.utils.logger import logger
+from src.utils.config_loader import get_config
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+
+
+class TemporalMaskTracker:
+    """
+    Runs the segmentation model on keyframes and propagates the mask in between
+    
+    The soft person mask of the last frame is carried over to the next one.
+    Corners on and around the person are tracked with pyramidal Lucas-Kanade
+    flow on a small grayscale copy of the frame. When their median motion is
+    below `still_motion_px`, the mask is reused as is. Otherwise it is warped
+    with the similarity transform fitted to the tracks.
+    
+    The propagated mask is checked on its edge band, the pixels around the
+    person's outline. If the motion-compensated previous frame differs from
+    the current one there by more than `max_residual` gray levels on
+    average, the outline has changed in a way the warp does not explain,
+    e.g. a moving arm.
+    
+    A new keyframe is segmented when:
+    - `keyframe_interval` frames have passed since the last one
+    - the motion could not be tracked or exceeds `max_motion_px`
+    - the edge-band residual exceeds `max_residual`
+    """
+    
+    # LK parameters, tuned for a ~256 px wide frame
+    LK_PARAMS = dict(
+        winSize=(15, 15),
+        maxLevel=2,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+    )
+    
+    def __init__(
+        self,
+        segmenter: BodySegmenter,
+        keyframe_interval: Optional[int] = None,
+        buffer_pool: Optional[FrameBufferPool] = None
+    ):
+        """
+        Initialize mask tracker
+        
+        Args:
+            segmenter: Segmenter whose model runs on keyframes, using the 'mediapipe' or 'hybrid' method
+            keyframe_interval: Frames between forced keyframes, 1 segments every frame (None to use config)
+            buffer_pool: Pool for the grayscale buffers (None for the global pool)
+        """
+        self.config = get_config()
+        self.segmenter = segmenter
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        
+        self.keyframe_interval = max(1, keyframe_interval if keyframe_interval is not None
+                                     else self.config.get('models.body_segmentation.temporal.keyframe_interval', 15))
+        self.width = self.config.get('models.body_segmentation.temporal.width', 256)
+        self.still_motion_px = self.config.get('models.body_segmentation.temporal.still_motion_px', 0.3)
+        self.max_motion_px = self.config.get('models.body_segmentation.temporal.max_motion_px', 8.0)
+        self.max_residual = self.config.get('models.body_segmentation.temporal.max_residual', 12.0)
+        band_px = self.config.get('models.body_segmentation.temporal.band_px', 3)
+        self.good_quality = self.config.get('models.body_segmentation.temporal.good_quality', 0.9)
+        self._band_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * band_px + 1, 2 * band_px + 1))
+        self.min_points = 8
+        
+        self.mask: Optional[np.ndarray] = None  # Soft mask (float32, 0-1) of the last frame
+        self.quality = 0.0  # BodySegmenter.mask_quality() of the last mask
+        self.last_residual: Optional[float] = None
+        self._prev_gray: Optional[np.ndarray] = None
+        self._gray_index = 0
+        self._since_keyframe = 0
+        
+        # Statistics
+        self.keyframes = 0
+        self.propagated_frames = 0
+        self.reused_frames = 0
+        self.keyframe_reasons: Counter = Counter()
+        
+        logger.info(f"Temporal mask tracker initialized (keyframe every {self.keyframe_interval} frames)")
+    
+    def process(self, image: Union[np.ndarray, FrameContext]) -> np.ndarray:
+        """
+        Get the soft person mask of a frame, segmented or propagated
+        
+        Args:
+            image: Frame context or input image (BGR). The mask is computed at
+                `width`, or the processing level of a context if that is smaller
+        
+        Returns:
+            Soft person mask (float32, 0-1) at the tracking resolution
+        """
+        frame = FrameContext.wrap(image)
+        gray = self._to_gray(frame)
+        
+        reason = self._keyframe_reason()
+        if reason is None:
+            mask, reason = self._propagate(gray)
+            if reason is None:
+                self._update(mask, gray)
+                self._since_keyframe += 1
+                self.propagated_frames += 1
+                return mask
+        
+        mask = self.segmenter.soft_mask(frame, gray.shape[1])
+        self.keyframes += 1
+        self.keyframe_reasons[reason] += 1
+        
+        self._update(mask, gray)
+        self._since_keyframe = 0
+        return mask
+    
+    def _update(self, mask: np.ndarray, gray: np.ndarray):
+        """Keep the mask and frame for the next propagation"""
+        self.mask = mask
+        self.quality = self.segmenter.mask_quality(mask)
+        self._prev_gray = gray
+    
+    def _keyframe_reason(self) -> Optional[str]:
+        """Why the next frame has to be a keyframe, None if the mask can be propagated"""
+        if self.mask is None or self._prev_gray is None:
+            return 'no_mask'
+        if self._since_keyframe + 1 >= self.keyframe_interval:
+            return 'interval'
+        return None
+    
+    def _propagate(self, gray: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[str]]:
+        """
+        Carry the last mask over to `gray`
+        
+        Returns:
+            Tuple of (mask, None) or (None, keyframe reason)
+        """
+        h, w = gray.shape[:2]
+        binary = (self.mask > 0.5).astype(np.uint8)
+        if not binary.any():
+            return None, 'empty_mask'
+        
+        # Track corners on the person and just outside its outline
+        region = cv2.dilate(binary, self._band_kernel)
+        prev_pts = cv2.goodFeaturesToTrack(
+            self._prev_gray, maxCorners=100, qualityLevel=0.01, minDistance=5, mask=region
+        )
+        if prev_pts is None or len(prev_pts) < self.min_points:
+            return None, 'flow_failed'
+        
+        next_pts, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, prev_pts, None, **self.LK_PARAMS)
+        if next_pts is None:
+            return None, 'flow_failed'
+        ok = status.ravel() == 1
+        if np.count_nonzero(ok) < self.min_points:
+            return None, 'flow_failed'
+        
+        motion = float(np.median(np.linalg.norm(next_pts[ok] - prev_pts[ok], axis=2)))
+        if motion > self.max_motion_px:
+            return None, 'motion'
+        
+        if motion <= self.still_motion_px:
+            # Holding still: reuse the mask
+            mask = self.mask
+            compensated = self._prev_gray
+        else:
+            matrix, _ = cv2.estimateAffinePartial2D(prev_pts[ok], next_pts[ok])
+            if matrix is None:
+                return None, 'flow_failed'
+            mask = cv2.warpAffine(self.mask, matrix, (w, h), flags=cv2.INTER_LINEAR, borderValue=0)
+            compensated = cv2.warpAffine(self._prev_gray, matrix, (w, h), borderMode=cv2.BORDER_REPLICATE)
+        
+        # Edge-band residual of the motion-compensated frame
+        warped = (mask > 0.5).astype(np.uint8)
+        band = cv2.dilate(warped, self._band_kernel) != cv2.erode(warped, self._band_kernel)
+        if not band.any():
+            return None, 'empty_mask'
+        self.last_residual = float(cv2.absdiff(compensated, gray)[band].mean())
+        if self.last_residual > self.max_residual:
+            return None, 'residual'
+        
+        if mask is self.mask:
+            self.reused_frames += 1
+        return mask, None
+    
+    def _to_gray(self, frame: FrameContext) -> np.ndarray:
+        """
+        Downscaled grayscale copy in one of two alternating buffers
+        
+        The grayscale level comes from the frame context and is shared with
+        the other stages; the copy keeps it valid as the previous frame.
+        """
+        w = frame.processing.shape[1]
+        width = min(self.width, w) if self.width > 0 else w
+        shared = frame.gray(width)
+        
+        self._gray_index = (self._gray_index + 1) % 2
+        gray = self.buffer_pool.get(('mask_gray', id(self), self._gray_index), shared.shape, np.uint8)
+        np.copyto(gray, shared)
+        return gray
+    
+    def reset(self):
+        """Force a keyframe on the next frame"""
+        self.mask = None
+        self.quality = 0.0
+        self._prev_gray = None
+    
+    def release(self):
+        """Reset and return the grayscale buffers to the pool"""
+        self.reset()
+        self.buffer_pool.release_named(id(self))
+    
+    def get_stats(self) -> Dict:
+        """Get keyframe and propagation counts"""
+        total = self.keyframes + self.propagated_frames
+        return {
+            'keyframes': self.keyframes,
+            'propagated_frames': self.propagated_frames,
+            'reused_frames': self.reused_frames,
+            'keyframe_ratio': self.keyframes / total if total else 0.0,
+            'keyframe_reasons': dict(self.keyframe_reasons),
+            'last_residual': self.last_residual,
+        }
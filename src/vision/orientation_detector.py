@@ -2,13 +2,16 @@
 Body orientation detection for multi-view scanning
 """
 import numpy as np
+from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 import cv2
 
 from src.vision.pose_detector import PoseLandmarks, PoseDetector
+from src.vision.yaw_estimator import YawEstimate, YawEstimator, wrap_angle
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
+from src.ui.overlay import OverlayCompositor
 
 
 class Orientation(Enum):
@@ -20,13 +23,47 @@ class Orientation(Enum):
     UNKNOWN = "unknown"
 
 
+@dataclass
+class OrientationBatch:
+    """Orientations of N frames from OrientationDetector.detect_orientation_batch()"""
+    codes: np.ndarray  # (N,) int8 index into OrientationDetector.BATCH_ORIENTATIONS
+    confidences: np.ndarray  # (N,) float64
+    rotation_angles: np.ndarray  # (N,) float64 degrees, see calculate_rotation_angle()
+    
+    @property
+    def orientations(self) -> List[Orientation]:
+        """Orientation of every frame"""
+        return [OrientationDetector.BATCH_ORIENTATIONS[code] for code in self.codes]
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
 class OrientationDetector:
     """Detects body orientation from pose landmarks"""
     
-    def __init__(self):
-        """Initialize orientation detector"""
+    # Orientation codes of detect_orientation_batch(), in the voting order of
+    # detect_orientation() so ties resolve the same way
+    BATCH_ORIENTATIONS = (
+        Orientation.FRONT,
+        Orientation.LEFT_SIDE,
+        Orientation.RIGHT_SIDE,
+        Orientation.BACK,
+        Orientation.UNKNOWN
+    )
+    _FRONT, _LEFT, _RIGHT, _BACK, _UNKNOWN = range(5)
+    
+    def __init__(self, pose_detector: Optional[PoseDetector] = None):
+        """
+        Initialize orientation detector
+        
+        Args:
+            pose_detector: Detector of the landmarks passed in, shared with the
+                caller. Orientation works on given landmarks and never runs
+                inference itself.
+        """
         self.config = get_config()
-        self.pose_detector = PoseDetector()
+        self.pose_detector = pose_detector
         
         # Angle thresholds from config
         self.front_range = self.config.get('orientation_detection.front_angle_range', [-30, 30])
@@ -35,8 +72,72 @@ class OrientationDetector:
         
         self.confidence_threshold = self.config.get('orientation_detection.confidence_threshold', 0.85)
         
+        # Filtered yaw from world landmarks, the heuristic votes are the fallback
+        self.use_world_yaw = self.config.get('orientation_detection.use_world_yaw', True)
+        self.yaw_hysteresis = self.config.get('orientation_detection.yaw_hysteresis_deg', 10.0)
+        self.yaw_estimator = YawEstimator()
+        self.yaw_bands = {
+            Orientation.FRONT: tuple(self.front_range),
+            Orientation.LEFT_SIDE: tuple(self.side_range),
+            Orientation.RIGHT_SIDE: (-self.side_range[1], -self.side_range[0]),
+            Orientation.BACK: tuple(self.back_range),
+        }
+        self.last_yaw: Optional[YawEstimate] = None
+        self._yaw_orientation = Orientation.UNKNOWN
+        
         logger.info("Orientation detector initialized")
     
+    def update_orientation(self, landmarks: PoseLandmarks) -> Tuple[Orientation, float]:
+        """
+        Track body orientation over consecutive frames
+        
+        Uses the filtered yaw of the world landmarks, mapped to an orientation
+        with hysteresis, and falls back to detect_orientation() for landmarks
+        without world coordinates. Call reset_tracking() when the person is lost.
+        
+        Args:
+            landmarks: Pose landmarks of the next frame
+            
+        Returns:
+            Tuple of (orientation, confidence)
+        """
+        if self.use_world_yaw:
+            estimate = self.yaw_estimator.update(landmarks)
+            if estimate is not None:
+                self.last_yaw = estimate
+                self._yaw_orientation = self._classify_yaw(estimate.yaw)
+                return self._yaw_orientation, estimate.confidence
+        
+        return self.detect_orientation(landmarks)
+    
+    def reset_tracking(self):
+        """Forget the yaw filter and orientation state"""
+        self.yaw_estimator.reset()
+        self.last_yaw = None
+        self._yaw_orientation = Orientation.UNKNOWN
+    
+    def _classify_yaw(self, yaw: float) -> Orientation:
+        """
+        Map a yaw angle to an orientation band with hysteresis
+        
+        The current orientation is kept until the yaw leaves its band widened
+        by `yaw_hysteresis` degrees; a new orientation needs the yaw inside its
+        band proper. Yaw between bands gives UNKNOWN.
+        """
+        def in_band(orientation: Orientation, margin: float) -> bool:
+            low, high = self.yaw_bands[orientation]
+            center = (low + high) / 2.0
+            return abs(wrap_angle(yaw - center)) <= (high - low) / 2.0 + margin
+        
+        current = self._yaw_orientation
+        if current in self.yaw_bands and in_band(current, self.yaw_hysteresis):
+            return current
+        
+        for orientation in self.yaw_bands:
+            if in_band(orientation, 0.0):
+                return orientation
+        return Orientation.UNKNOWN
+    
     def detect_orientation(
         self,
         landmarks: PoseLandmarks,
@@ -237,6 +338,104 @@ class OrientationDetector:
         
         return angle_degrees
     
+    def detect_orientation_batch(
+        self,
+        landmarks: Union[np.ndarray, Sequence[PoseLandmarks]],
+        use_face: bool = True
+    ) -> OrientationBatch:
+        """
+        Detect the orientation of many frames at once
+        
+        Vectorized version of detect_orientation() and calculate_rotation_angle()
+        for offline datasets, e.g. relabeling archived captures after a
+        threshold change. The results are identical to the per-frame calls.
+        
+        Args:
+            landmarks: (N, 33, 3) array of (x, y, visibility) or a sequence of PoseLandmarks
+            use_face: Whether to use face landmarks for detection
+            
+        Returns:
+            OrientationBatch with orientation codes, confidences and rotation angles
+        """
+        if not isinstance(landmarks, np.ndarray):
+            landmarks = np.stack([l.data for l in landmarks]) if len(landmarks) else np.zeros((0, 33, 3))
+        # Same precision as PoseLandmarks, compared in float64 like the per-frame path
+        data = np.asarray(landmarks, dtype=np.float32).astype(np.float64)
+        if data.ndim != 3 or data.shape[2] != 3 or data.shape[1] <= PoseDetector.RIGHT_HIP:
+            raise ValueError(f"Expected (N, 33, 3) landmarks, got shape {data.shape}")
+        
+        x = data[:, :, 0]
+        y = data[:, :, 1]
+        vis = data[:, :, 2]
+        n = len(data)
+        
+        # Method 1: Shoulder width ratio
+        left_sh, right_sh = PoseDetector.LEFT_SHOULDER, PoseDetector.RIGHT_SHOULDER
+        shoulder_width = np.abs(x[:, right_sh] - x[:, left_sh])
+        vis_diff = np.abs(vis[:, left_sh] - vis[:, right_sh])
+        left_side = np.where(vis[:, left_sh] > vis[:, right_sh], self._LEFT, self._RIGHT)
+        shoulder_orientation = np.select(
+            [shoulder_width > 0.15, shoulder_width < 0.08],
+            [np.where(vis_diff < 0.2, self._FRONT, self._UNKNOWN), left_side],
+            self._UNKNOWN
+        )
+        
+        # Method 2: Face direction
+        if use_face:
+            left_ear = vis[:, PoseDetector.LEFT_EAR] > 0.5
+            right_ear = vis[:, PoseDetector.RIGHT_EAR] > 0.5
+            left_eye = vis[:, PoseDetector.LEFT_EYE] > 0.5
+            right_eye = vis[:, PoseDetector.RIGHT_EYE] > 0.5
+            face_orientation = np.select(
+                [
+                    left_eye & right_eye & (left_ear == right_ear),
+                    left_ear & ~right_ear,
+                    right_ear & ~left_ear,
+                    ~left_eye & ~right_eye & (left_ear | right_ear),
+                ],
+                [self._FRONT, self._LEFT, self._RIGHT, self._BACK],
+                self._UNKNOWN
+            )
+        
+        # Method 3: Hip visibility
+        left_hip, right_hip = PoseDetector.LEFT_HIP, PoseDetector.RIGHT_HIP
+        hip_width = np.abs(x[:, right_hip] - x[:, left_hip])
+        hip_side = np.where(vis[:, left_hip] > vis[:, right_hip], self._LEFT, self._RIGHT)
+        hip_orientation = np.select(
+            [np.abs(hip_width - shoulder_width) < 0.05, hip_width < shoulder_width * 0.6],
+            [self._FRONT, hip_side],
+            self._UNKNOWN
+        )
+        
+        # Weighted voting, accumulated in the same order as detect_orientation()
+        shoulder_score, face_score, hip_score = 1.0, 1.5 if use_face else 0.0, 0.8
+        total_score = shoulder_score + face_score + hip_score
+        votes = [(shoulder_orientation, shoulder_score), (hip_orientation, hip_score)]
+        if use_face:
+            votes.insert(1, (face_orientation, face_score))
+        
+        scores = np.zeros((n, 4))
+        rows = np.arange(n)
+        for orientation, score in votes:
+            voted = orientation != self._UNKNOWN
+            scores[rows[voted], orientation[voted]] += score
+        
+        # argmax keeps the first maximum, like max() over the ordered score dict
+        codes = np.argmax(scores, axis=1)
+        confidences = scores[rows, codes] / total_score
+        
+        # Rotation angle from the shoulder center to the nose
+        nose = PoseDetector.NOSE
+        dx = x[:, nose] - (x[:, left_sh] + x[:, right_sh]) / 2
+        dy = y[:, nose] - (y[:, left_sh] + y[:, right_sh]) / 2
+        rotation_angles = (np.degrees(np.arctan2(dy, dx)) + 360) % 360
+        
+        return OrientationBatch(
+            codes=codes.astype(np.int8),
+            confidences=confidences,
+            rotation_angles=rotation_angles
+        )
+    
     def get_guidance_message(
         self,
         current_orientation: Orientation,
@@ -287,7 +486,8 @@ class OrientationDetector:
         image: np.ndarray,
         orientation: Orientation,
         confidence: float,
-        target_orientation: Optional[Orientation] = None
+        target_orientation: Optional[Orientation] = None,
+        inplace: bool = False
     ) -> np.ndarray:
         """
         Draw orientation information overlay on image
@@ -297,11 +497,12 @@ class OrientationDetector:
             orientation: Detected orientation
             confidence: Detection confidence
             target_orientation: Optional target orientation
+            inplace: Draw directly on `image` instead of a copy
             
         Returns:
             Image with overlay
         """
-        output = image.copy()
+        output = image if inplace else image.copy()
         h, w = output.shape[:2]
         
         # Color based on match
@@ -352,4 +553,58 @@ class OrientationDetector:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         
         return output
-
+    
+    def add_to_overlay(
+        self,
+        overlay: OverlayCompositor,
+        orientation: Orientation,
+        confidence: float,
+        target_orientation: Optional[Orientation] = None
+    ):
+        """
+        Queue the orientation overlay on an overlay compositor
+        
+        Same layout as draw_orientation_overlay(), rendered in the compositor's
+        single pass with cached text and bar sprites.
+        
+        Args:
+            overlay: Compositor of the current display frame
+            orientation: Detected orientation
+            confidence: Detection confidence
+            target_orientation: Optional target orientation
+        """
+        _, h = overlay.size
+        
+        # Color based on match
+        if target_orientation and orientation == target_orientation:
+            color = (0, 255, 0)  # Green
+            status = "[OK] CORRECT"
+        elif target_orientation:
+            color = (0, 165, 255)  # Orange
+            status = "[>>] ADJUST"
+        else:
+            color = (255, 255, 255)  # White
+            status = ""
+        
+        # Orientation info
+        overlay.text(orientation.value.replace('_', ' ').upper(), (20, 50), font_scale=1.2, thickness=3, color=color)
+        
+        # Confidence bar
+        bar_width = 200
+        bar_height = 20
+        bar_x = 20
+        bar_y = 80
+        
+        overlay.bar((bar_x, bar_y), (bar_width, bar_height), confidence, fill_color=color)
+        overlay.text(f"Confidence: {confidence*100:.1f}%", (bar_x, bar_y - 5), font_scale=0.6)
+        
+        if status:
+            overlay.text(status, (bar_x + bar_width + 20, bar_y + 15), color=color)
+        
+        # Target and guidance
+        if target_orientation:
+            target_text = f"Target: {target_orientation.value.replace('_', ' ').upper()}"
+            overlay.text(target_text, (20, h - 30), font_scale=0.8, color=(255, 255, 0))
+            
+            guidance = self.get_guidance_message(orientation, target_orientation, confidence)
+            overlay.text(guidance, (20, h - 60))
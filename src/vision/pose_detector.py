@@ -1,38 +1,229 @@
 """
 Advanced pose detection using MediaPipe and tracking
 """
+import struct
+import time
 import cv2
 import numpy as np
 import mediapipe as mp
-from typing import Optional, Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Union
 
 from src.utils.logger import logger
 from src.utils.config_loader import get_config
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+from src.utils.model_registry import ModelRegistry, get_model_registry
+from src.ui.overlay import OverlayCompositor
+from src.vision.frame_context import FrameContext
 
 
-@dataclass
 class PoseLandmarks:
-    """Container for pose landmark data"""
-    landmarks: List[Tuple[float, float, float]]  # (x, y, visibility)
-    world_landmarks: Optional[List[Tuple[float, float, float]]] = None
-    image_width: int = 0
-    image_height: int = 0
+    """
+    Pose landmarks of one frame backed by NumPy arrays
+    
+    `data` is a (33, 3) float32 array of normalized (x, y, visibility) and
+    `world` an optional (33, 3) float32 array of metric (x, y, z). Instances
+    pickle as their raw arrays and to_bytes() gives a compact binary form,
+    so landmarks are cheap to send between processes.
+    
+    Landmarks detected by the model have `tracked_frames == 0` and a
+    `confidence` of 1. Landmarks propagated by optical flow between
+    detections carry the number of frames since the detection and a
+    per-landmark confidence that decays with every tracked frame.
+    
+    Detections of a graph with segmentation enabled also carry the model's
+    soft person mask (`segmentation_mask`, float32 in [0, 1] at the frame
+    resolution). The mask is pickled with the landmarks but left out of
+    to_bytes().
+    """
+    
+    __slots__ = (
+        'data', 'world', 'image_width', 'image_height', 'timestamp', 'confidence', 'tracked_frames',
+        'segmentation_mask'
+    )
+    
+    # Binary layout of to_bytes(): width, height, timestamp (NaN if unset), landmark count,
+    # tracked frames, has world
+    _HEADER = struct.Struct('<iidHH?')
+    
+    def __init__(
+        self,
+        landmarks,
+        world_landmarks=None,
+        image_width: int = 0,
+        image_height: int = 0,
+        timestamp: Optional[float] = None,
+        confidence=None,
+        tracked_frames: int = 0,
+        segmentation_mask: Optional[np.ndarray] = None
+    ):
+        """
+        Args:
+            landmarks: (N, 3) array or list of (x, y, visibility)
+            world_landmarks: Optional (N, 3) array or list of (x, y, z)
+            image_width: Width of the image the landmarks map onto
+            image_height: Height of the image the landmarks map onto
+            timestamp: Capture time of the source frame (time.monotonic(), or the recorded time of replayed footage)
+            confidence: Optional (N,) per-landmark confidence (None for detected landmarks)
+            tracked_frames: Frames since the landmarks were last detected
+            segmentation_mask: Optional soft person mask of the source frame
+        """
+        self.data = np.asarray(landmarks, dtype=np.float32).reshape(-1, 3)
+        self.world = (
+            np.asarray(world_landmarks, dtype=np.float32).reshape(-1, 3)
+            if world_landmarks is not None and len(world_landmarks) else None
+        )
+        self.image_width = image_width
+        self.image_height = image_height
+        self.timestamp = timestamp
+        self.confidence = (
+            np.asarray(confidence, dtype=np.float32).reshape(-1)
+            if confidence is not None else np.ones(len(self.data), dtype=np.float32)
+        )
+        self.tracked_frames = tracked_frames
+        self.segmentation_mask = segmentation_mask
+    
+    @property
+    def is_tracked(self) -> bool:
+        """True if the landmarks were propagated by tracking instead of detected"""
+        return self.tracked_frames > 0
+    
+    @property
+    def landmarks(self) -> List[Tuple[float, float, float]]:
+        """Landmarks as a list of (x, y, visibility) tuples"""
+        return [tuple(row) for row in self.data.tolist()]
+    
+    @property
+    def world_landmarks(self) -> Optional[List[Tuple[float, float, float]]]:
+        """World landmarks as a list of (x, y, z) tuples"""
+        if self.world is None:
+            return None
+        return [tuple(row) for row in self.world.tolist()]
+    
+    @property
+    def xy(self) -> np.ndarray:
+        """(N, 2) view of the normalized coordinates"""
+        return self.data[:, :2]
+    
+    @property
+    def visibility(self) -> np.ndarray:
+        """(N,) view of the visibility scores"""
+        return self.data[:, 2]
+    
+    def __len__(self) -> int:
+        return len(self.data)
     
     def get_landmark(self, landmark_id: int) -> Optional[Tuple[float, float, float]]:
         """Get specific landmark by ID"""
-        if 0 <= landmark_id < len(self.landmarks):
-            return self.landmarks[landmark_id]
+        if 0 <= landmark_id < len(self.data):
+            return tuple(self.data[landmark_id].tolist())
         return None
     
-    def get_pixel_coords(self, landmark_id: int) -> Optional[Tuple[int, int]]:
-        """Get pixel coordinates for landmark"""
+    def get_pixel_coords(
+        self,
+        landmark_id: int,
+        image_size: Optional[Tuple[int, int]] = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Get pixel coordinates for landmark
+        
+        Args:
+            landmark_id: Landmark index
+            image_size: Optional (width, height) to map onto instead of the source image size
+        """
         landmark = self.get_landmark(landmark_id)
         if landmark:
-            x = int(landmark[0] * self.image_width)
-            y = int(landmark[1] * self.image_height)
+            w, h = image_size if image_size is not None else (self.image_width, self.image_height)
+            x = int(landmark[0] * w)
+            y = int(landmark[1] * h)
             return (x, y)
         return None
+    
+    def pixel_coords(self, image_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Get pixel coordinates of all landmarks
+        
+        Args:
+            image_size: Optional (width, height) to map onto instead of the source image size
+        
+        Returns:
+            (N, 2) int32 array of (x, y)
+        """
+        w, h = image_size if image_size is not None else (self.image_width, self.image_height)
+        return (self.xy * np.array([w, h], dtype=np.float32)).astype(np.int32)
+    
+    def visible_mask(self, threshold: float = 0.5) -> np.ndarray:
+        """Boolean mask of landmarks with visibility above `threshold`"""
+        return self.visibility > threshold
+    
+    def bounding_box(self, threshold: float = 0.5) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Normalized bounding box of the visible landmarks
+        
+        Args:
+            threshold: Visibility threshold
+        
+        Returns:
+            (x_min, y_min, x_max, y_max) or None if no landmark is visible
+        """
+        visible = self.xy[self.visible_mask(threshold)]
+        if len(visible) == 0:
+            return None
+        x_min, y_min = visible.min(axis=0).tolist()
+        x_max, y_max = visible.max(axis=0).tolist()
+        return (x_min, y_min, x_max, y_max)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary form"""
+        header = self._HEADER.pack(
+            self.image_width,
+            self.image_height,
+            self.timestamp if self.timestamp is not None else float('nan'),
+            len(self.data),
+            self.tracked_frames,
+            self.world is not None
+        )
+        parts = [header, self.data.tobytes(), self.confidence.tobytes()]
+        if self.world is not None:
+            parts.append(self.world.tobytes())
+        return b''.join(parts)
+    
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'PoseLandmarks':
+        """Deserialize landmarks written by to_bytes()"""
+        width, height, timestamp, count, tracked_frames, has_world = cls._HEADER.unpack_from(payload)
+        offset = cls._HEADER.size
+        size = count * 3 * 4
+        
+        data = np.frombuffer(payload, dtype=np.float32, count=count * 3, offset=offset).reshape(count, 3)
+        offset += size
+        confidence = np.frombuffer(payload, dtype=np.float32, count=count, offset=offset)
+        offset += count * 4
+        world = None
+        if has_world:
+            world = np.frombuffer(payload, dtype=np.float32, count=count * 3, offset=offset).reshape(count, 3)
+        
+        return cls(
+            data.copy(),
+            world.copy() if world is not None else None,
+            width,
+            height,
+            None if np.isnan(timestamp) else timestamp,
+            confidence.copy(),
+            tracked_frames
+        )
+    
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.data, self.world, self.image_width, self.image_height, self.timestamp,
+             self.confidence, self.tracked_frames, self.segmentation_mask)
+        )
+    
+    def __repr__(self) -> str:
+        return (
+            f"PoseLandmarks({len(self.data)} landmarks, world={self.world is not None}, "
+            f"image={self.image_width}x{self.image_height}, tracked_frames={self.tracked_frames})"
+        )
 
 
 class PoseDetector:
@@ -73,76 +264,336 @@ class PoseDetector:
     LEFT_FOOT_INDEX = 31
     RIGHT_FOOT_INDEX = 32
     
-    def __init__(self):
-        """Initialize pose detector"""
+    def __init__(
+        self,
+        buffer_pool: Optional[FrameBufferPool] = None,
+        static_image_mode: bool = False,
+        model_complexity: Optional[int] = None,
+        registry: Optional[ModelRegistry] = None
+    ):
+        """
+        Initialize pose detector
+        
+        The default is the live tracker: a streaming MediaPipe graph that
+        tracks the person across frames. Its landmark smoothing is off in
+        tracking-ROI mode, where OneEuroLandmarkFilter smooths instead. With `static_image_mode` every call is
+        an independent detection without temporal smoothing, which is what
+        captured frames and offline jobs need (see for_capture()).
+        
+        The MediaPipe graph is acquired from the model registry on the first
+        detection, so detectors with the same mode and complexity share one
+        graph.
+        
+        Args:
+            buffer_pool: Pool for the tracking-ROI crop buffer (None for the global pool)
+            static_image_mode: Detect every image independently
+            model_complexity: 0, 1 or 2 (None to use config)
+            registry: Model registry (None for the global registry)
+        """
         self.config = get_config()
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        self.registry = registry if registry is not None else get_model_registry()
+        self.static_image_mode = static_image_mode
         
         # MediaPipe configuration
         self.min_detection_confidence = self.config.get('models.pose_detection.min_detection_confidence', 0.7)
         self.min_tracking_confidence = self.config.get('models.pose_detection.min_tracking_confidence', 0.7)
-        self.model_complexity = self.config.get('models.pose_detection.model_complexity', 2)
+        self.model_complexity = (
+            model_complexity if model_complexity is not None
+            else self.config.get('models.pose_detection.model_complexity', 1)
+        )
+        # Only captures use the person mask, the live tracker skips it
+        self.enable_segmentation = static_image_mode
         
         # Initialize MediaPipe
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=self.model_complexity,
-            smooth_landmarks=True,
-            enable_segmentation=True,
-            smooth_segmentation=True,
+        self._pose = None
+        
+        # Tracking ROI: run inference on a crop around the last detection
+        self.roi_tracking = not static_image_mode and self.config.get('models.pose_detection.roi_tracking', True)
+        self.roi_expand = self.config.get('models.pose_detection.roi_expand', 1.5)
+        self._roi: Optional[Tuple[float, float, float, float]] = None  # Normalized (x0, y0, x1, y1)
+        
+        # ROI crops and full frames go through one streaming graph, whose
+        # smoothing would blend landmarks from different coordinate frames
+        self.smooth_landmarks = not static_image_mode and not self.roi_tracking
+        
+        # Inference statistics
+        self.roi_inferences = 0
+        self.full_inferences = 0
+        self.pixels_inferred = 0
+        self.pixels_available = 0
+        self.detections = 0
+        self.detect_seconds = 0.0
+        
+        mode = "static" if static_image_mode else "live"
+        logger.info(f"Pose detector initialized with MediaPipe ({mode}, complexity {self.model_complexity})")
+    
+    @classmethod
+    def for_capture(
+        cls,
+        buffer_pool: Optional[FrameBufferPool] = None,
+        registry: Optional[ModelRegistry] = None
+    ) -> 'PoseDetector':
+        """
+        Create the high-accuracy detector for captured frames and offline jobs
+        
+        Static image mode at `models.pose_detection.capture_model_complexity`.
+        The graph is only loaded when the first capture is detected.
+        """
+        config = get_config()
+        return cls(
+            buffer_pool=buffer_pool,
+            static_image_mode=True,
+            model_complexity=config.get('models.pose_detection.capture_model_complexity', 2),
+            registry=registry
+        )
+    
+    @property
+    def model_key(self) -> Tuple:
+        """Registry key of the MediaPipe graph this detector uses"""
+        mode = 'static' if self.static_image_mode else 'live'
+        return ('pose', mode, self.model_complexity, self.enable_segmentation, self.smooth_landmarks)
+    
+    @property
+    def pose(self):
+        """MediaPipe Pose model, acquired on first use"""
+        if self._pose is None:
+            self._pose = self.registry.acquire(
+                self.model_key,
+                lambda: self._create_model(self.model_complexity),
+                close=lambda model: model.close()
+            )
+        return self._pose
+    
+    def _create_model(self, model_complexity: int):
+        """Create the MediaPipe Pose model"""
+        return self.mp_pose.Pose(
+            static_image_mode=self.static_image_mode,
+            model_complexity=model_complexity,
+            smooth_landmarks=self.smooth_landmarks,
+            enable_segmentation=self.enable_segmentation,
+            smooth_segmentation=not self.static_image_mode,
             min_detection_confidence=self.min_detection_confidence,
             min_tracking_confidence=self.min_tracking_confidence
         )
+    
+    def set_model_complexity(self, model_complexity: int):
+        """
+        Switch the pose model complexity (0, 1 or 2)
         
-        logger.info("Pose detector initialized with MediaPipe")
+        Reloads the model, so the next detection searches the full frame.
+        """
+        if model_complexity == self.model_complexity:
+            return
+        
+        if self._pose is not None:
+            self.registry.release(self.model_key)
+            self._pose = None
+        self.model_complexity = model_complexity
+        self._roi = None
+        logger.info(f"Pose model complexity set to {model_complexity}")
     
-    def detect(self, image: np.ndarray) -> Optional[PoseLandmarks]:
+    def detect(
+        self,
+        image: Union[np.ndarray, FrameContext],
+        timestamp: Optional[float] = None,
+        image_size: Optional[Tuple[int, int]] = None,
+        use_roi: bool = True
+    ) -> Optional[PoseLandmarks]:
         """
         Detect pose in image
         
+        Landmarks are normalized, so detection can run on a downscaled copy of
+        a frame. Given a FrameContext, detection runs on its processing level
+        and the landmarks map onto its full resolution frame. For a raw image
+        pass the (width, height) of the original frame as `image_size` to have
+        get_pixel_coords() map onto the original.
+        
+        In tracking-ROI mode inference runs on an expanded box around the last
+        detection and the landmarks are mapped back to full-frame coordinates.
+        If the person is not found in the box, the full frame is searched.
+        
         Args:
-            image: Input image (BGR)
+            image: Frame context or input image (BGR)
+            timestamp: Optional capture time of the frame, carried on the result
+                (defaults to the context's timestamp)
+            image_size: Optional (width, height) of the full resolution frame
+            use_roi: Use and update the tracking ROI. Pass False for frames
+                from another camera or scene
             
         Returns:
             PoseLandmarks object or None if no pose detected
         """
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Process image
-        results = self.pose.process(image_rgb)
+        frame = FrameContext.wrap(image, timestamp)
+        image_rgb = frame.rgb(frame.processing_width)
+        if timestamp is None:
+            timestamp = frame.timestamp
+        
+        use_roi = use_roi and self.roi_tracking
+        frame_h, frame_w = image_rgb.shape[:2]
+        box = self._roi_box(frame_w, frame_h) if use_roi else None
+        
+        start = time.perf_counter()
+        results = self._infer(image_rgb, box)
+        if not results.pose_landmarks and box is not None:
+            # Person left the tracking ROI, search the whole frame
+            box = None
+            results = self._infer(image_rgb, None)
+        self.detect_seconds += time.perf_counter() - start
+        self.detections += 1
         
         if not results.pose_landmarks:
+            if use_roi:
+                self._roi = None
             return None
         
-        h, w = image.shape[:2]
+        w, h = image_size if image_size is not None else frame.full_size
+        
+        # Extract landmarks straight into float32 arrays
+        points = results.pose_landmarks.landmark
+        landmarks = np.fromiter(
+            (value for lm in points for value in (lm.x, lm.y, lm.visibility)),
+            dtype=np.float32, count=len(points) * 3
+        ).reshape(-1, 3)
         
-        # Extract landmarks
-        landmarks = []
-        for landmark in results.pose_landmarks.landmark:
-            landmarks.append((landmark.x, landmark.y, landmark.visibility))
+        if box is not None:
+            # Crop-normalized -> frame-normalized coordinates
+            x0, y0, x1, y1 = box
+            landmarks[:, 0] = (landmarks[:, 0] * (x1 - x0) + x0) / frame_w
+            landmarks[:, 1] = (landmarks[:, 1] * (y1 - y0) + y0) / frame_h
+        
+        if use_roi:
+            self._update_roi(landmarks)
         
         # Extract world landmarks
-        world_landmarks = []
+        world_landmarks = None
         if results.pose_world_landmarks:
-            for landmark in results.pose_world_landmarks.landmark:
-                world_landmarks.append((landmark.x, landmark.y, landmark.z))
+            world_points = results.pose_world_landmarks.landmark
+            world_landmarks = np.fromiter(
+                (value for lm in world_points for value in (lm.x, lm.y, lm.z)),
+                dtype=np.float32, count=len(world_points) * 3
+            )
+        
+        # Soft person mask, only meaningful for full-frame inference
+        segmentation_mask = None
+        if self.enable_segmentation and box is None and results.segmentation_mask is not None:
+            segmentation_mask = np.array(results.segmentation_mask, dtype=np.float32)
         
         return PoseLandmarks(
             landmarks=landmarks,
-            world_landmarks=world_landmarks if world_landmarks else None,
+            world_landmarks=world_landmarks,
             image_width=w,
-            image_height=h
+            image_height=h,
+            timestamp=timestamp,
+            segmentation_mask=segmentation_mask
         )
     
+    def _infer(self, image_rgb: np.ndarray, box: Optional[Tuple[int, int, int, int]]):
+        """Run MediaPipe on the RGB frame or on a pixel box of it"""
+        # Every inference counts its whole frame, cropped or not
+        self.pixels_available += image_rgb.shape[0] * image_rgb.shape[1]
+        
+        if box is not None:
+            # MediaPipe needs a contiguous image, copy the crop into a reused buffer
+            x0, y0, x1, y1 = box
+            crop = image_rgb[y0:y1, x0:x1]
+            image_rgb = self.buffer_pool.get(('pose_roi_rgb', id(self)), crop.shape, crop.dtype)
+            np.copyto(image_rgb, crop)
+            self.roi_inferences += 1
+        else:
+            self.full_inferences += 1
+        
+        self.pixels_inferred += image_rgb.shape[0] * image_rgb.shape[1]
+        
+        # Process image
+        return self.pose.process(image_rgb)
+    
+    def _roi_box(self, frame_w: int, frame_h: int) -> Optional[Tuple[int, int, int, int]]:
+        """Pixel box of the tracking ROI, snapped to a 32 px grid (None for the full frame)"""
+        if self._roi is None:
+            return None
+        
+        grid = 32
+        x0 = int(self._roi[0] * frame_w) // grid * grid
+        y0 = int(self._roi[1] * frame_h) // grid * grid
+        x1 = min(frame_w, -(-int(np.ceil(self._roi[2] * frame_w)) // grid) * grid)
+        y1 = min(frame_h, -(-int(np.ceil(self._roi[3] * frame_h)) // grid) * grid)
+        
+        # Not worth cropping if the box covers most of the frame
+        if (x1 - x0) * (y1 - y0) > 0.8 * frame_w * frame_h or x1 - x0 < grid or y1 - y0 < grid:
+            return None
+        return (x0, y0, x1, y1)
+    
+    def _update_roi(self, landmarks: np.ndarray):
+        """
+        Move the tracking ROI to the new detection
+        
+        The ROI only moves when the body gets close to its border or becomes
+        much smaller than it. A steady crop keeps MediaPipe's own frame-to-frame
+        tracking consistent and the crop buffers the same size.
+        """
+        visible = landmarks[landmarks[:, 2] > 0.5, :2]
+        if len(visible) == 0:
+            self._roi = None
+            return
+        
+        low = visible.min(axis=0)
+        high = visible.max(axis=0)
+        center = (low + high) / 2.0
+        half = (high - low) / 2.0
+        
+        def scaled(factor: float) -> Tuple[float, float, float, float]:
+            lo = np.clip(center - half * factor, 0.0, 1.0)
+            hi = np.clip(center + half * factor, 0.0, 1.0)
+            return (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+        
+        target = scaled(self.roi_expand)
+        if self._roi is not None:
+            # Keep the current ROI while it still holds the body plus half the margin
+            inner = scaled(1.0 + (self.roi_expand - 1.0) / 2.0)
+            roi = self._roi
+            contains = roi[0] <= inner[0] and roi[1] <= inner[1] and roi[2] >= inner[2] and roi[3] >= inner[3]
+            roi_area = (roi[2] - roi[0]) * (roi[3] - roi[1])
+            target_area = (target[2] - target[0]) * (target[3] - target[1])
+            if contains and roi_area <= 2.0 * target_area:
+                return
+        
+        self._roi = target
+    
+    def reset_roi(self):
+        """Search the full frame on the next detection"""
+        self._roi = None
+    
+    def get_inference_stats(self) -> Dict[str, float]:
+        """
+        Get tracking-ROI statistics
+        
+        The pixel fraction overstates the savings: in video mode MediaPipe
+        already crops the frame to the person it tracks, so the model input
+        is about the same size either way. Compare `ms_per_detect` with ROI
+        tracking on and off to measure the actual gain.
+        
+        Returns:
+            Dictionary with ROI and full-frame inference counts, the fraction
+            of frame pixels fed to the graph and the mean detect() time
+        """
+        return {
+            'roi_inferences': self.roi_inferences,
+            'full_inferences': self.full_inferences,
+            'pixel_fraction': self.pixels_inferred / self.pixels_available if self.pixels_available else 1.0,
+            'ms_per_detect': self.detect_seconds / self.detections * 1000.0 if self.detections else 0.0,
+        }
+    
     def draw_landmarks(
         self,
         image: np.ndarray,
         landmarks: PoseLandmarks,
-        draw_connections: bool = True
+        draw_connections: bool = True,
+        inplace: bool = False
     ) -> np.ndarray:
         """
         Draw pose landmarks on image
@@ -151,40 +602,42 @@ class PoseDetector:
             image: Input image
             landmarks: Pose landmarks
             draw_connections: Whether to draw skeleton connections
+            inplace: Draw directly on `image` instead of a copy
             
         Returns:
             Image with landmarks drawn
         """
-        output = image.copy()
-        
-        # Convert to MediaPipe format for drawing
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        output = image if inplace else image.copy()
         
-        # Create landmark list
-        mp_landmarks = self.mp_pose.PoseLandmark
-        landmark_list = self.mp_pose.PoseLandmark
+        # Map onto the image being drawn on, which may differ from the detection resolution
+        coords = landmarks.pixel_coords((output.shape[1], output.shape[0])).tolist()
         
-        # Draw on RGB image
         if draw_connections:
             # Draw skeleton
-            for connection in self.mp_pose.POSE_CONNECTIONS:
-                start_idx, end_idx = connection
-                start = landmarks.get_pixel_coords(start_idx)
-                end = landmarks.get_pixel_coords(end_idx)
-                
-                if start and end:
-                    cv2.line(output, start, end, (0, 255, 0), 2)
+            for start_idx, end_idx in self.mp_pose.POSE_CONNECTIONS:
+                cv2.line(output, tuple(coords[start_idx]), tuple(coords[end_idx]), (0, 255, 0), 2)
         
         # Draw landmarks
-        for i, landmark in enumerate(landmarks.landmarks):
-            if landmark[2] > 0.5:  # visibility threshold
-                coords = landmarks.get_pixel_coords(i)
-                if coords:
-                    cv2.circle(output, coords, 5, (0, 0, 255), -1)
-                    cv2.circle(output, coords, 7, (255, 255, 255), 2)
+        for i in np.flatnonzero(landmarks.visible_mask(0.5)).tolist():
+            cv2.circle(output, tuple(coords[i]), 5, (0, 0, 255), -1)
+            cv2.circle(output, tuple(coords[i]), 7, (255, 255, 255), 2)
         
         return output
     
+    def add_to_overlay(self, overlay: OverlayCompositor, landmarks: PoseLandmarks):
+        """
+        Queue the landmark skeleton on an overlay compositor
+        
+        Args:
+            overlay: Compositor of the current display frame
+            landmarks: Pose landmarks
+        """
+        overlay.skeleton(
+            landmarks.pixel_coords(overlay.size),
+            self.mp_pose.POSE_CONNECTIONS,
+            landmarks.visible_mask(0.5)
+        )
+    
     def calculate_body_angles(self, landmarks: PoseLandmarks) -> Dict[str, float]:
         """
         Calculate important body angles
@@ -256,29 +709,13 @@ class PoseDetector:
         if len(recent_landmarks) < 2:
             return False
         
-        # Calculate average movement of key landmarks
+        # Average frame-to-frame movement of key landmarks
         key_landmarks = [self.NOSE, self.LEFT_SHOULDER, self.RIGHT_SHOULDER, self.LEFT_HIP, self.RIGHT_HIP]
         
-        total_movement = 0
-        count = 0
+        track = np.stack([pose.xy[key_landmarks] for pose in recent_landmarks])
+        movement = np.linalg.norm(np.diff(track, axis=0), axis=2)
         
-        for i in range(1, len(recent_landmarks)):
-            prev_pose = recent_landmarks[i-1]
-            curr_pose = recent_landmarks[i]
-            
-            for landmark_id in key_landmarks:
-                prev = prev_pose.get_landmark(landmark_id)
-                curr = curr_pose.get_landmark(landmark_id)
-                
-                if prev and curr:
-                    movement = np.sqrt((curr[0] - prev[0])**2 + (curr[1] - prev[1])**2)
-                    total_movement += movement
-                    count += 1
-        
-        if count == 0:
-            return False
-        
-        avg_movement = total_movement / count
+        avg_movement = float(movement.mean())
         return avg_movement < threshold
     
     def get_body_bounding_box(self, landmarks: PoseLandmarks) -> Tuple[int, int, int, int]:
@@ -291,20 +728,13 @@ class PoseDetector:
         Returns:
             Tuple of (x, y, width, height)
         """
-        visible_landmarks = [
-            landmarks.get_pixel_coords(i) 
-            for i in range(len(landmarks.landmarks))
-            if landmarks.landmarks[i][2] > 0.5
-        ]
+        visible = landmarks.pixel_coords()[landmarks.visible_mask(0.5)]
         
-        if not visible_landmarks:
+        if len(visible) == 0:
             return (0, 0, 0, 0)
         
-        xs = [coord[0] for coord in visible_landmarks]
-        ys = [coord[1] for coord in visible_landmarks]
-        
-        x_min, x_max = min(xs), max(xs)
-        y_min, y_max = min(ys), max(ys)
+        x_min, y_min = visible.min(axis=0).tolist()
+        x_max, y_max = visible.max(axis=0).tolist()
         
         # Add padding
         padding = 20
@@ -317,7 +747,11 @@ class PoseDetector:
     
     def release(self):
         """Release resources"""
-        if self.pose:
-            self.pose.close()
+        self._roi = None
+        self.buffer_pool.release_named(id(self))
+        
+        if self._pose is not None:
+            self.registry.release(self.model_key)
+            self._pose = None
             logger.info("Pose detector released")
 
@@ -0,0 +1,128 @@
+"""
+Incremental pose stability tracking
+"""
+import numpy as np
+from typing import List, Optional
+
+from src.vision.pose_detector import PoseLandmarks, PoseDetector
+from src.utils.config_loader import get_config
+
+
+# Landmarks whose movement decides whether the customer is holding still
+STABILITY_LANDMARKS = [
+    PoseDetector.NOSE,
+    PoseDetector.LEFT_SHOULDER,
+    PoseDetector.RIGHT_SHOULDER,
+    PoseDetector.LEFT_HIP,
+    PoseDetector.RIGHT_HIP
+]
+
+
+class PoseStabilityTracker:
+    """
+    Tracks how still the pose is over a sliding window of frames
+    
+    Keeps the key landmarks of the last `window` frames in a fixed NumPy
+    ring buffer together with the mean displacement of each frame step. The
+    running sum of those displacements is updated on every frame, so the
+    cost per frame does not depend on the window size.
+    
+    The decision matches PoseDetector.is_pose_stable() on the same window:
+    stable when the average key landmark movement between consecutive
+    frames is below `threshold` (normalized image units).
+    """
+    
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        threshold: Optional[float] = None,
+        key_landmarks: Optional[List[int]] = None
+    ):
+        """
+        Initialize stability tracker
+        
+        Args:
+            window: Number of frames in the window (None to use config)
+            threshold: Maximum average movement per frame (None to use config)
+            key_landmarks: Landmark indices to track (None for nose, shoulders and hips)
+        """
+        config = get_config()
+        self.window = max(2, window if window is not None else config.get('quality_control.pose_stability_window', 10))
+        self.threshold = threshold if threshold is not None else config.get('quality_control.pose_stability_threshold', 0.02)
+        self.key_landmarks = list(key_landmarks) if key_landmarks is not None else STABILITY_LANDMARKS
+        
+        # Ring buffers: key landmark positions per frame and movement per frame step
+        self._points = np.zeros((self.window, len(self.key_landmarks), 2), dtype=np.float32)
+        self._steps = np.zeros(self.window - 1, dtype=np.float64)
+        
+        self._frames = 0  # Frames currently in the window
+        self._head = 0  # Next slot of _points
+        self._step_head = 0  # Next slot of _steps
+        self._step_sum = 0.0
+    
+    def update(self, landmarks: PoseLandmarks) -> bool:
+        """
+        Add the landmarks of a new frame
+        
+        Args:
+            landmarks: Pose landmarks of the frame
+        
+        Returns:
+            True if the pose is stable after this frame
+        """
+        points = landmarks.xy[self.key_landmarks]
+        
+        # A lost tracked landmark carries no motion information, start a new window
+        if landmarks.is_tracked and not np.all(landmarks.confidence[self.key_landmarks] > 0):
+            self.reset()
+        
+        if self._frames > 0:
+            previous = self._points[(self._head - 1) % self.window]
+            step = float(np.linalg.norm(points - previous, axis=1).mean())
+            
+            steps_in_window = min(self._frames - 1, self.window - 1)
+            if steps_in_window == self.window - 1:
+                # Window full, the oldest step drops out
+                self._step_sum -= self._steps[self._step_head]
+            
+            self._steps[self._step_head] = step
+            self._step_sum = max(0.0, self._step_sum + step)
+            self._step_head = (self._step_head + 1) % (self.window - 1)
+            if self._step_head == 0:
+                # Once per lap, drop the rounding error of the running sum
+                self._step_sum = float(self._steps[:steps_in_window + 1].sum())
+        
+        self._points[self._head] = points
+        self._head = (self._head + 1) % self.window
+        self._frames = min(self._frames + 1, self.window)
+        
+        return self.is_stable
+    
+    @property
+    def mean_movement(self) -> Optional[float]:
+        """Average movement per frame over the window, None before two frames"""
+        steps = self._frames - 1
+        if steps <= 0:
+            return None
+        return self._step_sum / steps
+    
+    @property
+    def is_stable(self) -> bool:
+        """Whether the average movement is below the threshold"""
+        movement = self.mean_movement
+        return movement is not None and movement < self.threshold
+    
+    @property
+    def score(self) -> float:
+        """Continuous stability from 0 (moving at or above the threshold) to 1 (still)"""
+        movement = self.mean_movement
+        if movement is None:
+            return 0.0
+        return float(np.clip(1.0 - movement / self.threshold, 0.0, 1.0))
+    
+    def reset(self):
+        """Forget all frames, e.g. after a capture or orientation change"""
+        self._frames = 0
+        self._head = 0
+        self._step_head = 0
+        self._step_sum = 0.0
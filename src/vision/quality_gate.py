@@ -0,0 +1,202 @@
+"""
+Fast per-frame image quality gate for auto-capture
+"""
+import time
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+from src.vision.pose_detector import PoseLandmarks, PoseDetector
+from src.vision.frame_context import FrameContext, landmark_box
+from src.utils.logger import logger
+from src.utils.config_loader import get_config
+from src.utils.buffer_pool import FrameBufferPool, get_buffer_pool
+
+
+# Head plus everything from the shoulders down (face details are left out)
+BODY_COVERAGE_LANDMARKS = [PoseDetector.NOSE] + list(range(PoseDetector.LEFT_SHOULDER, PoseDetector.RIGHT_FOOT_INDEX + 1))
+
+
+@dataclass
+class QualityReport:
+    """Result of a quality gate evaluation"""
+    blur: float  # Laplacian variance on the proxy (higher = sharper)
+    brightness: float  # Mean gray level (0-255)
+    contrast: float  # Gray level standard deviation
+    body_coverage: Optional[float]  # Fraction of body landmarks inside the frame
+    passed: bool
+    message: str
+    elapsed_ms: float = 0.0
+
+
+class QualityGate:
+    """
+    Single-pass blur, brightness, contrast and body coverage check
+    
+    All image statistics are computed on one downscaled grayscale level of
+    the frame (the proxy), optionally restricted to the body bounding box.
+    This keeps the check cheap enough to run on every live frame.
+    """
+    
+    def __init__(self, buffer_pool: Optional[FrameBufferPool] = None):
+        """
+        Initialize quality gate
+        
+        Args:
+            buffer_pool: Pool for the proxy buffers (None for the global pool)
+        """
+        self.config = get_config()
+        self.buffer_pool = buffer_pool if buffer_pool is not None else get_buffer_pool()
+        
+        self.proxy_width = self.config.get('quality_control.gate_proxy_width', 320)
+        self.blur_threshold = self.config.get('quality_control.gate_blur_threshold', 100)
+        self.min_body_coverage = self.config.get('quality_control.min_body_coverage', 0.85)
+        self.lighting_check = self.config.get('quality_control.lighting_check', True)
+        self.use_body_roi = self.config.get('quality_control.gate_use_body_roi', True)
+        
+        self.min_brightness = 50
+        self.max_brightness = 200
+        self.min_contrast = 30
+        
+        logger.info(f"Quality gate initialized (proxy width {self.proxy_width}px)")
+    
+    def make_proxy(self, image: np.ndarray) -> np.ndarray:
+        """
+        Convert a frame to the downscaled grayscale proxy
+        
+        Args:
+            image: Input image (BGR or grayscale)
+        
+        Returns:
+            Grayscale proxy (reused buffer, valid until the next call)
+        """
+        if len(image.shape) == 3:
+            gray = self.buffer_pool.get(('quality_gray', id(self)), image.shape[:2], np.uint8)
+            cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=gray)
+        else:
+            gray = image
+        
+        h, w = gray.shape[:2]
+        if w <= self.proxy_width:
+            return gray
+        
+        proxy_h = max(1, int(round(h * self.proxy_width / w)))
+        proxy = self.buffer_pool.get(('quality_proxy', id(self)), (proxy_h, self.proxy_width), np.uint8)
+        cv2.resize(gray, (self.proxy_width, proxy_h), dst=proxy, interpolation=cv2.INTER_AREA)
+        return proxy
+    
+    def evaluate(
+        self,
+        image: Union[np.ndarray, FrameContext],
+        landmarks: Optional[PoseLandmarks] = None,
+        proxy: Optional[np.ndarray] = None
+    ) -> QualityReport:
+        """
+        Evaluate frame quality
+        
+        Args:
+            image: Frame context or frame (BGR) at any resolution, only its
+                proxy is analysed. A context provides the shared grayscale
+                level and body box
+            landmarks: Optional pose landmarks for body coverage and ROI
+                (defaults to the context's landmarks)
+            proxy: Optional precomputed grayscale proxy of `image`
+        
+        Returns:
+            QualityReport
+        """
+        start = time.perf_counter()
+        
+        context = image if isinstance(image, FrameContext) else None
+        if context is not None and landmarks is None:
+            landmarks = context.landmarks
+        
+        if proxy is None:
+            proxy = context.gray(self.proxy_width) if context is not None else self.make_proxy(image)
+        
+        laplacian = self.buffer_pool.get(('quality_laplacian', id(self)), proxy.shape, np.int16)
+        cv2.Laplacian(proxy, cv2.CV_16S, dst=laplacian)
+        
+        region, lap_region = proxy, laplacian
+        if landmarks is not None and self.use_body_roi:
+            if context is not None and landmarks is context.landmarks:
+                x, y, w, h = context.body_roi(self.proxy_width)
+            else:
+                x, y, w, h = landmark_box(landmarks, proxy.shape[:2])
+            if w >= 8 and h >= 8:
+                region = proxy[y:y + h, x:x + w]
+                lap_region = laplacian[y:y + h, x:x + w]
+        
+        # Mean and std of the gray levels, then of the Laplacian, one pass each
+        mean, std = cv2.meanStdDev(region)
+        _, lap_std = cv2.meanStdDev(lap_region)
+        
+        brightness = float(mean[0, 0])
+        contrast = float(std[0, 0])
+        blur = float(lap_std[0, 0]) ** 2
+        coverage = self.body_coverage(landmarks) if landmarks is not None else None
+        
+        passed, message = self._decide(blur, brightness, contrast, coverage)
+        
+        return QualityReport(
+            blur=blur,
+            brightness=brightness,
+            contrast=contrast,
+            body_coverage=coverage,
+            passed=passed,
+            message=message,
+            elapsed_ms=(time.perf_counter() - start) * 1000.0
+        )
+    
+    def _decide(
+        self,
+        blur: float,
+        brightness: float,
+        contrast: float,
+        coverage: Optional[float]
+    ) -> Tuple[bool, str]:
+        """Apply thresholds in order of how actionable the message is"""
+        if coverage is not None and coverage < self.min_body_coverage:
+            return False, f"Step back - only {coverage*100:.0f}% of body visible"
+        
+        if self.lighting_check:
+            if brightness < self.min_brightness:
+                return False, f"Too dark (brightness: {brightness:.0f})"
+            if brightness > self.max_brightness:
+                return False, f"Too bright (brightness: {brightness:.0f})"
+            if contrast < self.min_contrast:
+                return False, f"Low contrast (std: {contrast:.0f})"
+        
+        if blur < self.blur_threshold:
+            return False, f"Image blurry (score: {blur:.0f})"
+        
+        return True, "Image quality acceptable"
+    
+    @staticmethod
+    def body_coverage(landmarks: PoseLandmarks, margin: float = 0.0) -> float:
+        """
+        Fraction of body landmarks that fall inside the frame
+        
+        MediaPipe extrapolates landmarks that are cut off by the frame border
+        to coordinates outside [0, 1], so this measures how much of the body
+        is in view independent of self-occlusion in side and back views.
+        
+        Args:
+            landmarks: Pose landmarks
+            margin: Normalized margin the landmarks must keep from the border
+        
+        Returns:
+            Coverage between 0 and 1
+        """
+        ids = [i for i in BODY_COVERAGE_LANDMARKS if i < len(landmarks)]
+        if not ids:
+            return 0.0
+        
+        points = landmarks.xy[ids]
+        inside = np.all((points >= margin) & (points <= 1.0 - margin), axis=1)
+        return float(inside.mean())
+    
+    def release(self):
+        """Return the proxy buffers to the pool"""
+        self.buffer_pool.release_named(id(self))
@@ -0,0 +1,197 @@
+"""
+Continuous body yaw from 3D world landmarks
+"""
+import numpy as np
+from dataclasses import dataclass
+from typing import Optional
+
+from src.vision.pose_detector import PoseLandmarks, PoseDetector
+from src.utils.config_loader import get_config
+
+
+@dataclass
+class YawEstimate:
+    """Filtered body yaw of one frame"""
+    yaw: float  # Degrees in [0, 360): 0 = front, 90 = left side, 180 = back, 270 = right side
+    rate: float  # Angular velocity in degrees per second
+    confidence: float  # 0-1
+    measured_yaw: float  # Unfiltered yaw of this frame
+
+
+def wrap_angle(angle: float) -> float:
+    """Wrap an angle in degrees to [-180, 180)"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+class YawEstimator:
+    """
+    Estimates which way the body faces from MediaPipe world landmarks
+    
+    The left-to-right shoulder and hip vectors are projected onto the
+    ground plane (x, z) and give the yaw of the torso independent of where
+    the person stands in the image. Shoulder and hip yaw are averaged,
+    weighted by landmark visibility.
+    
+    The per-frame yaw is smoothed by an alpha-beta filter on the circle,
+    which also estimates the angular velocity. The measurement gain is
+    scaled by the measurement confidence, so weak frames move the estimate
+    less. The filter restarts after a gap of more than `max_gap_s`.
+    
+    Confidence combines the visibility of the nearer landmark of each pair
+    (the far shoulder in a side view is occluded but still well estimated
+    in 3D), how well the shoulder and hip yaw agree, whether the torso
+    vectors rise above the depth noise floor and how well the frame matches
+    the filter prediction. A clean frame scores above 0.9, so the usual
+    0.85 orientation threshold rejects frames with a clear problem.
+    """
+    
+    TORSO_LANDMARKS = [
+        PoseDetector.LEFT_SHOULDER,
+        PoseDetector.RIGHT_SHOULDER,
+        PoseDetector.LEFT_HIP,
+        PoseDetector.RIGHT_HIP
+    ]
+    
+    def __init__(
+        self,
+        alpha: Optional[float] = None,
+        beta: Optional[float] = None,
+        max_gap_s: float = 0.5,
+        frame_interval_s: float = 1.0 / 30.0
+    ):
+        """
+        Initialize yaw estimator
+        
+        Args:
+            alpha: Angle gain of the filter, 0-1 (None to use config)
+            beta: Angular velocity gain of the filter, 0-1 (None to use config)
+            max_gap_s: Restart the filter after this long without a measurement
+            frame_interval_s: Time step assumed for landmarks without timestamps
+        """
+        config = get_config()
+        self.alpha = alpha if alpha is not None else config.get('orientation_detection.yaw_filter_alpha', 0.5)
+        self.beta = beta if beta is not None else config.get('orientation_detection.yaw_filter_beta', 0.1)
+        self.max_gap_s = max_gap_s
+        self.frame_interval_s = frame_interval_s
+        
+        # Torso vectors shorter than this (meters) are dominated by depth noise
+        self.min_vector_length = 0.1
+        # Shoulder/hip disagreement and filter residual (degrees) that halve the confidence
+        self.agreement_scale = 60.0
+        self.residual_scale = 45.0
+        
+        self.reset()
+    
+    def reset(self):
+        """Forget the filter state"""
+        self.yaw: Optional[float] = None
+        self.rate = 0.0
+        self._last_time: Optional[float] = None
+    
+    @staticmethod
+    def _vector_yaw(left: np.ndarray, right: np.ndarray) -> float:
+        """Yaw of the left-to-right body axis, 0 when the body faces the camera"""
+        # World frame: x to the image right, z away from the camera. Facing the
+        # camera the person's left side is on the image right.
+        dx = float(left[0] - right[0])
+        dz = float(left[2] - right[2])
+        return float(np.degrees(np.arctan2(-dz, dx)))
+    
+    def measure(self, landmarks: PoseLandmarks) -> Optional[YawEstimate]:
+        """
+        Yaw of a single frame without filtering
+        
+        Args:
+            landmarks: Pose landmarks with world landmarks
+        
+        Returns:
+            YawEstimate with zero rate, or None without world landmarks
+        """
+        world = landmarks.world
+        if world is None or len(world) <= max(self.TORSO_LANDMARKS):
+            return None
+        
+        # Visibility of the nearer landmark of each pair
+        visibility = np.clip(landmarks.visibility[self.TORSO_LANDMARKS], 0.0, 1.0)
+        pair_visibility = np.maximum(visibility[0::2], visibility[1::2])
+        pairs = (
+            (PoseDetector.LEFT_SHOULDER, PoseDetector.RIGHT_SHOULDER, pair_visibility[0]),
+            (PoseDetector.LEFT_HIP, PoseDetector.RIGHT_HIP, pair_visibility[1]),
+        )
+        
+        # Circular mean of the shoulder and hip yaw, weighted by visibility and length
+        angles = []
+        weights = []
+        length_terms = []
+        for left_id, right_id, pair_weight in pairs:
+            vector = world[left_id] - world[right_id]
+            length = float(np.hypot(vector[0], vector[2]))
+            angles.append(self._vector_yaw(world[left_id], world[right_id]))
+            weights.append(pair_weight * length)
+            length_terms.append(min(1.0, length / self.min_vector_length))
+        
+        weights = np.asarray(weights)
+        if weights.sum() <= 0:
+            return None
+        
+        radians = np.radians(angles)
+        yaw = float(np.degrees(np.arctan2(
+            np.sum(weights * np.sin(radians)), np.sum(weights * np.cos(radians))
+        )))
+        
+        disagreement = abs(wrap_angle(angles[0] - angles[1]))
+        confidence = (
+            float(pair_visibility.mean())
+            * max(length_terms)
+            / (1.0 + (disagreement / self.agreement_scale) ** 2)
+        )
+        
+        return YawEstimate(
+            yaw=yaw % 360.0,
+            rate=0.0,
+            confidence=float(np.clip(confidence, 0.0, 1.0)),
+            measured_yaw=yaw % 360.0
+        )
+    
+    def update(self, landmarks: PoseLandmarks) -> Optional[YawEstimate]:
+        """
+        Add the landmarks of a new frame
+        
+        Args:
+            landmarks: Pose landmarks with world landmarks
+        
+        Returns:
+            Filtered YawEstimate, or None without world landmarks
+        """
+        measurement = self.measure(landmarks)
+        if measurement is None:
+            return None
+        
+        timestamp = landmarks.timestamp
+        if timestamp is not None and self._last_time is not None:
+            dt = timestamp - self._last_time
+        else:
+            dt = self.frame_interval_s
+        
+        if self.yaw is None or dt > self.max_gap_s or dt <= 0:
+            self.reset()
+            self.yaw = measurement.measured_yaw
+            self._last_time = timestamp
+            return measurement
+        
+        # Alpha-beta step on the circle, gains scaled by the measurement confidence
+        predicted = self.yaw + self.rate * dt
+        residual = wrap_angle(measurement.measured_yaw - predicted)
+        gain = measurement.confidence
+        self.yaw = (predicted + self.alpha * gain * residual) % 360.0
+        self.rate += self.beta * gain * residual / dt
+        self._last_time = timestamp
+        
+        confidence = measurement.confidence / (1.0 + (residual / self.residual_scale) ** 2)
+        
+        return YawEstimate(
+            yaw=self.yaw,
+            rate=self.rate,
+            confidence=float(np.clip(confidence, 0.0, 1.0)),
+            measured_yaw=measurement.measured_yaw
+        )
@@ -160,6 +160,89 @@ except Exception as e:
     print(f"[FAIL] ScanningOrchestrator: {e}")
 print()
 
+# Test 13: Batch Orientation Parity
+print("TEST 13: Batch Orientation Parity")
+print("-" * 70)
+try:
+    import numpy as np
+    from src.vision.orientation_detector import OrientationDetector
+    from src.vision.pose_detector import PoseLandmarks
+    
+    # Random poses with shoulder/hip widths and visibilities around every threshold
+    rng = np.random.default_rng(0)
+    frames = rng.uniform(0.0, 1.0, size=(5000, 33, 3)).astype(np.float32)
+    frames[:, 12, 0] = frames[:, 11, 0] + rng.choice([-1, 1], 5000) * rng.uniform(0.0, 0.25, 5000)
+    frames[:, 24, 0] = frames[:, 23, 0] + rng.uniform(-0.25, 0.25, 5000)
+    frames[:, :, 2] = np.where(
+        rng.uniform(size=(5000, 33)) < 0.5,
+        rng.choice([0.1, 0.5, 0.9], size=(5000, 33)),
+        rng.uniform(size=(5000, 33))
+    )
+    
+    batch_detector = OrientationDetector()
+    for use_face in (True, False):
+        batch = batch_detector.detect_orientation_batch(frames, use_face=use_face)
+        mismatches = 0
+        for i, frame in enumerate(frames):
+            landmarks = PoseLandmarks(frame)
+            orientation, confidence = batch_detector.detect_orientation(landmarks, use_face=use_face)
+            angle = batch_detector.calculate_rotation_angle(landmarks)
+            if (
+                batch.orientations[i] != orientation
+                or batch.confidences[i] != confidence
+                or batch.rotation_angles[i] != angle
+            ):
+                mismatches += 1
+        if mismatches:
+            raise AssertionError(f"{mismatches}/{len(frames)} frames differ from detect_orientation (use_face={use_face})")
+        counts = {o.value: batch.orientations.count(o) for o in set(batch.orientations)}
+        print(f"[OK] {len(batch)} frames match detect_orientation (use_face={use_face}): {counts}")
+except Exception as e:
+    errors.append(f"Batch orientation: {e}")
+    print(f"[FAIL] Batch orientation: {e}")
+print()
+
+# Test 14: Burst Capture Parity (synchronous camera)
+print("TEST 14: Burst Capture Parity (synchronous camera)")
+print("-" * 70)
+try:
+    import tempfile
+    import types
+    import cv2
+    import numpy as np
+    from pathlib import Path
+    from src.camera.camera_controller import CameraController
+    from src.camera.frame_source import ImageDirectorySource
+    from src.scanning_orchestrator import ScanningOrchestrator
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # A sharp trigger frame followed by blurred burst frames, so the trigger frame wins
+        rng = np.random.default_rng(1)
+        for i in range(8):
+            image = rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+            if i >= 2:
+                image = cv2.GaussianBlur(image, (21, 21), 0)
+            cv2.imwrite(str(Path(tmp) / f"frame_{i:03d}.png"), image)
+        
+        camera = CameraController(threaded=False, source=ImageDirectorySource(tmp, realtime=False))
+        if not camera.open():
+            raise RuntimeError("Could not open image directory source")
+        camera.read_latest()
+        trigger = camera.read_latest().image  # Second read lands in a pooled output buffer
+        expected = trigger.copy()
+        
+        orchestrator = types.SimpleNamespace(camera=camera, burst_size=4)
+        selected = ScanningOrchestrator._select_capture_frame(orchestrator, trigger)
+        camera.release()
+    
+    if selected is trigger or not np.array_equal(selected, expected):
+        raise AssertionError("Selected capture frame is not the scored trigger frame")
+    print("[OK] Burst selection keeps the trigger frame intact with synchronous reads")
+except Exception as e:
+    errors.append(f"Burst capture: {e}")
+    print(f"[FAIL] Burst capture: {e}")
+print()
+
 # Summary
 print("=" * 70)
 print("SUMMARY")
@@ -189,6 +272,8 @@ else:
     print("  [OK] Measurement Extraction")
     print("  [OK] Calibration System")
     print("  [OK] Main Orchestrator")
+    print("  [OK] Batch Orientation Parity")
+    print("  [OK] Burst Capture Parity")
     print()
     print("=" * 70)
     print("[SUCCESS] SYSTEM IS FULLY OPERATIONAL!")